@@ -0,0 +1,250 @@
+"""Saya 模块生命周期的基准测试.
+
+生成 N 个模块 × M 个 Cube 的模块树(文件与包交替, 部分模块嵌套 `Saya.require` 前一个模块),
+测量各操作的耗时(以及可选的峰值内存), 结果以 JSON 输出, 便于在不同版本之间比较.
+当前版本没有的 API (如 `require_many`) 会被跳过; `--baseline` 只使用最初版本就有的 API, 以便与其对比.
+
+    python benchmarks/lifecycle.py --modules 200 --cubes 20 --output result.json
+    python benchmarks/lifecycle.py --baseline --output baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import inspect
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+from graia.broadcast import Broadcast
+from graia.broadcast.entities.decorator import Decorator
+
+from graia.saya import Saya
+from graia.saya.builtins.broadcast import BroadcastBehaviour, ListenerSchema
+from graia.saya.builtins.broadcast.shortcut import decorate, listen
+from graia.saya.cube import Cube
+from graia.saya.event import SayaModuleInstalled
+
+MODULE_TEMPLATE = """\
+from graia.saya import Channel, Saya
+from graia.saya.builtins.broadcast.schema import ListenerSchema
+from graia.saya.event import SayaModuleInstalled
+
+channel = Channel.current()
+{require}
+
+for _ in range({cubes}):
+    @channel.use(ListenerSchema(listening_events=[SayaModuleInstalled]))
+    async def handler(event: SayaModuleInstalled):
+        pass
+"""
+
+
+def generate_tree(root: Path, package: str, modules: int, cubes: int, require_every: int) -> List[str]:
+    base = root / package
+    base.mkdir()
+    (base / "__init__.py").write_text("")
+    names = []
+    for i in range(modules):
+        name = f"m{i:05d}"
+        require = ""
+        if require_every and i and i % require_every == 0:
+            require = f'Saya.current().require("{package}.m{i - 1:05d}")'
+        source = MODULE_TEMPLATE.format(require=require, cubes=cubes)
+        if i % 2:
+            (base / name).mkdir()
+            (base / name / "__init__.py").write_text(source)
+        else:
+            (base / f"{name}.py").write_text(source)
+        names.append(f"{package}.{name}")
+    return names
+
+
+TRACE_MEMORY = False
+"""为 `True` 时只记录峰值内存; tracemalloc 会拖慢计时, 因此内存在单独的一轮中测量"""
+BASELINE = False
+"""为 `True` 时只使用最初版本就有的 API"""
+
+
+def available(obj: Any, name: str, parameter: str = "") -> bool:
+    """当前版本是否提供该 API (及其参数)"""
+    if BASELINE or not hasattr(obj, name):
+        return False
+    return not parameter or parameter in inspect.signature(getattr(obj, name)).parameters
+
+
+@contextmanager
+def measured(results: Dict[str, Any], name: str, **extra: Any) -> Iterator[None]:
+    gc.collect()
+    if TRACE_MEMORY:
+        tracemalloc.start()
+        try:
+            yield
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[name] = {"peak_bytes": peak}
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        results[name] = {"seconds": time.perf_counter() - start, **extra}
+
+
+def new_saya() -> "tuple[Saya, Broadcast, BroadcastBehaviour]":
+    broadcast = Broadcast()
+    behaviour = BroadcastBehaviour(broadcast)
+    saya = Saya()
+    saya.install_behaviours(behaviour)
+    return saya, broadcast, behaviour
+
+
+def purge(package: str) -> None:
+    for name in [i for i in sys.modules if i == package or i.startswith(f"{package}.")]:
+        del sys.modules[name]
+
+
+def bench_lifecycle(root: Path, args: argparse.Namespace, results: Dict[str, Any]) -> None:
+    package = f"saya_bench_{uuid.uuid4().hex[:8]}"
+    modules = generate_tree(root, package, args.modules, args.cubes, args.require_every)
+    total_cubes = args.modules * args.cubes
+
+    saya, broadcast, _ = new_saya()
+    with saya.module_context():
+        with measured(results, "require", modules=args.modules, cubes=total_cubes):
+            for module in modules:
+                saya.require(module)
+
+        target = saya.channels[modules[-1]]
+        with measured(results, "reload_channel", cubes=args.cubes):
+            saya.reload_channel(target)
+        if available(saya, "reload_channel", "zero_gap"):
+            with measured(results, "reload_channel_zero_gap", cubes=args.cubes):
+                saya.reload_channel(target, zero_gap=True)
+
+        with measured(results, "uninstall_channel", modules=args.modules, cubes=total_cubes):
+            for channel in list(saya.channels.values()):
+                saya.uninstall_channel(channel)
+    purge(package)
+
+    saya, broadcast, _ = new_saya()
+    if available(saya, "require_many"):
+        with saya.module_context():
+            with measured(results, "require_many", modules=args.modules, cubes=total_cubes):
+                saya.require_many(modules)
+    purge(package)
+
+
+def bench_channel(args: argparse.Namespace, results: Dict[str, Any]) -> None:
+    saya, broadcast, behaviour = new_saya()
+    count = args.modules * args.cubes
+
+    with saya.main_context() as channel:
+        methods: Dict[str, Callable] = {}
+        for i in range(count):
+
+            async def method(self, event: SayaModuleInstalled):
+                pass
+
+            methods[f"method_{i}"] = channel.use(ListenerSchema(listening_events=[SayaModuleInstalled]))(method)
+        isolate_class = type("Isolate", (), {"__annotations__": {"a": str}, **methods})
+        with measured(results, "scoped_context", cubes=count):
+            channel.scoped_context(isolate_class)
+
+        def make_handler():
+            async def handler(event: SayaModuleInstalled, value: str):
+                pass
+
+            return handler
+
+        handlers = [make_handler() for _ in range(count)]
+        with measured(results, "listen_decorate", cubes=count):
+            for handler in handlers:
+                listen(SayaModuleInstalled)(decorate("value", Decorator())(handler))
+        with measured(results, "listen_by_name", cubes=count):
+            for handler in handlers:
+                listen("SayaModuleInstalled")(handler)
+        channel.content.clear()
+
+        cubes = [Cube(make_handler(), ListenerSchema(listening_events=[SayaModuleInstalled])) for _ in range(count)]
+
+    if available(behaviour, "allocate_many"):
+        with measured(results, "broadcast_allocate", cubes=count):
+            behaviour.allocate_many(cubes)
+        with measured(results, "broadcast_release", cubes=count):
+            behaviour.release_many(cubes)
+    with measured(results, "broadcast_allocate_single", cubes=count):
+        for cube in cubes:
+            behaviour.allocate(cube)
+    with measured(results, "broadcast_release_single", cubes=count):
+        for cube in cubes:
+            behaviour.release(cube)
+
+
+def run_once(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as temp:
+        sys.path.insert(0, temp)
+        try:
+            bench_lifecycle(Path(temp), args, results)
+        finally:
+            sys.path.remove(temp)
+    bench_channel(args, results)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", type=int, default=100, help="number of generated modules")
+    parser.add_argument("--cubes", type=int, default=10, help="cubes per module")
+    parser.add_argument("--require-every", type=int, default=5, help="every n-th module requires the previous one")
+    parser.add_argument("--repeat", type=int, default=3, help="repeat runs, the fastest one is reported")
+    parser.add_argument("--memory", action="store_true", help="also measure peak memory in a separate, untimed run")
+    parser.add_argument("--baseline", action="store_true", help="only use APIs available in the first release")
+    parser.add_argument("--output", type=Path, help="write JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    global BASELINE, TRACE_MEMORY
+    BASELINE = args.baseline
+
+    from loguru import logger
+
+    logger.remove()
+
+    runs = [run_once(args) for _ in range(args.repeat)]
+    best = {name: min((run[name] for run in runs), key=lambda i: i["seconds"]) for name in runs[0]}
+    if args.memory:
+        TRACE_MEMORY = True
+        for name, result in run_once(args).items():
+            best[name].update(result)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "modules": args.modules,
+            "cubes": args.cubes,
+            "require_every": args.require_every,
+            "repeat": args.repeat,
+            "memory": args.memory,
+            "baseline": args.baseline,
+        },
+        "results": best,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
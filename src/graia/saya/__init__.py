@@ -1,21 +1,42 @@
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import importlib
+import os
 import sys
 from contextlib import contextmanager
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set, Union
 
 from loguru import logger
+from typing_extensions import deprecated
 
 from graia.saya.behaviour import Behaviour, BehaviourInterface
 from graia.saya.channel import Channel
 
-from typing_extensions import deprecated
-
-from .context import channel_instance, environment_metadata, saya_instance
+from .context import bulk_loader, channel_instance, environment_metadata, lifecycle_batches, saya_instance
+from .mount import Factory, MountFactory, MountTable, Teardown, prefixed, run_teardown, unused
+from .profiling import ImportTimer, ModuleLoadReport, current_report, measure
 
 if TYPE_CHECKING:
     from graia.broadcast import Broadcast
+    from graia.broadcast.entities.event import Dispatchable
+
+    from .builtins.broadcast.lazy import LazyChannel
+    from .leak import LeakTracker
+    from .loader import BulkLoader
+
+
+@dataclass
+class LifecycleBatch:
+    """`Saya.batch` 中累积的生命周期变化, 在最外层批次结束时以聚合事件广播"""
+
+    suppress: bool
+    """是否抑制批次中逐模块的 `SayaModuleInstalled` 与 `SayaModuleUninstalled`"""
+    installed: List[Channel] = field(default_factory=list)
+    uninstalled: List[str] = field(default_factory=list)
 
 
 class Saya:
@@ -34,18 +55,45 @@ class Saya:
     behaviour_interface: BehaviourInterface
     behaviours: List[Behaviour]
     channels: Dict[str, Channel]
+    lazy_channels: Dict[str, LazyChannel]
+    dependency_graph: Dict[str, Set[str]]
     broadcast: Optional[Broadcast]
 
     mounts: Dict[str, Any]
+    """挂载点与实例, 使用 `factory` 挂载的值为 `MountFactory`"""
+
+    profiling: bool
+    """设为 `True` 后, 每个模块加载各阶段的耗时与导入树会被记录到 `load_reports` 中"""
+    load_reports: Dict[str, ModuleLoadReport]
+
+    leak_tracker: Optional[LeakTracker]
+    """设置后, 被卸载的 Channel, 模块与 Cube 会被记录下来, 以便检查它们是否被回收"""
+
+    allocation_concurrency: Optional[int]
+    """异步分配或释放 Cube 时同时进行的操作数上限, `None` 表示不限制"""
 
     def __init__(self, broadcast: Optional[Broadcast] = None) -> None:
         self.channels = {}
+        self.lazy_channels = {}
+        self.dependency_graph = {}
         self.behaviours = []
         self.behaviour_interface = BehaviourInterface(self)
         self.behaviour_interface.require_contents[0].behaviours = self.behaviours
 
-        self.mounts = {}
+        self.mounts = MountTable()
         self.broadcast = broadcast
+        self.leak_tracker = None
+        self.profiling = False
+        self.load_reports = {}
+        self.allocation_concurrency = 16
+        self._pending_requires: Dict[str, asyncio.Task] = {}
+        """模块 -> 正在加载它的 `require_async` Task, 该 Task 完成时模块已加载(或加载失败)"""
+        self._allocating: Dict[str, asyncio.Task] = {}
+        """模块 -> 负责分配它的 `require_async` Task"""
+        self._async_loader: Optional[BulkLoader] = None
+        """进行中的 `require_async` 共用的 BulkLoader, 使并发调用中嵌套 require 的同一模块只被导入一次"""
+        self._async_requires = 0
+        self._started_behaviours: List[Behaviour] = []
 
     @contextmanager
     def module_context(self):
@@ -53,6 +101,75 @@ class Saya:
         yield
         saya_instance.reset(saya_token)
 
+    @property
+    def lifecycle_batch(self) -> Optional[LifecycleBatch]:
+        """当前上下文中的生命周期批次, 见 `Saya.batch`; 批次保存在 ContextVar 中, 不会被其他 Task 或线程看到"""
+        return lifecycle_batches.get().get(self)
+
+    @contextmanager
+    def batch(self, suppress: bool = True, emit: bool = True):
+        """开启生命周期批次: 批次中加载与卸载的模块会在最外层批次结束时分别以一个
+        `SayaModulesInstalled` 与 `SayaModulesUninstalled` 事件广播, 使生命周期监听器每批只运行一次.
+
+        `suppress` 为 `True` 时, 批次中不再逐模块广播 `SayaModuleInstalled` 与 `SayaModuleUninstalled`;
+        `SayaModuleUninstall` 发生在 Cube 被释放之前, 无法推迟, 因此总会广播.
+        `Saya.require_many` 与 `Saya.require_package` 会自动开启不抑制逐模块事件的批次.
+        `emit` 为 `False` 时批次结束后不广播聚合事件; 与 `suppress` 一同使用可以完全不分发生命周期事件.
+        嵌套的批次并入最外层批次, 其 `suppress` 与 `emit` 参数被忽略.
+        批次只对当前上下文(Task 或线程)生效, 其他 Task 中同时加载的模块照常逐个广播.
+
+        Examples:
+            ```python
+            >>> with saya.module_context(), saya.batch():
+            >>>     saya.require_many(modules)
+            ```
+        """
+        batches = lifecycle_batches.get()
+        if self in batches:
+            yield batches[self]
+            return
+
+        batch = LifecycleBatch(suppress)
+        token = lifecycle_batches.set({**batches, self: batch})
+        try:
+            yield batch
+        finally:
+            lifecycle_batches.reset(token)
+            if emit and self.broadcast:
+                from .event import SayaModulesInstalled, SayaModulesUninstalled
+
+                if batch.uninstalled:
+                    self._post_event(SayaModulesUninstalled(modules=batch.uninstalled))
+                if batch.installed:
+                    self._post_event(SayaModulesInstalled(channels=batch.installed))
+
+    def _module_installed(self, channel: Channel, report: Optional[ModuleLoadReport] = None) -> None:
+        batch = self.lifecycle_batch
+        if batch is not None:
+            batch.installed.append(channel)
+            if batch.suppress:
+                return
+        if self.broadcast:
+            from .event import SayaModuleInstalled
+
+            event = SayaModuleInstalled(module=channel.module, channel=channel, report=report)
+            if report is None:
+                self._post_event(event)
+            else:
+                with measure(report.event_timing):
+                    self._post_event(event)
+
+    def _module_uninstalled(self, module: str) -> None:
+        batch = self.lifecycle_batch
+        if batch is not None:
+            batch.uninstalled.append(module)
+            if batch.suppress:
+                return
+        if self.broadcast:
+            from .event import SayaModuleUninstalled
+
+            self._post_event(SayaModuleUninstalled(module=module))
+
     @staticmethod
     def current() -> "Saya":
         """返回当前上下文中的 Saya 实例
@@ -71,24 +188,57 @@ class Saya:
         Returns:
             Channel: 已注册了内容的 Channel.
         """
+        channel = self._import_channel(module)
+        try:
+            self._allocate_channel(channel)
+        except:
+            # 分配失败时已分配的 Cube 已被撤销, 同时移除模块以便之后重新导入.
+            sys.modules.pop(module, None)
+            raise
+        return channel
+
+    def _import_channel(self, module: str) -> Channel:
         channel = Channel(module)
         channel_token = channel_instance.set(channel)
+        report_token = None
+        if self.profiling:
+            ImportTimer.install()
+            report = self.load_reports[module] = ModuleLoadReport(module)
+            report_token = current_report.set(report)
 
         try:
-            imported_module = importlib.import_module(module, module)
-            channel._py_module = imported_module
-            with self.behaviour_interface.require_context(module) as interface:
-                for cube in channel.content:
-                    try:
-                        interface.allocate_cube(cube)
-                    except:
-                        logger.exception(f"an error occurred while loading the module's cube: {module}::{cube}")
-                        raise
+            if report_token is None:
+                channel._py_module = importlib.import_module(module, module)
+            else:
+                with ImportTimer.frame(), measure(report.import_timing):
+                    channel._py_module = importlib.import_module(module, module)
         finally:
+            if report_token is not None:
+                current_report.reset(report_token)
             channel_instance.reset(channel_token)
 
         return channel
 
+    def _allocate_channel(self, channel: Channel) -> None:
+        channel_token = channel_instance.set(channel)
+        report = self.load_reports.get(channel.module) if self.profiling else None
+        report_token = current_report.set(report)
+
+        try:
+            with self.behaviour_interface.require_context(channel.module) as interface:
+                try:
+                    if report is None:
+                        interface.allocate_cubes(channel.content)
+                    else:
+                        with measure(report.allocate_timing):
+                            interface.allocate_cubes(channel.content)
+                except:
+                    logger.exception(f"an error occurred while loading the module's cubes: {channel.module}")
+                    raise
+        finally:
+            current_report.reset(report_token)
+            channel_instance.reset(channel_token)
+
     @staticmethod
     def current_env() -> Any:
         """只能用于模块内. 返回在调用 Saya.require 方法时传入的 `require_env` 参数的值
@@ -110,39 +260,391 @@ class Saya:
         """
         logger.debug(f"require {module}")
 
+        # 在其他模块的导入过程中嵌套 require 时, 耗时计入外层模块报告的 nested_timing
+        outer_report = current_report.get() if self.profiling else None
+        if outer_report is not None:
+            with measure(outer_report.nested_timing):
+                return self._require(module, require_env)
+        return self._require(module, require_env)
+
+    def _require(self, module: str, require_env: Any) -> Union[Channel, Any]:
+        requester: Optional[Channel] = channel_instance.get(None)
+        if requester is not None and requester.module not in ("__main__", module):
+            self.dependency_graph.setdefault(requester.module, set()).add(module)
+
         if module in self.channels:
             channel = self.channels[module]
             if channel._export:
                 return channel._export
             return channel
 
+        loader = bulk_loader.get(None)
+        if loader is not None:
+            # 批量导入中: 只导入, 分配交给 require_many 在调用线程中按依赖顺序完成.
+            channel = loader.ensure(module, require_env)
+            if channel._export:
+                return channel._export
+            return channel
+
         env_token = environment_metadata.set(require_env)
-        channel = self.require_resolve(module)
-        self.channels[module] = channel
-        environment_metadata.reset(env_token)
+        try:
+            channel = self.require_resolve(module)
+        finally:
+            environment_metadata.reset(env_token)
+        self._install_channel(channel)
 
-        if self.broadcast:
-            from .event import SayaModuleInstalled
+        if channel._export:
+            return channel._export
+
+        return channel
 
-            token = saya_instance.set(self)
-            self.broadcast.postEvent(
-                SayaModuleInstalled(
-                    module=module,
-                    channel=channel,
-                )
+    def _install_channel(self, channel: Channel) -> None:
+        self.channels[channel.module] = channel
+        # 延迟导入的模块在成功加载后才移除占位 Listener, 加载失败时之后的事件仍会触发导入
+        if channel.module in self.lazy_channels:
+            self.lazy_channels[channel.module].cancel()
+        report = self.load_reports.get(channel.module) if self.profiling else None
+        self._module_installed(channel, report)
+
+        if report is None:
+            logger.info(f"module loading finished: {channel.module}")
+        else:
+            logger.info(
+                f"module loading finished: {channel.module} "
+                f"(import {report.import_timing.wall * 1000:.1f}ms, allocate {report.allocate_timing.wall * 1000:.1f}ms)"
             )
+
+    def require_many(
+        self,
+        modules: Iterable[str],
+        require_env: Any = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Union[Channel, Any]]:
+        """批量导入模块: 互不依赖的模块在线程池中并行导入, 随后在当前线程中按依赖顺序分配 Cube.
+
+        依赖关系来自模块导入时嵌套调用的 `Saya.require`, 以及 `ChannelMeta.dependencies` 中属于本批次的模块.
+        任一模块导入失败时, 本批次中的模块都不会被分配.
+
+        Args:
+            modules (Iterable[str]): 需为可被当前运行时访问的 Python Module 的引入路径
+            require_env (Any, optional): 传给每个模块的 `require_env`, 同 `Saya.require`
+            max_workers (Optional[int], optional): 线程池的最大线程数, 默认由 `ThreadPoolExecutor` 决定
+
+        Returns:
+            Dict[str, Union[Channel, Any]]: 模块引入路径与其 Channel (或 export) 的映射
+        """
+        from .loader import BulkLoader
+
+        loader = BulkLoader(self, modules, require_env, max_workers)
+        logger.debug(f"require many: {loader.modules}")
+        self._load_bulk(loader)
+
+        result: Dict[str, Union[Channel, Any]] = {}
+        for module in loader.modules:
+            channel = self.channels[module]
+            result[module] = channel._export or channel
+        return result
+
+    def _load_bulk(self, loader: BulkLoader, order: Optional[List[str]] = None) -> None:
+        """导入 `loader` 中的模块, 再按依赖顺序分配; 提供 `order` 时直接按其顺序分配, 不再排序"""
+        token = saya_instance.set(self)
+        try:
+            loader.import_all()
+        finally:
             saya_instance.reset(token)
 
-        logger.info(f"module loading finished: {module}")
+        if order is None:
+            channels = loader.sorted_channels()
+        else:
+            imported = loader.imported()
+            channels = [imported.pop(module) for module in order if module in imported]
+            channels.extend(imported.values())
 
-        if channel._export:
-            return channel._export
+        try:
+            with self.batch(suppress=False):
+                for channel in channels:
+                    self._allocate_channel(channel)
+                    self._install_channel(channel)
+        except:
+            loader.discard()
+            raise
+
+    def require_package(
+        self,
+        package: str,
+        require_env: Any = None,
+        manifest: Optional[Union[str, os.PathLike]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Union[Channel, Any]]:
+        """导入包下的所有直接子模块(文件与包, 以 `_` 开头的除外), 导入方式同 `Saya.require_many`
 
-        return channel
+        Args:
+            package (str): 包的引入路径, 如 `modules`
+            require_env (Any, optional): 传给每个模块的 `require_env`, 同 `Saya.require`
+            manifest (Optional[Union[str, os.PathLike]], optional): 模块清单的保存路径, 包目录未变化时直接使用清单而不遍历目录
+            max_workers (Optional[int], optional): 线程池的最大线程数
+
+        Returns:
+            Dict[str, Union[Channel, Any]]: 模块引入路径与其 Channel (或 export) 的映射
+        """
+        from .discovery import discover_modules
+
+        return self.require_many(discover_modules(package, manifest), require_env, max_workers)
+
+    async def require_async(
+        self, module: str, require_env: Any = None, *, threaded: bool = True
+    ) -> Union[Channel, Any]:
+        """`Saya.require` 的异步版本, 不阻塞事件循环.
+
+        模块(及其导入时嵌套 require 的模块)在线程池中导入; 随后并发等待这些模块通过 `Channel.setup` 注册的钩子,
+        最后按依赖顺序通过 `BehaviourInterface.allocate_cubes_async` 分配各模块的 Cube.
+        同一模块的并发调用(包括并发调用中嵌套 require 的同一模块)只会导入与分配一次.
+
+        注意: 默认情况下模块的顶层代码在线程池的线程中执行, 其中没有运行中的事件循环,
+        `asyncio.get_running_loop()` 会失败, 创建的 `asyncio.Lock` 等对象也可能绑定到错误的事件循环.
+        这类模块应将初始化移入 `Channel.setup` 钩子, 或传入 `threaded=False` 在事件循环所在线程中导入(导入期间会阻塞事件循环).
+
+        Raises:
+            AllocationError: 模块中有 Cube 分配失败, 此时该模块已分配的 Cube 已被释放
+
+        Args:
+            module (str): 需为可被当前运行时访问的 Python Module 的引入路径
+            require_env (Any, optional): 同 `Saya.require`
+            threaded (bool, optional): 是否在线程池中导入模块, 默认为 `True`
+
+        Returns:
+            Union[Channel, Any]: 同 `Saya.require`
+        """
+        requester: Optional[Channel] = channel_instance.get(None)
+        if requester is not None and requester.module not in ("__main__", module):
+            self.dependency_graph.setdefault(requester.module, set()).add(module)
+
+        if module not in self.channels:
+            task = self._pending_requires.get(module)
+            if task is None:
+                task = asyncio.ensure_future(self._require_async(module, require_env, threaded))
+                self._track_pending(self._pending_requires, module, task)
+            # 取消等待不会取消加载, 其他等待同一模块的调用不受影响
+            await asyncio.shield(task)
+
+        channel = self.channels[module]
+        return channel._export or channel
+
+    @staticmethod
+    def _track_pending(pending: Dict[str, asyncio.Task], module: str, task: asyncio.Task) -> None:
+        pending[module] = task
+
+        def done(_) -> None:
+            if pending.get(module) is task:
+                del pending[module]
+
+        task.add_done_callback(done)
+
+    async def _require_async(self, module: str, require_env: Any, threaded: bool) -> None:
+        from .loader import BulkLoader
+
+        logger.debug(f"require {module} asynchronously")
+
+        if self._async_loader is None:
+            self._async_loader = BulkLoader(self, ())
+        loader = self._async_loader
+        self._async_requires += 1
+        try:
+            await self._load_async(loader, module, require_env, threaded)
+        finally:
+            self._async_requires -= 1
+            if not self._async_requires:
+                # 没有进行中的调用了: 丢弃因其他模块失败而未被分配的模块
+                self._async_loader = None
+                loader.discard()
+
+    async def _load_async(self, loader: BulkLoader, module: str, require_env: Any, threaded: bool) -> None:
+        context = contextvars.copy_context()
+        context.run(saya_instance.set, self)
+        if threaded:
+            await asyncio.get_running_loop().run_in_executor(
+                None, context.run, loader.import_module, module, require_env
+            )
+        else:
+            context.run(loader.import_module, module, require_env)
+
+        # 本次导入涉及的模块中, 尚无调用负责的由本调用分配; 其余的由先认领它们的调用分配, 需等待其完成.
+        # 认领在事件循环中依次进行, 调用只会等待比它先认领的调用, 因此不会互相等待.
+        task = asyncio.current_task()
+        assert task is not None
+        owned: List[str] = []
+        others: Set[asyncio.Task] = set()
+        for name in loader.subtree(module):
+            if name in self.channels:
+                continue
+            owner = self._allocating.get(name)
+            if owner is None:
+                owned.append(name)
+                self._track_pending(self._allocating, name, task)
+                if name not in self._pending_requires:
+                    self._track_pending(self._pending_requires, name, task)
+            else:
+                others.add(owner)
+        try:
+            for owner in others:
+                await asyncio.shield(owner)
+            channels = loader.sorted_channels(owned)
+            await self._run_setup_hooks(channels)
+            for channel in channels:
+                await self._allocate_channel_async(channel)
+                self._install_channel(channel)
+        except:
+            loader.discard(owned)
+            raise
+
+    async def _allocate_channel_async(self, channel: Channel) -> None:
+        report = self.load_reports.get(channel.module) if self.profiling else None
+        channel_token = channel_instance.set(channel)
+        report_token = current_report.set(report)
+        try:
+            with self.behaviour_interface.task_context(channel.module) as interface:
+                allocation = interface.allocate_cubes_async(channel.content, self.allocation_concurrency)
+                if report is None:
+                    await allocation
+                else:
+                    with measure(report.allocate_timing):
+                        await allocation
+        except:
+            logger.exception(f"an error occurred while loading the module's cubes: {channel.module}")
+            raise
+        finally:
+            current_report.reset(report_token)
+            channel_instance.reset(channel_token)
+
+    async def run_setup_hooks(self) -> None:
+        """并发执行所有已加载模块中尚未执行的 `Channel.setup` 钩子, 如通过 `Saya.require` 引入的模块的钩子"""
+        await self._run_setup_hooks(list(self.channels.values()))
+
+    async def _run_setup_hooks(self, channels: Iterable[Channel]) -> None:
+        async def run(channel: Channel, hook: Callable[[], Any]) -> None:
+            channel_token = channel_instance.set(channel)
+            saya_token = saya_instance.set(self)
+            try:
+                result = hook()
+                if asyncio.iscoroutine(result) or isinstance(result, asyncio.Future):
+                    await result
+            except:
+                logger.exception(f"an error occurred while running the module's setup hook: {channel.module}")
+                raise
+            finally:
+                saya_instance.reset(saya_token)
+                channel_instance.reset(channel_token)
+
+        hooks = []
+        for channel in channels:
+            hooks.extend((channel, hook) for hook in channel._setup_hooks)
+            channel._setup_hooks = []
+        if not hooks:
+            return
+        results = await asyncio.gather(*(run(channel, hook) for channel, hook in hooks), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    def require_plan(
+        self,
+        path: Union[str, os.PathLike],
+        modules: Optional[Iterable[str]] = None,
+        package: Optional[str] = None,
+        require_env: Any = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Union[Channel, Any]]:
+        """按启动计划导入模块, 用于加快重启.
+
+        计划有效时(源文件内容, 包目录与 Python 版本均未变化), 直接按计划中的顺序导入并分配模块, 不再发现与排序;
+        否则通过 `Saya.require_many` (提供 `package` 时先发现其子模块)导入, 并在成功后写入新的计划.
+        模块注册的 Cube 与计划记录的不一致, 或源文件内容未变而修改时间变化时, 计划会被重写.
+
+        Args:
+            path (Union[str, os.PathLike]): 启动计划的保存路径
+            modules (Optional[Iterable[str]], optional): 需要导入的模块, 与计划中记录的不同时计划失效
+            package (Optional[str], optional): 导入该包下的所有直接子模块, 同 `Saya.require_package`
+            require_env (Any, optional): 同 `Saya.require`
+            max_workers (Optional[int], optional): 线程池的最大线程数
+
+        Returns:
+            Dict[str, Union[Channel, Any]]: 模块引入路径与其 Channel (或 export) 的映射
+
+        Raises:
+            ValueError: 没有有效的计划, 且 `modules` 与 `package` 均未提供
+        """
+        from .plan import require_from_plan
+
+        return require_from_plan(self, path, modules, package, require_env, max_workers)
+
+    def require_lazy(
+        self,
+        module: str,
+        events: Iterable[Union[type[Dispatchable], str]],
+        require_env: Any = None,
+    ) -> LazyChannel:
+        """延迟导入模块: 先只注册一个监听 `events` 的占位 Listener, 直到 Broadcast 首次分发其中任一事件时,
+        才真正导入模块并分配 Cube, 然后把该事件转发给模块自身的 Listener.
+
+        在此之前对该模块调用 `Saya.require` 会立即导入它.
+
+        Args:
+            module (str): 需为可被当前运行时访问的 Python Module 的引入路径
+            events (Iterable[Union[type[Dispatchable], str]]): 模块监听的事件类型或事件名称
+            require_env (Any, optional): 同 `Saya.require`
+
+        Returns:
+            LazyChannel: 占位 Channel, 可通过 `load` 立即导入, 或通过 `cancel` 取消
+
+        Raises:
+            TypeError: 当前 Saya 实例没有 Broadcast
+        """
+        if self.broadcast is None:
+            raise TypeError("lazy require needs a broadcast instance")
+
+        from .builtins.broadcast.lazy import LazyChannel
+
+        if module in self.lazy_channels:
+            self.lazy_channels[module].cancel()
+
+        lazy_channel = LazyChannel(self, self.broadcast, module, events, require_env)
+        if module not in self.channels:
+            lazy_channel.install()
+            self.lazy_channels[module] = lazy_channel
+            logger.debug(f"lazy require {module}")
+        return lazy_channel
 
     def install_behaviours(self, *behaviours: Behaviour):
         """在控制器中注册 Behaviour, 用于处理模块提供的内容"""
         self.behaviours.extend(behaviours)
+        self.behaviour_interface.invalidate()
+
+    def uninstall_behaviours(self, *behaviours: Behaviour):
+        """从控制器中移除 Behaviour, 已由它分配的内容不会被释放
+
+        Raises:
+            ValueError: Behaviour 未被注册
+        """
+        for behaviour in behaviours:
+            self.behaviours.remove(behaviour)
+        self.behaviour_interface.invalidate()
+
+    async def startup(self) -> None:
+        """按注册顺序调用尚未启动的 Behaviour 的 `Behaviour.startup`"""
+        for behaviour in list(self.behaviours):
+            if behaviour in self._started_behaviours:
+                continue
+            await behaviour.startup()
+            self._started_behaviours.append(behaviour)
+
+    async def shutdown(self) -> None:
+        """按启动的相反顺序调用已启动的 Behaviour 的 `Behaviour.shutdown`, 出错时记录日志并继续"""
+        while self._started_behaviours:
+            behaviour = self._started_behaviours.pop()
+            try:
+                await behaviour.shutdown()
+            except Exception:
+                logger.exception(f"an error occurred while shutting down the behaviour: {behaviour!r}")
 
     def uninstall_channel(self, channel: Channel):
         """卸载指定的 Channel
@@ -154,6 +656,44 @@ class Saya:
             TypeError: 提供的 Channel 不在本 Saya 实例内
             ValueError: 尝试卸载 __main__, 即主程序所属的模块
         """
+        self._uninstall_channel(channel)
+
+    def _uninstall_channel(self, channel: Channel, reloading: bool = False) -> None:
+        notified = self._begin_uninstall(channel)
+
+        with self.behaviour_interface.require_context(channel.module) as interface:
+            try:
+                interface.release_cubes(channel.content)
+            except:
+                logger.exception(f"an error occurred while releasing the module's cubes: {channel.module}")
+                raise
+
+        self._finish_uninstall(channel, reloading, notified)
+
+    async def uninstall_channel_async(self, channel: Channel) -> None:
+        """`Saya.uninstall_channel` 的异步版本, 见 `BehaviourInterface.release_cubes_async`
+
+        Raises:
+            TypeError: 提供的 Channel 不在本 Saya 实例内
+            ValueError: 尝试卸载 __main__, 即主程序所属的模块
+            AllocationError: 有 Cube 释放失败, 此时模块仍处于已加载状态
+        """
+        notified = self._begin_uninstall(channel)
+
+        channel_token = channel_instance.set(channel)
+        try:
+            with self.behaviour_interface.task_context(channel.module) as interface:
+                await interface.release_cubes_async(channel.content, self.allocation_concurrency)
+        except:
+            logger.exception(f"an error occurred while releasing the module's cubes: {channel.module}")
+            raise
+        finally:
+            channel_instance.reset(channel_token)
+
+        self._finish_uninstall(channel, notified=notified)
+
+    def _begin_uninstall(self, channel: Channel) -> Optional[asyncio.Task]:
+        """检查能否卸载并广播 `SayaModuleUninstall`, 返回分发该事件的 Task"""
         if channel not in self.channels.values():
             raise TypeError("assert an existed channel")
 
@@ -164,60 +704,161 @@ class Saya:
         if self.broadcast:
             from .event import SayaModuleUninstall
 
-            token = saya_instance.set(self)
-            self.broadcast.postEvent(
-                SayaModuleUninstall(
-                    module=channel.module,
-                    channel=channel,
-                )
-            )
-            saya_instance.reset(token)
-
-        with self.behaviour_interface.require_context(channel.module) as interface:
-            for cube in channel.content:
-                try:
-                    interface.release_cube(cube)
-                except:
-                    logger.exception(f"an error occurred while loading the module's cube: {channel.module}::{cube}")
-                    raise
+            return self._post_event(SayaModuleUninstall(module=channel.module, channel=channel))
+        return None
 
+    def _finish_uninstall(
+        self, channel: Channel, reloading: bool = False, notified: Optional[asyncio.Task] = None
+    ) -> None:
         del self.channels[channel.module]
-        channel._py_module = None
-
-        if sys.modules.get(channel.module):
-            del sys.modules[channel.module]
-
-        if self.broadcast:
-            from .event import SayaModuleUninstalled
+        self.dependency_graph.pop(channel.module, None)
+
+        modules = self._drop_modules(channel.module)
+        if self.leak_tracker is not None:
+            self.leak_tracker.track(channel, modules)
+
+        # 重载时 Channel 会被新版本的内容填充, 模块会被立即重新导入, 因此不断开引用, 也不释放它使用的挂载
+        if not reloading:
+            # `SayaModuleUninstall` 的监听器在 Task 中运行, 等它们运行完毕后再断开引用, 使其仍能访问模块的内容
+            if notified is None or notified.done():
+                self._clear_channel(channel)
+            else:
+                notified.add_done_callback(lambda _: self._clear_channel(channel))
+            self._release_mounts(channel.module)
+        self._module_uninstalled(channel.module)
 
-            token = saya_instance.set(self)
-            self.broadcast.postEvent(
-                SayaModuleUninstalled(
-                    module=channel.module,
-                )
-            )
-            saya_instance.reset(token)
-
-    def reload_channel(self, channel: Channel) -> None:
+    @staticmethod
+    def _clear_channel(channel: Channel) -> None:
+        """断开 Channel 对模块内容的引用, 使仍持有该 Channel 的对象不会让整个模块无法被回收"""
+        channel._py_module = None
+        channel._export = None
+        channel.content = []
+        channel.scopes = {}
+        channel._setup_hooks = []
+
+    def _release_mounts(self, module: str) -> None:
+        """释放只被刚卸载的模块使用过的延迟挂载"""
+        for point, target in list(self.mounts.items()):
+            if isinstance(target, MountFactory) and module in target.users:
+                target.users.discard(module)
+                if target.created and not target.users:
+                    try:
+                        run_teardown(target.reset())
+                    except Exception:
+                        logger.exception(f"an error occurred while releasing the mount point: {point}")
+
+    def _module_subtree(self, module: str) -> List[str]:
+        """`sys.modules` 中的模块及其子模块, 不包括作为独立 Channel 加载且仍未卸载的子模块(及其子模块)"""
+        prefix = f"{module}."
+        names = []
+        for name in list(sys.modules):
+            if name != module and not name.startswith(prefix):
+                continue
+            owner = name
+            while owner != module and owner not in self.channels:
+                owner = owner.rpartition(".")[0]
+            if owner == module:
+                names.append(name)
+        return names
+
+    def _drop_modules(self, module: str) -> List[ModuleType]:
+        """从 `sys.modules` 中移除模块及其所有子模块, 并解除其在父包上的属性绑定; 仍在加载中的子模块 Channel 会被保留"""
+        names = self._module_subtree(module)
+        dropped = [sys.modules.pop(name) for name in names]
+        parent_name, _, child = module.rpartition(".")
+        parent = sys.modules.get(parent_name) if parent_name else None
+        if parent is not None and any(getattr(parent, child, None) is i for i in dropped):
+            delattr(parent, child)
+        return dropped
+
+    def reload_channel(self, channel: Channel, *, zero_gap: bool = False) -> None:
         """重载指定的模块
 
         Args:
             channel (Channel): 指定需要重载的模块, 请使用 channels.get 方法获取
+            zero_gap (bool, optional): 先导入新版本的模块, 再在两次事件分发之间把旧版本的 Cube 换成新版本的;
+                新版本导入或分配失败时, 旧版本保持可用. 默认为 `False`, 即先卸载再导入.
+                两种方式都不会释放该模块使用过的延迟挂载.
 
         Raises:
-            TypeError: 没有给定需要被重载的模块(`channel` 与 `module` 都不给定)
-            ValueError: 没有通过 `module` 找到对应的 Channel
+            TypeError: 提供的 Channel 不在本 Saya 实例内
+            ValueError: 尝试重载 __main__, 即主程序所属的模块
         """
-        self.uninstall_channel(channel)
+        if zero_gap:
+            self._reload_zero_gap(channel)
+            return
+
+        self._uninstall_channel(channel, reloading=True)
         new_channel: Channel = self.require_resolve(channel.module)
+        self._adopt_channel(channel, new_channel)
 
+    def _adopt_channel(self, channel: Channel, new_channel: Channel) -> None:
         channel.meta = new_channel.meta
         channel._export = new_channel._export
         channel._py_module = new_channel._py_module
         channel.content = new_channel.content
+        channel.scopes = new_channel.scopes
+        channel._setup_hooks = new_channel._setup_hooks
 
         self.channels[channel.module] = channel
 
+    def _reload_zero_gap(self, channel: Channel) -> None:
+        if channel not in self.channels.values():
+            raise TypeError("assert an existed channel")
+
+        if channel.module == "__main__":
+            raise ValueError("main channel cannot reload")
+
+        module = channel.module
+        old_modules = {name: sys.modules[name] for name in self._module_subtree(module)}
+        for name in old_modules:
+            del sys.modules[name]
+        old_dependencies = self.dependency_graph.pop(module, None)
+
+        def restore_modules():
+            for name in self._module_subtree(module):
+                del sys.modules[name]
+            sys.modules.update(old_modules)
+            if old_dependencies is not None:
+                self.dependency_graph[module] = old_dependencies
+
+        try:
+            new_channel = self._import_channel(module)
+        except:
+            logger.exception(f"failed to import the new version of the module, keeping the old one: {module}")
+            restore_modules()
+            raise
+
+        # 以下操作之间没有 await, 不会有事件分发插入其中.
+        with self.behaviour_interface.require_context(module) as interface:
+            interface.release_cubes(channel.content)
+            try:
+                interface.allocate_cubes(new_channel.content)
+            except:
+                logger.exception(f"failed to allocate the new version of the module, keeping the old one: {module}")
+                interface.allocate_cubes(channel.content)
+                restore_modules()
+                raise
+
+        if self.leak_tracker is not None:
+            self.leak_tracker.track(channel, old_modules.values())
+        self._adopt_channel(channel, new_channel)
+
+        # 替换完成后才通知卸载, 新版本失败时监听器不会收到模块已被卸载的事件
+        if self.broadcast:
+            from .event import SayaModuleUninstall
+
+            self._post_event(SayaModuleUninstall(module=module, channel=channel))
+        self._module_uninstalled(module)
+
+    def _post_event(self, event: Dispatchable) -> asyncio.Task:
+        assert self.broadcast is not None
+        token = saya_instance.set(self)
+        try:
+            return self.broadcast.postEvent(event)
+        finally:
+            saya_instance.reset(token)
+
     @deprecated("create_main_channel is deprecated, use main_context instead", category=DeprecationWarning)
     def create_main_channel(self) -> Channel:
         """创建不可被卸载的 `__main__` 主程序模块
@@ -231,18 +872,7 @@ class Saya:
 
         main_channel = Channel("__main__")
         self.channels["__main__"] = main_channel
-
-        if self.broadcast:
-            from .event import SayaModuleInstalled
-
-            token = saya_instance.set(self)
-            self.broadcast.postEvent(
-                SayaModuleInstalled(
-                    module="__main__",
-                    channel=main_channel,
-                )
-            )
-            saya_instance.reset(token)
+        self._module_installed(main_channel)
 
         return main_channel
 
@@ -267,41 +897,52 @@ class Saya:
         yield main_channel
         try:
             with self.behaviour_interface.require_context("__main__") as interface:
-                for cube in main_channel.content:
-                    try:
-                        interface.allocate_cube(cube)
-                    except:
-                        logger.exception(f"an error occurred while loading the module's cube: __main__::{cube}")
-                        raise
+                try:
+                    interface.allocate_cubes(main_channel.content)
+                except:
+                    logger.exception("an error occurred while loading the module's cubes: __main__")
+                    raise
         finally:
             channel_instance.reset(token)
 
-        if self.broadcast:
-            from .event import SayaModuleInstalled
+        self._module_installed(main_channel)
 
-            token = saya_instance.set(self)
-            self.broadcast.postEvent(
-                SayaModuleInstalled(
-                    module="__main__",
-                    channel=main_channel,
-                )
-            )
-            saya_instance.reset(token)
-
-    def mount(self, mount_point: str, target):
+    def mount(
+        self,
+        mount_point: str,
+        target: Any = None,
+        *,
+        factory: Optional[Factory] = None,
+        teardown: Optional[Teardown] = None,
+    ):
         """挂载实例到 Saya 下, 以便整个模块系统共用.
 
+        提供 `factory` 时, 实例会在首次 `Saya.access` 时才被创建, 并发的首次访问只会调用一次 `factory`;
+        `factory` 可以是异步函数, 此时需要使用 `Saya.access_async` 访问.
+
         Args:
             mount_point (str): 指定的挂载点, 建议使用类似 `saya.builtin.asyncio.event_loop` 这样的形式
             target (Any): 需要挂载的实例
+            factory (Optional[Callable[[], Any]], optional): 创建实例的函数, 与 `target` 二选一
+            teardown (Optional[Callable[[Any], Any]], optional): 卸载挂载或释放未使用的挂载时, 以已创建的实例调用
 
         Returns:
             NoReturn: 已将实例挂载, 可能把已经注册的挂载点给覆盖了.
         """
+        if factory is not None:
+            if target is not None:
+                raise ValueError("target and factory cannot be both provided")
+            target = MountFactory(factory, teardown)
+            # 声明挂载的模块也是它的使用者
+            channel = channel_instance.get(None)
+            if channel is not None:
+                target.users.add(channel.module)
+        elif teardown is not None:
+            raise ValueError("teardown requires a factory")
         self.mounts[mount_point] = target
 
     def unmount(self, mount_point: str):
-        """删除挂载及其挂载点
+        """删除挂载及其挂载点, 已由 `factory` 创建的实例会被传给 `teardown`
 
         Args:
             mount_point (str): 目标挂载点
@@ -312,7 +953,9 @@ class Saya:
         Raises:
             KeyError: 挂载点不存在
         """
-        del self.mounts[mount_point]
+        target = self.mounts.pop(mount_point)
+        if isinstance(target, MountFactory):
+            run_teardown(target.reset())
 
     def access(self, mount_point: str):
         """访问特定挂载点
@@ -325,5 +968,61 @@ class Saya:
 
         Raises:
             KeyError: 挂载点不存在
+            TypeError: 挂载点的 `factory` 为异步函数且实例尚未创建
+        """
+        target = self.mounts[mount_point]
+        if isinstance(target, MountFactory):
+            self._record_mount_user(target)
+            return target.get()
+        return target
+
+    async def access_async(self, mount_point: str):
+        """`Saya.access` 的异步版本, 支持异步的 `factory`
+
+        Raises:
+            KeyError: 挂载点不存在
+        """
+        target = self.mounts[mount_point]
+        if isinstance(target, MountFactory):
+            self._record_mount_user(target)
+            return await target.get_async()
+        return target
+
+    def mount_points(self, prefix: str = "") -> List[str]:
+        """按字典序返回以 `prefix` 开头的挂载点, 如 `saya.builtin.asyncio.`; 不会创建延迟挂载的实例"""
+        return prefixed(self.mounts, prefix)
+
+    def access_prefix(self, prefix: str) -> Dict[str, Any]:
+        """访问所有以 `prefix` 开头的挂载点, 延迟挂载的实例会被创建
+
+        Raises:
+            TypeError: 有挂载点的 `factory` 为异步函数且实例尚未创建
+        """
+        return {point: self.access(point) for point in self.mount_points(prefix)}
+
+    def release_unused_mounts(self) -> List[str]:
+        """将已创建, 但访问过它的模块均已卸载的延迟挂载传给 `teardown` 并丢弃, 再次访问时会重新创建
+
+        Returns:
+            List[str]: 被释放的挂载点
         """
-        return self.mounts[mount_point]
+        released = unused(self.mounts, self.channels)
+        for point in released:
+            run_teardown(self.mounts[point].reset())
+        return released
+
+    def _record_mount_user(self, target: MountFactory) -> None:
+        channel = channel_instance.get(None)
+        target.users.add(channel.module if channel is not None else self._caller_module())
+
+    def _caller_module(self) -> Optional[str]:
+        """调用 Saya 的代码所属的已加载模块; 用于监听器等运行时不在模块上下文中的访问"""
+        frame = sys._getframe(1)
+        while frame is not None and frame.f_globals.get("__name__") == __name__:
+            frame = frame.f_back
+        module = frame.f_globals.get("__name__") if frame is not None else None
+        while module:
+            if module in self.channels:
+                return module
+            module = module.rpartition(".")[0]
+        return None
@@ -0,0 +1,162 @@
+"""在临时的 Saya 实例中加载模块, 输出各模块的导入与分配耗时, 也可以预先编译字节码.
+
+python -m graia.saya modules.a modules.b
+python -m graia.saya --package modules --compile --threshold 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import compileall
+import importlib.util
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from . import Saya
+from .behaviour import Behaviour
+from .cube import Cube
+from .profiling import ModuleLoadReport
+
+
+class NullBehaviour(Behaviour):
+    """接受任意 Cube 而不做任何事, 使没有对应 Behaviour 的 Cube 也能被加载"""
+
+    def allocate(self, cube: Cube[Any]) -> Any:
+        return True
+
+    def release(self, cube: Cube[Any]) -> Any:
+        return True
+
+
+def create_saya() -> Saya:
+    """创建启用了 profiling 的临时 Saya; 安装了 graia-broadcast 时使用一个本地的 Broadcast 处理 ListenerSchema"""
+    try:
+        from graia.broadcast import Broadcast
+
+        from .builtins.broadcast import BroadcastBehaviour
+    except ImportError:
+        saya = Saya()
+    else:
+        broadcast = Broadcast()
+        saya = Saya(broadcast)
+        saya.install_behaviours(BroadcastBehaviour(broadcast))
+    saya.install_behaviours(NullBehaviour())
+    saya.profiling = True
+    return saya
+
+
+def compile_module(module: str) -> bool:
+    """编译模块(为包时编译整个目录)的字节码, 返回是否全部成功"""
+    spec = importlib.util.find_spec(module)
+    if spec is None:
+        raise ModuleNotFoundError(f"no module named {module!r}", name=module)
+    if spec.submodule_search_locations:
+        return all(compileall.compile_dir(i, quiet=1) for i in spec.submodule_search_locations)
+    if spec.origin and spec.origin.endswith(".py"):
+        return bool(compileall.compile_file(spec.origin, quiet=1))
+    return True
+
+
+def summarize(report: ModuleLoadReport) -> Dict[str, Any]:
+    return {
+        "module": report.module,
+        # 不含嵌套 require 的模块, 它们有各自的一行
+        "import": report.exclusive_import_timing.wall,
+        "nested": report.nested_timing.wall,
+        "allocate": report.allocate_timing.wall,
+        "event": report.event_timing.wall,
+        "total": report.exclusive_import_timing.wall + report.allocate_timing.wall + report.event_timing.wall,
+        "cubes": report.cube_count,
+        "imports": sum(1 for _ in _walk(report.imports)),
+    }
+
+
+def _walk(records):
+    for record in records:
+        yield record
+        yield from _walk(record.children)
+
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    width = max([len("module")] + [len(i["module"]) for i in rows])
+    print(f"{'module':<{width}}  {'import':>10}  {'allocate':>10}  {'event':>10}  {'cubes':>6}  {'imports':>8}")
+    for row in rows:
+        print(
+            f"{row['module']:<{width}}  {row['import'] * 1000:>8.1f}ms  {row['allocate'] * 1000:>8.1f}ms  "
+            f"{row['event'] * 1000:>8.1f}ms  {row['cubes']:>6}  {row['imports']:>8}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m graia.saya", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("modules", nargs="*", help="modules to load")
+    parser.add_argument("-p", "--package", action="append", default=[], help="load all submodules of a package")
+    parser.add_argument("--compile", action="store_true", help="compile bytecode for the modules before loading")
+    parser.add_argument("--no-load", action="store_true", help="only compile, do not load the modules")
+    parser.add_argument("--sort", choices=["total", "import", "allocate", "cubes", "load"], default="load")
+    parser.add_argument("--threshold", type=float, help="exit with status 1 if any module takes longer (seconds)")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--verbose", action="store_true", help="keep Saya's log output")
+    args = parser.parse_args(argv)
+
+    if not args.modules and not args.package:
+        parser.error("no modules or packages given")
+
+    if not args.verbose:
+        logger.remove()
+    if "" not in sys.path and os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+    from .discovery import discover_modules
+
+    modules = list(args.modules)
+    for package in args.package:
+        modules.extend(discover_modules(package))
+
+    if args.compile:
+        for module in args.package + args.modules:
+            if not compile_module(module):
+                print(f"failed to compile {module}", file=sys.stderr)
+                return 2
+    if args.no_load:
+        return 0
+
+    saya = create_saya()
+    failed: Dict[str, str] = {}
+    # 不分发任何生命周期事件: 这里没有运行中的事件循环, 也不应运行模块的监听器; 逐个导入, 使耗时归属于各自的模块
+    with saya.module_context(), saya.batch(suppress=True, emit=False):
+        for module in modules:
+            if module in saya.channels:
+                continue
+            try:
+                saya.require(module)
+            except Exception as e:
+                failed[module] = f"{type(e).__name__}: {e}"
+
+    rows = [summarize(report) for report in saya.load_reports.values() if report.module in saya.channels]
+    if args.sort != "load":
+        rows.sort(key=lambda i: i[args.sort], reverse=True)
+    slow = [i["module"] for i in rows if args.threshold is not None and i["total"] > args.threshold]
+
+    if args.json:
+        print(json.dumps({"modules": rows, "failed": failed, "slow": slow}, indent=2))
+    else:
+        print_table(rows)
+        for module, error in failed.items():
+            print(f"failed to load {module}: {error}", file=sys.stderr)
+        for module in slow:
+            print(f"{module} took longer than {args.threshold}s", file=sys.stderr)
+
+    if failed:
+        return 2
+    return 1 if slow else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
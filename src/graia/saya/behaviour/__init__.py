@@ -1,4 +1,5 @@
 from .context import AllocationContext as AllocationContext
 from .context import RequireContext as RequireContext
 from .entity import Behaviour as Behaviour
+from .interface import AllocationError as AllocationError
 from .interface import BehaviourInterface as BehaviourInterface
@@ -1,12 +1,15 @@
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, List
 
+from graia.saya.utils import slotted
+
 if TYPE_CHECKING:
     from graia.saya.cube import Cube
 
     from .entity import Behaviour
 
 
+@slotted()
 @dataclass(init=True)
 class RequireContext:
     module: str
@@ -14,11 +17,13 @@ class RequireContext:
     _index: int = 0
 
 
+@slotted()
 @dataclass(init=True)
 class AllocationContext:
     cube: "Cube"
 
 
+@slotted()
 @dataclass(init=True)
 class RouteContext:
     module: str
@@ -1,10 +1,14 @@
 from abc import ABCMeta, abstractmethod
-from typing import Any
+from typing import Any, ClassVar, List, Tuple, Type
 
 from graia.saya.cube import Cube
+from graia.saya.schema import BaseSchema
 
 
 class Behaviour(metaclass=ABCMeta):
+    schemas: ClassVar[Tuple[Type[BaseSchema], ...]] = ()
+    """该 Behaviour 处理的 Schema 类型(含子类); 为空时视为可能处理任意 Cube."""
+
     @abstractmethod
     def allocate(self, cube: Cube[Any]) -> Any:
         pass
@@ -12,3 +16,44 @@ class Behaviour(metaclass=ABCMeta):
     @abstractmethod
     def release(self, cube: Cube[Any]) -> Any:
         pass
+
+    def allocate_many(self, cubes: List[Cube[Any]]) -> List[Any]:
+        """批量分配 Cube, 返回与 `cubes` 一一对应的结果, `None` 表示不处理该 Cube.
+
+        实现需保证原子性: 抛出异常时, 本次调用中已分配的 Cube 应已被撤销.
+        默认实现逐个调用 `allocate`.
+        """
+        results: List[Any] = []
+        try:
+            for cube in cubes:
+                results.append(self.allocate(cube))
+        except:
+            for cube, result in reversed(list(zip(cubes, results))):
+                if result is not None:
+                    self.release(cube)
+            raise
+        return results
+
+    def release_many(self, cubes: List[Cube[Any]]) -> List[Any]:
+        """批量释放 Cube, 返回与 `cubes` 一一对应的结果, `None` 表示不处理该 Cube.
+
+        默认实现逐个调用 `release`.
+        """
+        return [self.release(cube) for cube in cubes]
+
+    async def allocate_async(self, cube: Cube[Any]) -> Any:
+        """异步分配 Cube, 用于需要 I/O 的 Behaviour (如注册 Webhook), 返回 `None` 表示不处理该 Cube.
+
+        由 `Saya.require_async` 等异步路径调用, 可能与其他 Cube 的分配并发执行. 默认实现调用 `allocate`.
+        """
+        return self.allocate(cube)
+
+    async def release_async(self, cube: Cube[Any]) -> Any:
+        """异步释放 Cube, 返回 `None` 表示不处理该 Cube. 默认实现调用 `release`."""
+        return self.release(cube)
+
+    async def startup(self) -> None:
+        """由 `Saya.startup` 调用, 用于建立连接等准备工作"""
+
+    async def shutdown(self) -> None:
+        """由 `Saya.shutdown` 调用, 用于释放 `startup` 中获取的资源"""
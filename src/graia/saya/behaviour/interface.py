@@ -1,9 +1,13 @@
-import itertools
-from typing import TYPE_CHECKING, Any, Generator, List, Optional
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from graia.broadcast.exceptions import RequirementCrashed
+from loguru import logger
 
 from graia.saya.cube import Cube
+from graia.saya.profiling import AllocationRecord, current_report, measure
 
 from .context import AllocationContext, RequireContext
 from .entity import Behaviour
@@ -11,17 +15,36 @@ from .entity import Behaviour
 if TYPE_CHECKING:
     from graia.saya import Saya
 
-# TODO: Lifecycle for Behaviour
+
+class AllocationError(Exception):
+    """异步分配或释放 Cube 时, 一个或多个 Cube 出错"""
+
+    errors: List[Tuple[Cube, BaseException]]
+    """出错的 Cube 及其异常, 按 Cube 的顺序排列"""
+
+    def __init__(self, message: str, errors: List[Tuple[Cube, BaseException]]) -> None:
+        super().__init__(f"{message}: {len(errors)} cube(s) failed, first: {errors[0][1]!r}")
+        self.errors = errors
 
 
 class BehaviourInterface:
     saya: "Saya"
 
-    require_contents: List[RequireContext]
+    _require_contents: List[RequireContext]
+    _task_contents: "ContextVar[Optional[List[RequireContext]]]"
+    """由 `task_context` 设置, 只对当前 Task 生效的上下文栈"""
+
+    _dispatch_table: Dict[Tuple[type, int], List[Tuple[int, Behaviour]]]
 
     def __init__(self, saya_instance: "Saya") -> None:
         self.saya = saya_instance
-        self.require_contents = [RequireContext("graia.saya.__special__.global_behaviours", [])]
+        self._require_contents = [RequireContext("graia.saya.__special__.global_behaviours", [])]
+        self._task_contents = ContextVar("require_contents", default=None)
+        self._dispatch_table = {}
+
+    @property
+    def require_contents(self) -> List[RequireContext]:
+        return self._task_contents.get() or self._require_contents
 
     @property
     def currentModule(self):
@@ -33,6 +56,7 @@ class BehaviourInterface:
 
     def require_context(self, module: str, behaviours: Optional[List["Behaviour"]] = None):
         self.require_contents.append(RequireContext(module, behaviours or []))
+        self.invalidate()
         return self
 
     def __enter__(self) -> "BehaviourInterface":
@@ -40,44 +64,226 @@ class BehaviourInterface:
 
     def __exit__(self, _, exc: Exception, tb):
         self.require_contents.pop()  # just simple.
+        self.invalidate()
         if tb is not None:
             raise exc.with_traceback(tb)
 
+    @contextmanager
+    def task_context(
+        self, module: str, behaviours: Optional[List["Behaviour"]] = None
+    ) -> Iterator["BehaviourInterface"]:
+        """`require_context` 的异步版本: 上下文栈只对当前 Task 生效, 因此可以跨越 `await` 持有,
+        不会与其他 Task 中的分配交错. 全局 Behaviour 仍与共享的上下文栈相同."""
+        token = self._task_contents.set([self._require_contents[0], RequireContext(module, behaviours or [])])
+        self.invalidate()
+        try:
+            yield self
+        finally:
+            self._task_contents.reset(token)
+            self.invalidate()
+
     def behaviour_generator(self):
         yield from self.require_contents[0].behaviours
         # Cube 没有 behaviours 设定, 哦, 连 always 都没有.
         yield from self.require_contents[-1].behaviours
 
-    def allocate_cube(self, cube: Cube) -> Any:
-        start_offset = self._index + int(bool(self._index))
+    def invalidate(self) -> None:
+        """清空 `candidates` 的缓存; 由 `Saya.install_behaviours`/`Saya.uninstall_behaviours`
+        与 `require_context` 的进入和退出调用, 直接修改 Behaviour 列表后需要手动调用."""
+        self._dispatch_table = {}
+
+    def candidates(self, schema_type: type) -> List[Tuple[int, Behaviour]]:
+        """返回可能处理该 Schema 类型的 Behaviour 及其在 `behaviour_generator` 中的位置.
 
-        for self.require_contents[-1]._index, behaviour in enumerate(
-            itertools.islice(self.behaviour_generator(), start_offset, None, None),
-            start=start_offset,
-        ):
-            result = behaviour.allocate(cube)
+        按 MRO 匹配 `Behaviour.schemas`, 未声明 `schemas` 的 Behaviour 总会被包含;
+        结果按 Schema 类型与当前的上下文缓存, 直到 `invalidate` 被调用.
+        """
+        key = (schema_type, id(self.require_contents[-1]))
+        table = self._dispatch_table.get(key)
+        if table is None:
+            table = self._dispatch_table[key] = [
+                (index, behaviour)
+                for index, behaviour in enumerate(self.behaviour_generator())
+                if not behaviour.schemas or issubclass(schema_type, behaviour.schemas)
+            ]
+        return table
 
-            if result is None:
-                continue
+    def _dispatch(self, cube: Cube, method: str) -> Any:
+        # 保存并恢复 _index: Behaviour 可能在处理一批 Cube 的过程中委托回本接口,
+        # 嵌套的调用不能让同一批中剩余的 Cube 从头开始匹配 Behaviour.
+        saved = self._index
+        start_offset = saved + int(bool(saved))
+        try:
+            for index, behaviour in self.candidates(type(cube.metaclass)):
+                if index < start_offset:
+                    continue
+                self.require_contents[-1]._index = index
+                result = getattr(behaviour, method)(cube)
 
-            self.require_contents[-1]._index = 0
-            return result
-        else:
+                if result is not None:
+                    return result
             raise RequirementCrashed(f"the dispatching requirement crashed: {cube}")
+        finally:
+            self.require_contents[-1]._index = saved
+
+    def allocate_cube(self, cube: Cube) -> Any:
+        return self._dispatch(cube, "allocate")
 
     def release_cube(self, cube: Cube) -> Any:
-        start_offset = self._index + int(bool(self._index))
+        return self._dispatch(cube, "release")
+
+    def _call_batch(self, behaviour: Behaviour, method: str, batch: List[Cube]) -> List[Any]:
+        report = current_report.get()
+        if report is None:
+            return getattr(behaviour, method)(batch)
+        record = AllocationRecord(type(behaviour).__qualname__, [])
+        report.allocations.append(record)
+        with measure(record.timing):
+            results = getattr(behaviour, method)(batch)
+        record.cubes = [repr(cube) for cube, result in zip(batch, results) if result is not None]
+        return results
+
+    def _runs(self, cubes: Iterable[Cube]) -> List[Tuple[List[Tuple[int, Behaviour]], List[Cube]]]:
+        # 连续且候选 Behaviour 相同的 Cube 组成一批, 批与批之间保持声明顺序;
+        # 只有同一批中被前面的 Behaviour 拒绝的 Cube 会排在该批其他 Cube 之后.
+        runs: List[Tuple[List[Tuple[int, Behaviour]], List[Cube]]] = []
+        for cube in cubes:
+            chain = self.candidates(type(cube.metaclass))
+            if runs and (runs[-1][0] is chain or runs[-1][0] == chain):
+                runs[-1][1].append(cube)
+            else:
+                runs.append((chain, [cube]))
+        return runs
+
+    def _route(self, cubes: Iterable[Cube], method: str, handled: List[Tuple[Behaviour, List[Cube]]]) -> None:
+        runs = self._runs(cubes)
+        saved = self._index
+        start_offset = saved + int(bool(saved))
+        try:
+            for chain, pending in runs:
+                for index, behaviour in chain:
+                    if not pending:
+                        break
+                    if index < start_offset:
+                        continue
+                    self.require_contents[-1]._index = index
+                    results = self._call_batch(behaviour, method, pending)
+                    done = [cube for cube, result in zip(pending, results) if result is not None]
+                    if done:
+                        handled.append((behaviour, done))
+                        pending = [cube for cube, result in zip(pending, results) if result is None]
+                if pending:
+                    raise RequirementCrashed(f"the dispatching requirement crashed: {pending[0]}")
+        finally:
+            self.require_contents[-1]._index = saved
 
-        for self.require_contents[-1]._index, behaviour in enumerate(
-            itertools.islice(self.behaviour_generator(), start_offset, None, None),
-            start=start_offset,
-        ):
-            result = behaviour.release(cube)
+    def allocate_cubes(self, cubes: Iterable[Cube]) -> None:
+        """按 Behaviour 批量分配 Cube (见 `Behaviour.allocate_many`).
 
-            if result is None:
-                continue
+        Cube 按声明顺序分配: 连续且可能由同一组 Behaviour 处理的 Cube 会作为一批交给 Behaviour;
+        仅当某个 Cube 被 Behaviour 拒绝(返回 `None`)时, 它会在同一批的其他 Cube 之后交给下一个 Behaviour.
+        要么全部分配成功, 要么在失败时撤销本次已分配的 Cube 后抛出异常.
+        """
+        committed: List[Tuple[Behaviour, List[Cube]]] = []
+        try:
+            self._route(cubes, "allocate_many", committed)
+        except:
+            for behaviour, allocated in reversed(committed):
+                try:
+                    behaviour.release_many(allocated)
+                except Exception:
+                    logger.exception(f"an error occurred while rolling back the module's cubes: {self.currentModule}")
+            raise
 
-            self.require_contents[-1]._index = 0
-            return result
-        else:
+    def release_cubes(self, cubes: Iterable[Cube]) -> None:
+        """按 Behaviour 批量释放 Cube (见 `Behaviour.release_many`)"""
+        self._route(cubes, "release_many", [])
+
+    async def _gather(self, cubes: Iterable[Cube], method: str, limit: Optional[int]) -> List[Tuple[Cube, Any]]:
+        # 候选 Behaviour 在第一次 await 之前确定, 之后 Behaviour 列表的变化不影响本次分配.
+        plan = [(cube, [behaviour for _, behaviour in self.candidates(type(cube.metaclass))]) for cube in cubes]
+        semaphore = asyncio.Semaphore(limit) if limit else None
+
+        async def dispatch(cube: Cube, behaviours: List[Behaviour]) -> Any:
+            for behaviour in behaviours:
+                if semaphore is None:
+                    result = await getattr(behaviour, method)(cube)
+                else:
+                    async with semaphore:
+                        result = await getattr(behaviour, method)(cube)
+                if result is not None:
+                    return result
             raise RequirementCrashed(f"the dispatching requirement crashed: {cube}")
+
+        results = await asyncio.gather(
+            *(dispatch(cube, behaviours) for cube, behaviours in plan), return_exceptions=True
+        )
+        return [(cube, result) for (cube, _), result in zip(plan, results)]
+
+    async def allocate_cubes_async(self, cubes: Iterable[Cube], limit: Optional[int] = None) -> None:
+        """并发地分配 Cube (见 `Behaviour.allocate_async`), 同时进行的分配不超过 `limit` 个.
+
+        每个 Cube 依次尝试可能处理它的 Behaviour, 直到某个 Behaviour 返回非 `None` 的结果.
+        任一 Cube 分配失败时, 已分配成功的 Cube 会被释放, 随后抛出包含所有出错 Cube 的 `AllocationError`.
+
+        Raises:
+            AllocationError: 一个或多个 Cube 分配失败
+        """
+        results = await self._gather(cubes, "allocate_async", limit)
+        errors = [(cube, result) for cube, result in results if isinstance(result, BaseException)]
+        if not errors:
+            return
+
+        allocated = [cube for cube, result in results if not isinstance(result, BaseException)]
+        for cube, result in await self._gather(reversed(allocated), "release_async", limit):
+            if isinstance(result, BaseException):
+                logger.opt(exception=result).error(f"an error occurred while rolling back cubes: {cube}")
+        raise AllocationError("failed to allocate cubes", errors)
+
+    async def _release_batch(
+        self, behaviour: Behaviour, cubes: List[Cube], semaphore: Optional[asyncio.Semaphore]
+    ) -> List[Any]:
+        # 未重写 release_async 的 Behaviour 与同步路径一样通过 release_many 一次性释放
+        if type(behaviour).release_async is Behaviour.release_async:
+            try:
+                return self._call_batch(behaviour, "release_many", cubes)
+            except Exception as e:
+                return [e] * len(cubes)
+
+        async def release(cube: Cube) -> Any:
+            if semaphore is None:
+                return await behaviour.release_async(cube)
+            async with semaphore:
+                return await behaviour.release_async(cube)
+
+        return await asyncio.gather(*(release(cube) for cube in cubes), return_exceptions=True)
+
+    async def release_cubes_async(self, cubes: Iterable[Cube], limit: Optional[int] = None) -> None:
+        """释放 Cube, 出错的 Cube 不影响其他 Cube 的释放.
+
+        与 `release_cubes` 相同, Cube 按 Behaviour 分批; 未重写 `Behaviour.release_async` 的 Behaviour
+        通过 `Behaviour.release_many` 一次性释放整批 Cube (此时一批中的异常会记在该批所有 Cube 上),
+        其他 Behaviour 则并发地调用 `release_async`, 同时进行的释放不超过 `limit` 个.
+
+        Raises:
+            AllocationError: 一个或多个 Cube 释放失败
+        """
+        cubes = list(cubes)
+        semaphore = asyncio.Semaphore(limit) if limit else None
+        errors: List[Tuple[Cube, BaseException]] = []
+        for chain, pending in self._runs(cubes):
+            for _, behaviour in chain:
+                if not pending:
+                    break
+                results = await self._release_batch(behaviour, pending, semaphore)
+                errors.extend(
+                    (cube, result) for cube, result in zip(pending, results) if isinstance(result, BaseException)
+                )
+                pending = [cube for cube, result in zip(pending, results) if result is None]
+            errors.extend(
+                (cube, RequirementCrashed(f"the dispatching requirement crashed: {cube}")) for cube in pending
+            )
+        if errors:
+            order = {id(cube): index for index, cube in enumerate(cubes)}
+            errors.sort(key=lambda i: order[id(i[0])])
+            raise AllocationError("failed to release cubes", errors)
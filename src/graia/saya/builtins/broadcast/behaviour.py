@@ -1,36 +1,102 @@
-from typing import Any
+from contextlib import suppress
+from typing import Any, Dict, List, Optional, Tuple
 
 from graia.broadcast import Broadcast
+from graia.broadcast.entities.listener import Listener
 
 from graia.saya.behaviour import Behaviour
 from graia.saya.cube import Cube
 
+from .index import ListenerList
 from .schema import ListenerSchema
 
 
 class BroadcastBehaviour(Behaviour):
+    schemas = (ListenerSchema,)
+
     broadcast: Broadcast
 
+    _listeners: Dict[int, Tuple[Cube, Listener]]
+    """id(cube) -> (cube, listener), 保留 cube 的引用以保证 id 不被复用"""
+
     def __init__(self, broadcast: Broadcast) -> None:
         self.broadcast = broadcast
+        self._listeners = {}
+
+    def _build_listener(self, cube: Cube[ListenerSchema]) -> Listener:
+        listener = cube.metaclass.build_listener(cube.content, self.broadcast)
+        if not listener.namespace:
+            listener.namespace = self.broadcast.getDefaultNamespace()
+        self._listeners[id(cube)] = (cube, listener)
+        return listener
+
+    def get_listener(self, cube: Cube) -> Optional[Listener]:
+        """返回由该 Cube 构建的 Listener"""
+        if id(cube) in self._listeners:
+            return self._listeners[id(cube)][1]
+        return self.broadcast.getListener(cube.content)
+
+    def _pop_listener(self, cube: Cube) -> Optional[Listener]:
+        if id(cube) in self._listeners:
+            return self._listeners.pop(id(cube))[1]
+        return self.broadcast.getListener(cube.content)
 
     def allocate(
         self,
         cube: Cube[ListenerSchema],
     ):
         if isinstance(cube.metaclass, ListenerSchema):
-            listener = cube.metaclass.build_listener(cube.content, self.broadcast)
-            if not listener.namespace:
-                listener.namespace = self.broadcast.getDefaultNamespace()
-            self.broadcast.listeners.append(listener)
+            self.broadcast.listeners.append(self._build_listener(cube))
         else:
             return
         return True
 
+    def allocate_many(self, cubes: List[Cube]) -> List[Any]:
+        listeners: List[Listener] = []
+        results: List[Any] = []
+        try:
+            for cube in cubes:
+                if isinstance(cube.metaclass, ListenerSchema):
+                    listeners.append(self._build_listener(cube))
+                    results.append(True)
+                else:
+                    results.append(None)
+        except:
+            for cube, result in zip(cubes, results):
+                if result is not None:
+                    self._listeners.pop(id(cube), None)
+            raise
+        self.broadcast.listeners.extend(listeners)
+        return results
+
     def release(self, cube: Cube) -> Any:
-        if isinstance(cube.metaclass, ListenerSchema):
-            self.broadcast.removeListener(self.broadcast.getListener(cube.content))
-        else:
-            return
+        return self.release_many([cube])[0]
 
-        return True
+    def release_many(self, cubes: List[Cube]) -> List[Any]:
+        """释放 Cube 对应的 Listener.
+
+        Listener 通过登记表以 O(1) 找到, 但 `broadcast.listeners` 是列表, 移除需要遍历一次;
+        因此释放多个 Cube 时应一次性调用本方法, 而不是逐个调用 `release`.
+
+        Broadcast 的 `argument_signature` 缓存(LRU)仍会引用已释放的 callable, 直到它们被逐出;
+        这里不清空整个缓存, 以免影响其他监听器. `LeakTracker.report` 会在检查前清空它.
+        """
+        removed: Dict[int, Listener] = {}
+        results: List[Any] = []
+        for cube in cubes:
+            if isinstance(cube.metaclass, ListenerSchema):
+                listener = self._pop_listener(cube)
+                if listener is not None:
+                    removed[id(listener)] = listener
+                results.append(True)
+            else:
+                results.append(None)
+        if len(removed) == 1:
+            # 单个 Listener 时 list.remove 找到即停, 比重建列表快
+            with suppress(ValueError):  # 可能已经因 RemoveMe 被 Broadcast 移除
+                self.broadcast.listeners.remove(next(iter(removed.values())))
+        elif isinstance(self.broadcast.listeners, ListenerList):  # IndexedBroadcast, 增量更新其索引
+            self.broadcast.listeners.remove_many(removed.values())
+        elif removed:
+            self.broadcast.listeners[:] = [i for i in self.broadcast.listeners if id(i) not in removed]
+        return results
@@ -0,0 +1,220 @@
+"""按事件类型索引监听器的 Broadcast, 使分发事件时只需遍历监听该事件的监听器"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from graia.broadcast import Broadcast
+from graia.broadcast.entities.event import Dispatchable
+from graia.broadcast.entities.listener import Listener
+
+
+class ListenerList(List[Listener]):
+    """`IndexedBroadcast.listeners` 使用的列表, 把增删同步到 `ListenerIndex`.
+
+    `append`/`extend`/`remove`/`pop`/`remove_many` 增量更新索引, 其他修改(切片赋值, 排序等)使索引在下次分发时重建.
+    """
+
+    index: ListenerIndex
+
+    def __init__(self, iterable: Iterable[Listener] = (), index: Optional[ListenerIndex] = None) -> None:
+        super().__init__(iterable)
+        self.index = index or ListenerIndex(self)
+
+    def append(self, listener: Listener) -> None:
+        super().append(listener)
+        self.index.add(listener)
+
+    def extend(self, listeners: Iterable[Listener]) -> None:
+        listeners = list(listeners)
+        super().extend(listeners)
+        for listener in listeners:
+            self.index.add(listener)
+
+    def __iadd__(self, listeners: Iterable[Listener]):  # type: ignore
+        self.extend(listeners)
+        return self
+
+    def remove(self, listener: Listener) -> None:
+        super().remove(listener)
+        self.index.discard(listener)
+
+    def pop(self, index: Any = -1) -> Listener:
+        listener = super().pop(index)
+        self.index.discard(listener)
+        return listener
+
+    def remove_many(self, listeners: Iterable[Listener]) -> None:
+        """一次遍历移除多个监听器(的所有出现), 不在列表中的会被忽略"""
+        targets = {id(i): i for i in listeners}
+        kept = [i for i in self if id(i) not in targets]
+        removed = len(self) - len(kept)
+        if not removed:
+            return
+        list.__setitem__(self, slice(None), kept)
+        for listener in targets.values():
+            while self.index.discard(listener):
+                pass
+
+    def _invalidating(name: str) -> Callable:  # type: ignore
+        method = getattr(list, name)
+
+        def wrapper(self: ListenerList, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            self.index.invalidate()
+            return result
+
+        wrapper.__name__ = name
+        return wrapper
+
+    insert = _invalidating("insert")
+    clear = _invalidating("clear")
+    sort = _invalidating("sort")
+    reverse = _invalidating("reverse")
+    __setitem__ = _invalidating("__setitem__")
+    __delitem__ = _invalidating("__delitem__")
+    __imul__ = _invalidating("__imul__")
+    del _invalidating
+
+
+class ListenerIndex:
+    """事件类型 -> 按优先级排序的监听器.
+
+    优先级(包括 `ListenerSchema.extra_priorities`)在分发时由 Broadcast 重新分组, 因此修改优先级不需要更新索引;
+    直接修改已注册监听器的 `listening_events` 后需要调用 `refresh`.
+    """
+
+    listeners: ListenerList
+
+    _events: Dict[Type[Dispatchable], Dict[int, Listener]]
+    _sorted: Dict[Type[Dispatchable], List[Listener]]
+    _keys: Dict[int, Tuple[Type[Dispatchable], ...]]
+    """id(listener) -> 建立索引时监听的事件, 移除时按此清理"""
+    _counts: Dict[int, int]
+    """id(listener) -> 该监听器在列表中出现的次数"""
+
+    def __init__(self, listeners: ListenerList) -> None:
+        self.listeners = listeners
+        self._events = {}
+        self._sorted = {}
+        self._keys = {}
+        self._counts = {}
+        self._dirty = True
+
+    def invalidate(self) -> None:
+        self._dirty = True
+
+    def _rebuild(self) -> None:
+        self._events = {}
+        self._sorted = {}
+        self._keys = {}
+        self._counts = {}
+        self._dirty = False
+        for listener in self.listeners:
+            self.add(listener)
+
+    def _index(self, listener: Listener, events: Iterable[Type[Dispatchable]]) -> None:
+        for event in events:
+            self._events.setdefault(event, {})[id(listener)] = listener
+            self._sorted.pop(event, None)
+
+    def _unindex(self, listener: Listener, events: Iterable[Type[Dispatchable]]) -> None:
+        for event in events:
+            listeners = self._events.get(event)
+            if listeners is not None and listeners.pop(id(listener), None) is not None:
+                self._sorted.pop(event, None)
+
+    def add(self, listener: Listener) -> None:
+        if self._dirty:
+            return
+        count = self._counts.get(id(listener), 0)
+        self._counts[id(listener)] = count + 1
+        if count:  # 同一监听器重复出现在列表中时, 只需索引一次
+            return
+        keys = self._keys[id(listener)] = tuple(dict.fromkeys(listener.listening_events))
+        self._index(listener, keys)
+
+    def discard(self, listener: Listener) -> bool:
+        """列表中移除了一次该监听器; 返回移除前它是否已被索引"""
+        if self._dirty:
+            return False
+        count = self._counts.pop(id(listener), 0)
+        if count > 1:
+            self._counts[id(listener)] = count - 1
+        elif count == 1:
+            self._unindex(listener, self._keys.pop(id(listener)))
+        return bool(count)
+
+    def refresh(self, listener: Listener) -> None:
+        """监听器的 `listening_events` 被直接修改后, 重新索引该监听器"""
+        if self._dirty or id(listener) not in self._keys:
+            return
+        keys = tuple(dict.fromkeys(listener.listening_events))
+        old = self._keys[id(listener)]
+        if keys == old:
+            return
+        self._unindex(listener, old)
+        self._keys[id(listener)] = keys
+        self._index(listener, keys)
+
+    def candidates(self, event_class: Type[Dispatchable]) -> List[Listener]:
+        """返回监听该事件且命名空间可用的监听器, 按优先级排序"""
+        if self._dirty:
+            self._rebuild()
+        listeners = self._sorted.get(event_class)
+        if listeners is None:
+            listeners = sorted(
+                self._events.get(event_class, {}).values(), key=lambda x: x.priorities.get(event_class) or x.priority
+            )
+            self._sorted[event_class] = listeners
+        return [i for i in listeners if not i.namespace.hide and not i.namespace.disabled]
+
+
+class IndexedBroadcast(Broadcast):
+    """按事件类型索引监听器的 Broadcast, 用于监听器很多的场合.
+
+    `listeners` 总是 `ListenerList` (整体赋值时会被转换), 其增删会同步到索引; `receiver` 造成的修改也会被处理.
+    其他方式直接修改已注册监听器的 `listening_events` 后, 需要调用 `listener_index.refresh(listener)`.
+
+    Examples:
+        ```python
+        >>> broadcast = IndexedBroadcast()
+        >>> saya = Saya(broadcast)
+        >>> saya.install_behaviours(BroadcastBehaviour(broadcast))
+        ```
+    """
+
+    _listeners: ListenerList
+
+    @property
+    def listeners(self) -> ListenerList:  # type: ignore
+        return self._listeners
+
+    @listeners.setter
+    def listeners(self, value: Iterable[Listener]) -> None:
+        # 整体替换时沿用原有的索引对象, 之前取得的 `listener_index` 仍然有效
+        index = self._listeners.index if hasattr(self, "_listeners") else None
+        self._listeners = ListenerList(value, index)
+        if index is not None:
+            index.listeners = self._listeners
+            index.invalidate()
+
+    @property
+    def listener_index(self) -> ListenerIndex:
+        return self._listeners.index
+
+    def default_listener_generator(self, event_class) -> Iterable[Listener]:
+        return self._listeners.index.candidates(event_class)
+
+    def receiver(self, *args, **kwargs):
+        wrapper = super().receiver(*args, **kwargs)
+
+        def receiver_wrapper(callable_target):
+            result = wrapper(callable_target)
+            # 已注册的监听器会被追加监听的事件
+            listener = self.getListener(callable_target)
+            if listener is not None:
+                self.listener_index.refresh(listener)
+            return result
+
+        return receiver_wrapper
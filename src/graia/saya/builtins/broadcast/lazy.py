@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional, Type, Union
+
+from graia.broadcast import Broadcast
+from graia.broadcast.entities.event import Dispatchable
+from graia.broadcast.entities.listener import Listener
+from loguru import logger
+
+from graia.saya.channel import Channel
+from graia.saya.cube import Cube
+
+from .behaviour import BroadcastBehaviour
+from .registry import event_registry
+from .schema import ListenerSchema
+
+if TYPE_CHECKING:
+    from graia.saya import Saya
+
+PLACEHOLDER_PRIORITY = -(2**31)
+
+
+def resolve_events(events: Iterable[Union[Type[Dispatchable], str]]) -> List[Type[Dispatchable]]:
+    return [event_registry.resolve(event) if isinstance(event, str) else event for event in events]
+
+
+class LazyChannel:
+    """模块的占位 Channel: 仅向 Broadcast 注册一个监听指定事件的占位 Listener,
+    首次收到其中任一事件时才真正导入模块并分配 Cube, 随后把该事件转发给模块的 Listener.
+    """
+
+    saya: "Saya"
+    broadcast: Broadcast
+    module: str
+    events: List[Type[Dispatchable]]
+    require_env: Any
+
+    listener: Optional[Listener]
+
+    def __init__(
+        self,
+        saya: "Saya",
+        broadcast: Broadcast,
+        module: str,
+        events: Iterable[Union[Type[Dispatchable], str]],
+        require_env: Any = None,
+    ) -> None:
+        self.saya = saya
+        self.broadcast = broadcast
+        self.module = module
+        self.events = resolve_events(events)
+        self.require_env = require_env
+        self.listener = None
+
+    def install(self) -> None:
+        self.listener = Listener(
+            callable=self.trigger,
+            namespace=self.broadcast.getDefaultNamespace(),
+            listening_events=self.events,
+            priority=PLACEHOLDER_PRIORITY,
+        )
+        self.broadcast.listeners.append(self.listener)
+
+    def cancel(self) -> None:
+        """移除占位 Listener, 不导入模块"""
+        if self.listener is not None and self.listener in self.broadcast.listeners:
+            self.broadcast.removeListener(self.listener)
+        self.listener = None
+        if self.saya.lazy_channels.get(self.module) is self:
+            del self.saya.lazy_channels[self.module]
+
+    def load(self) -> Channel:
+        """立即导入模块并分配 Cube, 返回其 Channel.
+
+        导入或分配失败时占位 Listener 会被保留, 之后收到的事件会再次尝试导入.
+        """
+        with self.saya.module_context():
+            self.saya.require(self.module, self.require_env)
+        self.cancel()
+        return self.saya.channels[self.module]
+
+    def _get_listener(self) -> Callable[[Cube], Optional[Listener]]:
+        for behaviour in self.saya.behaviours:
+            if isinstance(behaviour, BroadcastBehaviour) and behaviour.broadcast is self.broadcast:
+                return behaviour.get_listener
+        return lambda cube: self.broadcast.getListener(cube.content)
+
+    def listeners_for(self, channel: Channel, event_class: Type[Dispatchable]) -> List[Listener]:
+        get_listener = self._get_listener()
+        result = []
+        for cube in channel.content.by_schema(ListenerSchema):
+            if event_class not in cube.metaclass.listening_events:
+                continue
+            listener = get_listener(cube)
+            if listener is not None and not listener.namespace.hide and not listener.namespace.disabled:
+                result.append(listener)
+        return result
+
+    async def trigger(self) -> None:
+        event: Dispatchable = self.broadcast.event_ctx.get()
+        channel = self.saya.channels.get(self.module)
+        if channel is None:
+            pending = self.saya._pending_requires.get(self.module)
+            if pending is not None:  # 模块正由 `Saya.require_async` 导入, 等待其完成而不是再导入一次
+                await asyncio.shield(pending)
+                channel = self.saya.channels[self.module]
+            else:
+                logger.debug(f"lazy channel triggered by {event.__class__.__name__}: {self.module}")
+                channel = self.load()
+        await self.broadcast.layered_scheduler(
+            listener_generator=self.listeners_for(channel, event.__class__),
+            event=event,
+        )
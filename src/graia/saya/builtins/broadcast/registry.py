@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import sys
+import threading
+import weakref
+from typing import Dict, List, Optional, Type
+
+from graia.broadcast.entities.event import Dispatchable
+from loguru import logger
+
+
+class EventRegistry:
+    """按名称查找 `Dispatchable` 子类, 供 `listen("EventName")` 等以名称指定事件的场合使用.
+
+    首次查找时遍历一次子类树, 之后只在查找不到时增量地登记新出现的子类.
+    找到的类已不是其模块中的同名类(如模块被重载)时, 直接从模块中取出新的类替换该条目, 不再遍历子类树.
+    名称可以是类名, 也可以是 `模块名.限定名`; 同一类名对应多个类时会给出警告, 并使用最后登记的类.
+    只持有事件类的弱引用, 不会阻止被卸载模块中的事件类被回收.
+    """
+
+    root: Type[Dispatchable]
+
+    def __init__(self, root: Type[Dispatchable] = Dispatchable) -> None:
+        self.root = root
+        self._seen: "weakref.WeakSet[type]" = weakref.WeakSet()
+        self._by_name: Dict[str, List[weakref.ref]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _origin(cls: type) -> str:
+        return f"{cls.__module__}.{cls.__qualname__}"
+
+    def _register(self, name: str, cls: type) -> None:
+        refs = self._by_name.setdefault(name, [])
+        # 同一模块中同一限定名的旧版本(模块被重载前的类)被新类替换, 不视为重名
+        origin = self._origin(cls) if "<locals>" not in cls.__qualname__ else None
+        refs[:] = [i for i in refs if (c := i()) is not None and self._origin(c) != origin]
+        refs.append(weakref.ref(cls))
+        if len(refs) > 1:
+            logger.warning(
+                f"ambiguous event name {name!r}: "
+                f"{', '.join(self._origin(c) for c in (i() for i in refs) if c is not None)}"
+            )
+
+    def _add(self, cls: type) -> None:
+        self._seen.add(cls)
+        self._register(cls.__name__, cls)
+        self._register(self._origin(cls), cls)
+
+    def refresh(self) -> None:
+        """登记尚未登记的子类"""
+        with self._lock:
+            stack: List[type] = [self.root]
+            while stack:
+                cls = stack.pop()
+                if cls not in self._seen:
+                    self._add(cls)
+                stack.extend(reversed(cls.__subclasses__()))
+
+    @staticmethod
+    def _module_attribute(cls: type) -> object:
+        """类所在模块中, 其限定名当前对应的对象; 模块已被移除时为 `None`"""
+        target: object = sys.modules.get(cls.__module__)
+        for part in cls.__qualname__.split("."):
+            if target is None:
+                break
+            target = getattr(target, part, None)
+        return target
+
+    def _is_current(self, cls: type) -> bool:
+        """类是否仍是其模块中对应限定名的对象; 模块被重载或移除后, 旧的类不再是当前的类"""
+        if "<locals>" in cls.__qualname__:
+            return True
+        return self._module_attribute(cls) is cls
+
+    def _lookup(self, name: str, current: bool = False) -> Optional[Type[Dispatchable]]:
+        refs = self._by_name.get(name)
+        if not refs:
+            return None
+        for ref in reversed(refs):
+            cls = ref()
+            if cls is not None and (not current or self._is_current(cls)):
+                return cls
+        return None
+
+    def resolve(self, name: str) -> Type[Dispatchable]:
+        """按名称返回事件类
+
+        Raises:
+            KeyError: 找不到该名称的事件类
+        """
+        cls = self._lookup(name, current=True) or self._lookup(name)
+        if cls is None:
+            self.refresh()
+            cls = self._lookup(name, current=True) or self._lookup(name)
+            if cls is None:
+                raise KeyError(name)
+        elif not self._is_current(cls):
+            replacement = self._module_attribute(cls)
+            if isinstance(replacement, type) and issubclass(replacement, self.root):
+                with self._lock:
+                    self._add(replacement)
+                cls = replacement
+        return cls
+
+
+event_registry = EventRegistry()
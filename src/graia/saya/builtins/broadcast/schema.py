@@ -8,8 +8,10 @@ from graia.broadcast.entities.listener import Listener
 from graia.broadcast.entities.namespace import Namespace
 from graia.broadcast.typing import T_Dispatcher
 from graia.saya.schema import BaseSchema
+from graia.saya.utils import slotted
 
 
+@slotted()
 @dataclass
 class ListenerSchema(BaseSchema):
     listening_events: List[Type[Dispatchable]]
@@ -0,0 +1,510 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import queue
+import sys
+import threading
+import weakref
+from multiprocessing.connection import Connection
+from multiprocessing.reduction import ForkingPickler
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from graia.broadcast import Broadcast
+from graia.broadcast.entities.event import Dispatchable
+from graia.broadcast.entities.listener import Listener
+from loguru import logger
+
+from graia.saya import Saya
+from graia.saya.channel import Channel
+
+from .index import IndexedBroadcast
+from .schema import ListenerSchema
+
+EventPath = Tuple[str, str]
+"""事件类型的 (模块, 限定名), 用于跨进程传递事件类型"""
+
+Setup = Callable[[Saya], Any]
+"""在分片进程中加载模块前调用, 可用于安装额外的 Behaviour; 需可被 pickle (模块级函数)"""
+
+
+def event_path(event_class: type) -> EventPath:
+    return event_class.__module__, event_class.__qualname__
+
+
+def resolve_event_path(path: EventPath) -> Optional[Type[Dispatchable]]:
+    """在本进程已导入的模块中查找事件类型, 找不到时返回 `None`.
+
+    不会导入模块: 分片中的模块不应在协调者中执行, 而本进程未导入的事件类型也不会在本进程中被广播.
+    """
+    module, qualname = path
+    target: Any = sys.modules.get(module)
+    for name in qualname.split("."):
+        if target is None:
+            break
+        target = getattr(target, name, None)
+    if isinstance(target, type) and issubclass(target, Dispatchable):
+        return target
+    return None
+
+
+def listened_events(saya: Saya) -> List[EventPath]:
+    """分片中所有 `ListenerSchema` 监听的事件类型"""
+    events: Dict[EventPath, None] = {}
+    for channel in list(saya.channels.values()):
+        for cube in channel.content.by_schema(ListenerSchema):
+            for event in cube.metaclass.listening_events:
+                events[event_path(event)] = None
+    return list(events)
+
+
+def _stub_channel(module: str, meta: Dict[str, Any]) -> Channel:
+    channel = Channel(module)
+    channel.meta.update(meta)  # type: ignore
+    return channel
+
+
+class _Writer:
+    """在单独的线程中按顺序向管道写入消息, 管道已满时不会阻塞事件循环.
+
+    消息在调用者中序列化, 无法 pickle 的消息会立即抛出异常; 管道关闭后调用 `on_closed`.
+    """
+
+    def __init__(self, conn: Connection, name: str, on_closed: Optional[Callable[[], Any]] = None) -> None:
+        self.conn = conn
+        self.on_closed = on_closed
+        self._outbox: "queue.SimpleQueue[Optional[bytes]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name=f"saya-shard-{name}-writer", daemon=True)
+        self._thread.start()
+
+    def send(self, message: Tuple[Any, ...]) -> None:
+        self._outbox.put(bytes(ForkingPickler.dumps(message)))
+
+    def close(self, timeout: Optional[float] = 0) -> None:
+        """写完已排队的消息后结束写入线程, 最多等待 `timeout` 秒"""
+        self._outbox.put(None)
+        if timeout != 0:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            data = self._outbox.get()
+            if data is None:
+                return
+            try:
+                self.conn.send_bytes(data)
+            except (OSError, EOFError, ValueError):  # ValueError: 管道已被关闭
+                if self.on_closed is not None:
+                    self.on_closed()
+                return
+
+
+# 分片进程与协调者之间的消息均为元组, 第一项为消息类型:
+# 协调者 -> 分片: ("event", event), ("require", module), ("uninstall", module),
+#                 ("installed", module, meta), ("uninstalled", module), ("stop",)
+# 分片 -> 协调者: ("ready", modules, events), ("installed", module, meta, events),
+#                 ("uninstalled", module, events), ("error", message)
+
+
+class _Worker:
+    """运行在分片进程中"""
+
+    def __init__(self, conn: Connection, name: str, modules: List[str], require_env: Any, setup: Optional[Setup]):
+        from creart import it
+
+        self.conn = conn
+        self.name = name
+        self.loop = it(asyncio.AbstractEventLoop)
+        self.writer = _Writer(conn, name, lambda: self.loop.call_soon_threadsafe(self.loop.stop))
+        self.saya = it(Saya)
+        assert self.saya.broadcast is not None, "sharding needs graia-broadcast"
+        self.broadcast: Broadcast = self.saya.broadcast
+        self.require_env = require_env
+        if setup is not None:
+            setup(self.saya)
+        with self.saya.module_context():
+            self.saya.require_many(modules, require_env)
+
+    def send(self, *message: Any) -> None:
+        self.writer.send(message)
+
+    def meta(self, module: str) -> Dict[str, Any]:
+        return dict(self.saya.channels[module].meta)
+
+    def handle(self, message: Tuple[Any, ...]) -> None:
+        kind = message[0]
+        if kind == "event":
+            self.broadcast.postEvent(message[1])
+        elif kind == "require":
+            self.require(message[1])
+        elif kind == "uninstall":
+            channel = self.saya.channels.get(message[1])
+            if channel is not None:
+                self.saya.uninstall_channel(channel)
+                self.send("uninstalled", message[1], listened_events(self.saya))
+        elif kind == "installed":
+            from graia.saya.event import SayaModuleInstalled
+
+            module, meta = message[1], message[2]
+            self.broadcast.postEvent(SayaModuleInstalled(module=module, channel=_stub_channel(module, meta)))
+        elif kind == "uninstalled":
+            from graia.saya.event import SayaModuleUninstalled
+
+            self.broadcast.postEvent(SayaModuleUninstalled(module=message[1]))
+        elif kind == "stop":
+            self.loop.stop()
+
+    def require(self, module: str) -> None:
+        before = set(self.saya.channels)
+        try:
+            with self.saya.module_context():
+                self.saya.require(module, self.require_env)
+        except Exception as e:
+            logger.exception(f"shard {self.name} failed to require {module}")
+            self.send("error", f"{module}: {type(e).__name__}: {e}")
+            return
+        events = listened_events(self.saya)
+        for installed in self.saya.channels.keys() - before:
+            self.send("installed", installed, self.meta(installed), events)
+
+    def read(self) -> None:
+        while True:
+            try:
+                message = self.conn.recv()
+            except (OSError, EOFError):
+                message = ("stop",)
+            self.loop.call_soon_threadsafe(self.handle, message)
+            if message[0] == "stop":
+                return
+
+    def run(self) -> None:
+        modules = [i for i in self.saya.channels if i != "__main__"]
+        self.send("ready", {module: self.meta(module) for module in modules}, listened_events(self.saya))
+        threading.Thread(target=self.read, name=f"saya-shard-{self.name}", daemon=True).start()
+        self.loop.run_forever()
+        self.writer.close(timeout=5)
+
+
+def _run_worker(conn: Connection, name: str, modules: List[str], require_env: Any, setup: Optional[Setup]) -> None:
+    try:
+        worker = _Worker(conn, name, modules, require_env, setup)
+    except Exception as e:
+        logger.exception(f"shard {name} failed to start")
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+        return
+    worker.run()
+
+
+class Shard:
+    """协调者中代表一个分片进程的对象"""
+
+    name: str
+    modules: List[str]
+    """分配给该分片的模块, 重启时会重新加载它们"""
+    installed: Dict[str, Dict[str, Any]]
+    """分片中已加载的模块及其元信息"""
+    events: Set[type]
+    """分片中的 Listener 监听的事件类型"""
+    event_paths: List[EventPath]
+    """分片报告的监听事件类型, 包括本进程尚未导入的"""
+    booted: bool
+    """分片是否曾成功完成启动; 启动即失败的分片不会被自动重启"""
+
+    process: Optional[multiprocessing.process.BaseProcess]
+    conn: Optional[Connection]
+    writer: Optional[_Writer]
+
+    def __init__(self, name: str, modules: Iterable[str]) -> None:
+        self.name = name
+        self.modules = list(modules)
+        self.installed = {}
+        self.events = set()
+        self.event_paths = []
+        self.booted = False
+        self.process = None
+        self.conn = None
+        self.writer = None
+        self._ready: Optional[asyncio.Event] = None
+
+    @property
+    def ready(self) -> asyncio.Event:
+        """分片完成启动, 启动失败或退出时被设置; 在首次使用时创建, 因此绑定到协调者运行的事件循环"""
+        if self._ready is None:
+            self._ready = asyncio.Event()
+        return self._ready
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def attach(self, conn: Connection) -> None:
+        self.detach()
+        self.conn = conn
+        self.writer = _Writer(conn, self.name)
+
+    def detach(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.conn = None
+        self.writer = None
+
+    def send(self, *message: Any) -> bool:
+        """把消息排入发送队列, 不等待写入管道; 分片未运行时返回 `False`
+
+        Raises:
+            Exception: 消息无法被 pickle
+        """
+        if self.writer is None:
+            return False
+        self.writer.send(message)
+        return True
+
+
+class ShardCoordinator:
+    """把模块分配到多个分片进程中运行, 每个分片拥有独立的 Saya 与 Broadcast.
+
+    协调者向本进程的 Broadcast 注册一个转发 Listener: 本进程中广播的事件会通过管道转发给
+    监听了该事件类型的分片(以 pickle 序列化, 无法序列化的事件会被跳过), 分片中 Listener 的执行结果不会返回.
+    分片中模块的加载与卸载会以 `SayaModuleInstalled` (其 `channel` 为只含元信息的占位 Channel)
+    与 `SayaModuleUninstalled` 广播到协调者与其他分片.
+
+    Examples:
+        ```python
+        >>> coordinator = ShardCoordinator(broadcast)
+        >>> coordinator.distribute(["modules.render", "modules.analysis", "modules.chat"], 2)
+        >>> await coordinator.start()
+        ```
+    """
+
+    broadcast: Broadcast
+    shards: Dict[str, Shard]
+    require_env: Any
+    setup: Optional[Setup]
+    auto_restart: bool
+    listener: Optional[Listener]
+    """向分片转发事件的 Listener"""
+
+    def __init__(
+        self,
+        broadcast: Broadcast,
+        require_env: Any = None,
+        setup: Optional[Setup] = None,
+        auto_restart: bool = True,
+    ) -> None:
+        self.broadcast = broadcast
+        self.shards = {}
+        self.require_env = require_env
+        self.setup = setup
+        self.auto_restart = auto_restart
+        self.listener = None
+        self._context = multiprocessing.get_context("spawn")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._local: "weakref.WeakSet[Dispatchable]" = weakref.WeakSet()
+        self._stopping: Set[str] = set()
+
+    def add_shard(self, name: str, modules: Iterable[str]) -> Shard:
+        if name in self.shards:
+            raise ValueError(f"shard {name} already exists")
+        shard = self.shards[name] = Shard(name, modules)
+        return shard
+
+    def distribute(self, modules: Iterable[str], count: int, prefix: str = "shard") -> List[Shard]:
+        """把模块轮流分配到 `count` 个新的分片中"""
+        shards = [self.add_shard(f"{prefix}-{i}", []) for i in range(len(self.shards), len(self.shards) + count)]
+        for index, module in enumerate(modules):
+            shards[index % count].modules.append(module)
+        return shards
+
+    def shard_of(self, module: str) -> Optional[Shard]:
+        for shard in self.shards.values():
+            if module in shard.installed or module in shard.modules:
+                return shard
+        return None
+
+    async def start(self) -> None:
+        """启动所有尚未运行的分片, 并等待它们完成模块加载"""
+        self._loop = asyncio.get_running_loop()
+        if self.listener is None:
+            self.listener = Listener(
+                callable=self._forward,
+                namespace=self.broadcast.getDefaultNamespace(),
+                listening_events=[],
+            )
+            self.broadcast.listeners.append(self.listener)
+        shards = [shard for shard in self.shards.values() if not shard.alive]
+        for shard in shards:
+            self._spawn(shard)
+        await asyncio.gather(*(shard.ready.wait() for shard in shards))
+
+    def _spawn(self, shard: Shard) -> None:
+        parent, child = self._context.Pipe()
+        shard.ready.clear()
+        shard.installed = {}
+        shard.events = set()
+        shard.event_paths = []
+        shard.attach(parent)
+        shard.process = self._context.Process(
+            target=_run_worker,
+            args=(child, shard.name, shard.modules, self.require_env, self.setup),
+            name=f"saya-shard-{shard.name}",
+            daemon=True,
+        )
+        shard.process.start()
+        child.close()
+        threading.Thread(target=self._read, args=(shard, parent), name=f"saya-shard-{shard.name}", daemon=True).start()
+        logger.info(f"shard {shard.name} started with modules: {shard.modules}")
+
+    def _read(self, shard: Shard, conn: Connection) -> None:
+        assert self._loop is not None
+        while True:
+            try:
+                message = conn.recv()
+            except (OSError, EOFError):
+                self._loop.call_soon_threadsafe(self._exited, shard, conn)
+                return
+            self._loop.call_soon_threadsafe(self._handle, shard, message)
+
+    def _handle(self, shard: Shard, message: Tuple[Any, ...]) -> None:
+        from graia.saya.event import SayaModuleInstalled, SayaModuleUninstalled
+
+        kind = message[0]
+        if kind == "ready":
+            shard.installed = message[1]
+            shard.booted = True
+            try:
+                self._update_events(shard, message[2])
+            finally:
+                shard.ready.set()
+            for module, meta in shard.installed.items():
+                self._propagate(shard, SayaModuleInstalled(module=module, channel=_stub_channel(module, meta)))
+        elif kind == "installed":
+            module, meta = message[1], message[2]
+            shard.installed[module] = meta
+            if module not in shard.modules:
+                shard.modules.append(module)
+            self._update_events(shard, message[3])
+            self._propagate(shard, SayaModuleInstalled(module=module, channel=_stub_channel(module, meta)))
+        elif kind == "uninstalled":
+            module = message[1]
+            shard.installed.pop(module, None)
+            if module in shard.modules:
+                shard.modules.remove(module)
+            self._update_events(shard, message[2])
+            self._propagate(shard, SayaModuleUninstalled(module=module))
+        elif kind == "error":
+            logger.error(f"shard {shard.name}: {message[1]}")
+            shard.ready.set()
+
+    def _exited(self, shard: Shard, conn: Connection) -> None:
+        from graia.saya.event import SayaModuleUninstalled
+
+        if shard.conn is not conn:  # 已被重启
+            return
+        shard.detach()
+        shard.ready.set()
+        if shard.name in self._stopping:
+            self._stopping.discard(shard.name)
+            return
+        logger.warning(f"shard {shard.name} exited unexpectedly")
+        for module in list(shard.installed):
+            self._propagate(shard, SayaModuleUninstalled(module=module))
+        if self.auto_restart and shard.booted:
+            self._spawn(shard)
+
+    def _update_events(self, shard: Shard, paths: List[EventPath]) -> None:
+        shard.event_paths = paths
+        # 本进程之后才导入的事件类型, 在任一分片下次报告时被补上
+        for target in self.shards.values():
+            target.events = {i for i in map(resolve_event_path, target.event_paths) if i is not None}
+        if self.listener is not None:
+            self.listener.listening_events[:] = list({i for s in self.shards.values() for i in s.events})
+            # listening_events 被原地修改, IndexedBroadcast 需要重新索引该监听器
+            if isinstance(self.broadcast, IndexedBroadcast):
+                self.broadcast.listener_index.refresh(self.listener)
+
+    def _propagate(self, origin: Shard, event: Dispatchable) -> None:
+        """把分片的生命周期事件广播到本进程(不再转发)与其他分片"""
+        from graia.saya.event import SayaModuleInstalled
+
+        for shard in self.shards.values():
+            if shard is origin:
+                continue
+            if isinstance(event, SayaModuleInstalled):
+                shard.send("installed", event.module, dict(event.channel.meta))
+            else:
+                shard.send("uninstalled", event.module)
+        self._local.add(event)
+        self.broadcast.postEvent(event)
+
+    async def _forward(self) -> None:
+        from graia.saya.event import SayaModuleInstalled
+
+        event: Dispatchable = self.broadcast.event_ctx.get()
+        if event in self._local:
+            return
+        # 本进程的 Channel 无法跨进程传递, 只转发其元信息
+        if isinstance(event, SayaModuleInstalled):
+            message: Tuple[Any, ...] = ("installed", event.module, dict(event.channel.meta))
+        else:
+            message = ("event", event)
+        for shard in self.shards.values():
+            if event.__class__ not in shard.events:
+                continue
+            try:
+                sent = shard.send(*message)
+            except Exception as e:  # 无法 pickle 的事件
+                logger.warning(f"cannot forward {event.__class__.__name__} to shard {shard.name}: {e!r}")
+                return
+            if not sent:
+                logger.warning(f"shard {shard.name} is not running, dropped {event.__class__.__name__}")
+
+    def require(self, module: str, shard: Optional[str] = None) -> Shard:
+        """在分片中加载模块; 未指定分片时选择模块最少的分片"""
+        if shard is not None:
+            target = self.shards[shard]
+        else:
+            target = min(self.shards.values(), key=lambda i: len(i.modules))
+        if module not in target.modules:
+            target.modules.append(module)
+        target.send("require", module)
+        return target
+
+    def uninstall(self, module: str) -> None:
+        shard = self.shard_of(module)
+        if shard is None:
+            raise KeyError(module)
+        shard.send("uninstall", module)
+
+    async def restart(self, name: str, timeout: float = 5.0) -> None:
+        """单独重启一个分片, 重新加载分配给它的模块"""
+        from graia.saya.event import SayaModuleUninstalled
+
+        shard = self.shards[name]
+        await self._stop_shard(shard, timeout)
+        for module in list(shard.installed):
+            self._propagate(shard, SayaModuleUninstalled(module=module))
+        self._spawn(shard)
+        await shard.ready.wait()
+
+    async def _stop_shard(self, shard: Shard, timeout: float) -> None:
+        process = shard.process
+        if process is None:
+            return
+        self._stopping.add(shard.name)
+        shard.send("stop")
+        await asyncio.get_running_loop().run_in_executor(None, process.join, timeout)
+        if process.is_alive():
+            process.terminate()
+            await asyncio.get_running_loop().run_in_executor(None, process.join, timeout)
+        conn = shard.conn
+        shard.detach()
+        if conn is not None:
+            conn.close()
+        self._stopping.discard(shard.name)
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """停止所有分片, 并移除转发 Listener"""
+        await asyncio.gather(*(self._stop_shard(shard, timeout) for shard in self.shards.values()))
+        if self.listener is not None and self.listener in self.broadcast.listeners:
+            self.broadcast.removeListener(self.listener)
+        self.listener = None
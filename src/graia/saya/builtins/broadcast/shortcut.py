@@ -1,4 +1,5 @@
 """Saya 相关的工具"""
+
 from __future__ import annotations
 
 import inspect
@@ -19,6 +20,7 @@ from graia.broadcast.entities.event import Dispatchable
 from graia.broadcast.typing import T_Dispatcher
 from graia.saya.factory import BufferModifier, SchemaWrapper, buffer_modifier, factory
 
+from .registry import event_registry
 from .schema import ListenerSchema
 
 T_Callable = TypeVar("T_Callable", bound=Callable)
@@ -138,6 +140,30 @@ def priority(level: int, *events: Type[Dispatchable]) -> BufferModifier:
     return wrapper
 
 
+def bind_decorators(func: Callable, decorator_map: Dict[str, Decorator]) -> inspect.Signature:
+    """生成将装饰器作为对应参数默认值的签名, 只在注册时计算一次.
+
+    结果会被设为函数的 `__signature__`, Broadcast 解析参数时直接使用它, 不再重新分析函数.
+
+    Args:
+        func (Callable): 监听器函数
+        decorator_map (Dict[str, Decorator]): 参数名称与装饰器的映射, 不存在的参数名称会被忽略
+
+    Returns:
+        inspect.Signature: 新的签名
+    """
+    sig = inspect.signature(func)
+    # 只为部分参数设置默认值时, 之后的参数可能没有默认值; 不校验参数顺序, 否则会被拒绝
+    return inspect.Signature(
+        [
+            param.replace(default=decorator_map[param.name]) if param.name in decorator_map else param
+            for param in sig.parameters.values()
+        ],
+        return_annotation=sig.return_annotation,
+        __validate_parameters__=False,
+    )
+
+
 @factory
 def listen(*event: Union[Type[Dispatchable], str]) -> SchemaWrapper:
     """在当前 Saya Channel 中监听指定事件
@@ -148,18 +174,13 @@ def listen(*event: Union[Type[Dispatchable], str]) -> SchemaWrapper:
     Returns:
         Callable[[T_Callable], T_Callable]: 装饰器
     """
-    EVENTS: Dict[str, Type[Dispatchable]] = {e.__name__: e for e in gen_subclass(Dispatchable)}
-    events: List[Type[Dispatchable]] = [e if isinstance(e, type) else EVENTS[e] for e in event]
+    events: List[Type[Dispatchable]] = [e if isinstance(e, type) else event_registry.resolve(e) for e in event]
 
     def wrapper(func: Callable, buffer: Dict[str, Any]) -> ListenerSchema:
         decorator_map: Dict[str, Decorator] = buffer.pop("decorator_map", {})
         buffer["inline_dispatchers"] = buffer.pop("dispatchers", [])
         if decorator_map:
-            sig = inspect.signature(func)
-            for param in sig.parameters.values():
-                if decorator := decorator_map.get(param.name):
-                    setattr(param, "_default", decorator)
-            func.__signature__ = sig
+            func.__signature__ = bind_decorators(func, decorator_map)
         return ListenerSchema(listening_events=events, **buffer)
 
     return wrapper
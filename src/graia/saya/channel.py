@@ -5,22 +5,26 @@ import inspect
 from types import ModuleType
 from typing import (
     Any,
+    Awaitable,
     Callable,
     Dict,
     Generic,
+    Iterable,
     List,
     Optional,
+    Tuple,
     Type,
     TypedDict,
     TypeVar,
     Union,
     cast,
 )
+from weakref import WeakKeyDictionary
 
-from importlib_metadata import distribution
+from importlib_metadata import Distribution
 from typing_extensions import NotRequired
 
-from .cube import Cube
+from .cube import Cube, CubeList
 from .context import channel_instance
 from .schema import BaseSchema
 
@@ -55,7 +59,19 @@ def _default_channel_meta() -> ChannelMeta:
 
 
 def get_channel_meta(module: str) -> ChannelMeta:
-    dist = distribution(module)
+    """获取模块所属发行包的元信息.
+
+    结果来自进程级的 `graia.saya.metadata.metadata_index`, 不会在每次调用时重新扫描 `sys.path`.
+
+    Raises:
+        PackageNotFoundError: 找不到名为 `module` 的发行包
+    """
+    from .metadata import metadata_index
+
+    return metadata_index.get(module)
+
+
+def channel_meta_from_distribution(dist: Distribution) -> ChannelMeta:
     meta = cast(Dict[str, Any], _default_channel_meta())
     meta |= dist.metadata.json
     if meta["author"]:  # "author" in dist.metadata.json and dist.metadata.json["author"]
@@ -89,6 +105,70 @@ class ScopedContext:
         return self.content[__name]
 
 
+class SlottedScopedContext:
+    """由 `Channel.scoped_context(slotted=True)` 生成的上下文类型的基类.
+
+    属性由隔离类的类型注解声明并保存在 `__slots__` 中, 访问不经过 `__getattr__`;
+    因此不能设置未声明的属性.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **kwargs) -> None:
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+
+    @property
+    def content(self) -> Dict[str, Any]:
+        """已设置的属性, 仅用于兼容 `ScopedContext.content`, 修改返回的字典不会影响上下文"""
+        return {
+            name: getattr(self, name)
+            for cls in type(self).__mro__
+            for name in getattr(cls, "__slots__", ())
+            if hasattr(self, name)
+        }
+
+
+_isolate_members: "WeakKeyDictionary[type, Tuple[Callable, ...]]" = WeakKeyDictionary()
+_slotted_contexts: "WeakKeyDictionary[type, Type[SlottedScopedContext]]" = WeakKeyDictionary()
+
+
+def isolate_members(isolate_class: type) -> Tuple[Callable, ...]:
+    """隔离类(及其基类)中定义的可调用成员, 按类缓存"""
+    members = _isolate_members.get(isolate_class)
+    if members is None:
+        names = dict.fromkeys(name for cls in isolate_class.__mro__[:-1] for name in cls.__dict__)
+        members = tuple(i for i in (getattr(isolate_class, name, None) for name in names) if callable(i))
+        _isolate_members[isolate_class] = members
+    return members
+
+
+def _own_annotations(cls: type) -> Dict[str, Any]:
+    # 不对注解求值, 以免前向引用出错; Python 3.14 起注解是惰性的, 不一定出现在 `cls.__dict__` 中
+    get_annotations = getattr(inspect, "get_annotations", None)
+    if get_annotations is not None:
+        return get_annotations(cls)
+    return cls.__dict__.get("__annotations__", {})
+
+
+def slotted_context(isolate_class: type) -> Type[SlottedScopedContext]:
+    """根据隔离类及其所有基类的类型注解生成带 `__slots__` 的上下文类型, 按类缓存"""
+    context_type = _slotted_contexts.get(isolate_class)
+    if context_type is None:
+        names = dict.fromkeys(name for cls in reversed(isolate_class.__mro__[:-1]) for name in _own_annotations(cls))
+        names.pop("channel", None)
+        if "content" in names:
+            raise ValueError("'content' cannot be declared in a slotted scoped context")
+        context_type = type(
+            f"{isolate_class.__name__}Context",
+            (SlottedScopedContext,),
+            {"__slots__": ("channel", *names), "__module__": isolate_class.__module__},
+        )
+        context_type.__qualname__ = f"{isolate_class.__qualname__}Context"
+        _slotted_contexts[isolate_class] = context_type
+    return context_type
+
+
 class Channel(Generic[M]):
     module: str
 
@@ -97,17 +177,29 @@ class Channel(Generic[M]):
     _export: Any = None
     _py_module: Optional[ModuleType] = None
 
-    content: List[Cube]
+    _content: CubeList
+
+    scopes: Dict[Type, Union[ScopedContext, SlottedScopedContext]]
 
-    scopes: Dict[Type, ScopedContext]
+    _setup_hooks: List[Callable[[], Union[Awaitable[Any], Any]]]
 
     # TODO: _export reload for other modules
 
     def __init__(self, module: str) -> None:
         self.module = module
         self.meta = cast(M, _default_channel_meta())
-        self.content = []
+        self._content = CubeList()
         self.scopes = {}
+        self._setup_hooks = []
+
+    @property
+    def content(self) -> CubeList:
+        """模块提供的内容, 保持注册顺序, 并可按内容或 Schema 类型查找"""
+        return self._content
+
+    @content.setter
+    def content(self, value: Iterable[Cube]) -> None:
+        self._content = value if isinstance(value, CubeList) else CubeList(value)
 
     @staticmethod
     def current() -> "Channel":
@@ -122,6 +214,22 @@ class Channel(Generic[M]):
         self._export = target
         return target
 
+    def setup(self, func: Callable[[], Union[Awaitable[Any], Any]]):
+        """注册模块的初始化钩子, 可以是异步函数, 用于建立连接, 预热缓存等不宜在导入时完成的工作.
+
+        `Saya.require_async` 会在分配 Cube 前并发地等待本批模块的所有钩子;
+        通过 `Saya.require` 引入的模块, 其钩子由 `Saya.run_setup_hooks` 执行.
+
+        Examples:
+            ```python
+            >>> @channel.setup
+            >>> async def connect():
+            >>>     ...
+            ```
+        """
+        self._setup_hooks.append(func)
+        return func
+
     def use(self, schema: BaseSchema):
         def use_wrapper(target: Union[Type, Callable, Any]):
             self.content.append(Cube(target, schema))
@@ -130,16 +238,33 @@ class Channel(Generic[M]):
         return use_wrapper
 
     def cancel(self, target: Union[Type, Callable, Any]):
-        self.content = [i for i in self.content if i.content is not target]
-
-    def scoped_context(self, isolate_class: Type[Any]):
-        context = self.scopes.setdefault(
-            isolate_class,
-            ScopedContext(channel=self),
-        )
-        contents = {id(i.content): i for i in self.content}
-        members = inspect.getmembers(isolate_class, lambda obj: callable(obj) and id(obj) in contents)
-        # 用 id 的原因: 防止一些 unhashable 的对象给我塞进来.
-        for _, obj in members:
-            contents[id(obj)].content = functools.partial(obj, context)
+        self.content.discard_content(target)
+
+    def scoped_context(self, isolate_class: Optional[Type[Any]] = None, *, slotted: bool = False):
+        """将隔离类中注册为 Cube 的方法绑定到本 Channel 的一个共享上下文上, 作为它们的 `self`.
+
+        Args:
+            isolate_class (Type[Any]): 隔离类
+            slotted (bool, optional): 根据隔离类的类型注解生成带 `__slots__` 的上下文类型,
+                属性访问更快, 但只能设置已注解的属性. 默认为 False.
+
+        Examples:
+            ```python
+            >>> @channel.scoped_context(slotted=True)
+            >>> class context:
+            >>>     a: str
+            ```
+        """
+        if isolate_class is None:
+            return functools.partial(self.scoped_context, slotted=slotted)
+
+        context = self.scopes.get(isolate_class)
+        if context is None:
+            context = slotted_context(isolate_class)(channel=self) if slotted else ScopedContext(channel=self)
+            self.scopes[isolate_class] = context
+        for obj in isolate_members(isolate_class):
+            # 按 id 索引的原因: 防止一些 unhashable 的对象给我塞进来.
+            for cube in self.content.by_content(obj):
+                cube.content = functools.partial(obj, context)
+                self.content.reindex(cube)
         return isolate_class
@@ -4,3 +4,8 @@ saya_instance = ContextVar("saya_instance")
 channel_instance = ContextVar("channel")
 
 environment_metadata = ContextVar("environment_metadata")
+
+bulk_loader = ContextVar("bulk_loader")
+
+lifecycle_batches = ContextVar("lifecycle_batches", default={})
+"""Saya 实例 -> 当前上下文中的生命周期批次; 值不可修改, 开启批次时替换为新的字典"""
@@ -1,12 +1,197 @@
+import operator
 from dataclasses import dataclass
-from typing import Any, Generic, Optional, TypeVar
+from typing import Any, Dict, Generic, Iterable, List, Optional, SupportsIndex, TypeVar
 
 from .schema import BaseSchema
+from .utils import slotted
 
 T = TypeVar("T", bound=Optional[BaseSchema])
 
 
+@slotted("__weakref__")
 @dataclass(init=True)
 class Cube(Generic[T]):
     content: Any
     metaclass: T
+
+
+class CubeList(List[Cube]):
+    """用作 `Channel.content` 的 Cube 列表, 另按内容的 id 与 Schema 类型建立索引.
+
+    是 `list` 的子类, 下标访问与追加同 list 为 O(1), 按内容或 Schema 类型查找不需要遍历列表.
+    与 list 不同, 同一个 Cube 对象不能出现两次, 重复加入时抛出 `ValueError`, 列表保持不变.
+    直接修改了某个 Cube 的 `content` 后, 需调用 `reindex` 更新索引.
+    """
+
+    _content_ids: Dict[int, int]
+    """id(cube) -> id(cube.content), 也用于判断 Cube 是否在列表中"""
+    _by_content: Dict[int, Dict[int, Cube]]
+    _by_schema: Dict[type, Dict[int, Cube]]
+
+    def __init__(self, cubes: Iterable[Cube] = ()) -> None:
+        super().__init__()
+        self._content_ids = {}
+        self._by_content = {}
+        self._by_schema = {}
+        self.extend(cubes)
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+    def _check(self, cubes: List[Cube], replacing: Iterable[Cube] = ()) -> None:
+        replaced = {id(cube) for cube in replacing}
+        keys = set()
+        for cube in cubes:
+            key = id(cube)
+            if key in keys or (key in self._content_ids and key not in replaced):
+                raise ValueError(f"{cube!r} is already in the CubeList")
+            keys.add(key)
+
+    def _index(self, cube: Cube) -> None:
+        key = id(cube)
+        self._content_ids[key] = id(cube.content)
+        self._by_content.setdefault(id(cube.content), {})[key] = cube
+        self._by_schema.setdefault(type(cube.metaclass), {})[key] = cube
+
+    def _unindex(self, cube: Cube) -> None:
+        key = id(cube)
+        content_id = self._content_ids.pop(key)
+        bucket = self._by_content[content_id]
+        del bucket[key]
+        if not bucket:
+            del self._by_content[content_id]
+        bucket = self._by_schema[type(cube.metaclass)]
+        del bucket[key]
+        if not bucket:
+            del self._by_schema[type(cube.metaclass)]
+
+    def _rebuild(self) -> None:
+        """Cube 的位置改变后按列表顺序重建索引, 使 `by_content` 与 `by_schema` 的结果保持列表顺序"""
+        self._content_ids = {}
+        self._by_content = {}
+        self._by_schema = {}
+        for cube in self:
+            self._index(cube)
+
+    def append(self, value: Cube) -> None:
+        self._check([value])
+        super().append(value)
+        self._index(value)
+
+    def extend(self, values: Iterable[Cube]) -> None:
+        values = list(values)
+        self._check(values)
+        super().extend(values)
+        for cube in values:
+            self._index(cube)
+
+    def __iadd__(self, values: Iterable[Cube]):  # type: ignore
+        self.extend(values)
+        return self
+
+    def __imul__(self, n: int):  # type: ignore
+        if n <= 0:
+            self.clear()
+        elif n > 1 and self:
+            raise ValueError("a Cube cannot appear more than once in a CubeList")
+        return self
+
+    def insert(self, index: SupportsIndex, value: Cube) -> None:
+        self._check([value])
+        at_end = operator.index(index) >= len(self)
+        super().insert(index, value)
+        if at_end:
+            self._index(value)
+        else:
+            self._rebuild()
+
+    def _position(self, value: Cube) -> int:
+        if id(value) in self._content_ids:
+            for i, cube in enumerate(self):
+                if cube is value:
+                    return i
+        try:
+            return self.index(value)
+        except ValueError:
+            raise ValueError(f"{value!r} is not in CubeList") from None
+
+    def remove(self, value: Cube) -> None:
+        """移除 Cube; 列表中没有该对象时, 移除第一个与之相等的 Cube"""
+        self.pop(self._position(value))
+
+    def pop(self, index: SupportsIndex = -1) -> Cube:
+        cube = super().pop(index)
+        self._unindex(cube)
+        return cube
+
+    def clear(self) -> None:
+        super().clear()
+        self._content_ids = {}
+        self._by_content = {}
+        self._by_schema = {}
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._rebuild()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._rebuild()
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            values = list(value)
+            self._check(values, replacing=self[index])
+            super().__setitem__(index, values)
+        else:
+            self._check([value], replacing=[self[index]])
+            super().__setitem__(index, value)
+        self._rebuild()
+
+    def __delitem__(self, index) -> None:
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        for cube in removed:
+            self._unindex(cube)
+
+    def reindex(self, cube: Cube) -> None:
+        """在 `cube.content` 被替换后更新内容索引"""
+        key = id(cube)
+        if key not in self._content_ids:
+            return
+        old_id = self._content_ids[key]
+        bucket = self._by_content[old_id]
+        del bucket[key]
+        if not bucket:
+            del self._by_content[old_id]
+        self._content_ids[key] = id(cube.content)
+        self._by_content.setdefault(id(cube.content), {})[key] = cube
+
+    def by_content(self, content: Any) -> List[Cube]:
+        """返回内容为 `content` (按 id 比较) 的所有 Cube"""
+        bucket = self._by_content.get(id(content))
+        return list(bucket.values()) if bucket else []
+
+    def by_schema(self, schema_type: type) -> List[Cube]:
+        """返回 Schema 为 `schema_type` 或其子类实例的所有 Cube, 保持列表顺序"""
+        buckets = [bucket for t, bucket in self._by_schema.items() if issubclass(t, schema_type)]
+        if len(buckets) == 1:
+            return list(buckets[0].values())
+        keys = {key for bucket in buckets for key in bucket}
+        return [cube for cube in self if id(cube) in keys]
+
+    def discard_content(self, content: Any) -> None:
+        """移除内容为 `content` (按 id 比较) 的所有 Cube, 只遍历列表一次"""
+        cubes = self.by_content(content)
+        if not cubes:
+            return
+        keys = {id(cube) for cube in cubes}
+        super().__setitem__(slice(None), [cube for cube in self if id(cube) not in keys])
+        for cube in cubes:
+            self._unindex(cube)
+
+    def __contains__(self, value: object) -> bool:
+        return id(value) in self._content_ids or super().__contains__(value)
+
+    def __repr__(self) -> str:
+        return f"CubeList({super().__repr__()})"
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+import pkgutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TypedDict, Union
+
+from loguru import logger
+
+MANIFEST_VERSION = 2
+
+
+class ModuleRecord(TypedDict):
+    name: str
+    path: Optional[str]
+
+
+class PackageManifest(TypedDict):
+    version: int
+    package: str
+    locations: Dict[str, int]
+    modules: List[ModuleRecord]
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """计算文件内容的 sha256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _mtime_ns(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def package_locations(package: str) -> List[str]:
+    spec = importlib.util.find_spec(package)
+    if spec is None or spec.submodule_search_locations is None:
+        raise ValueError(f"{package} is not a package")
+    return [os.path.abspath(i) for i in spec.submodule_search_locations]
+
+
+def load_manifest(path: Union[str, Path]) -> Optional[PackageManifest]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest: Dict[str, Any] = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest  # type: ignore
+
+
+def write_json(path: Union[str, Path], data: Any) -> bool:
+    """先写入临时文件再替换, 避免并发读取到写了一半的文件. 写入失败时只记录警告."""
+    path = Path(path)
+    temp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(temp, path)
+    except OSError as e:
+        logger.warning(f"failed to write {path}: {e}")
+        try:
+            temp.unlink()
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def save_manifest(path: Union[str, Path], manifest: PackageManifest) -> None:
+    write_json(path, manifest)
+
+
+def scan_package(package: str) -> PackageManifest:
+    """扫描包下的所有直接子模块(文件与包), 以 `_` 开头的模块会被忽略.
+
+    Args:
+        package (str): 包的引入路径
+
+    Returns:
+        PackageManifest: 新的清单
+    """
+    locations = package_locations(package)
+    modules: List[ModuleRecord] = []
+    for info in pkgutil.iter_modules(locations, f"{package}."):
+        if info.name.rpartition(".")[2].startswith("_"):
+            continue
+        spec = info.module_finder.find_spec(info.name.rpartition(".")[2])  # type: ignore
+        origin = spec.origin if spec is not None and spec.has_location else None
+        modules.append(ModuleRecord(name=info.name, path=origin))
+
+    return PackageManifest(
+        version=MANIFEST_VERSION,
+        package=package,
+        locations={i: _mtime_ns(i) for i in locations},
+        modules=modules,
+    )
+
+
+def discover_modules(package: str, manifest_path: Optional[Union[str, Path]] = None) -> List[str]:
+    """找出包下的所有直接子模块.
+
+    提供 `manifest_path` 时, 若包目录的修改时间与清单一致, 直接使用清单中的结果而不遍历目录;
+    否则重新扫描并写回清单. 增删子模块会改变所在目录的修改时间, 从而使清单失效;
+    修改已有文件的内容不影响发现结果, 因此清单不记录各文件的修改时间与哈希(源文件的校验见 `Saya.require_plan`).
+
+    Args:
+        package (str): 包的引入路径
+        manifest_path (Optional[Union[str, Path]], optional): 清单文件的路径
+
+    Returns:
+        List[str]: 子模块的引入路径
+    """
+    previous = load_manifest(manifest_path) if manifest_path is not None else None
+
+    if previous is not None and previous["package"] == package:
+        locations = package_locations(package)
+        if set(locations) == previous["locations"].keys() and all(
+            _mtime_ns(i) == previous["locations"][i] for i in locations
+        ):
+            return [i["name"] for i in previous["modules"]]
+
+    manifest = scan_package(package)
+    if manifest_path is not None:
+        save_manifest(manifest_path, manifest)
+    return [i["name"] for i in manifest["modules"]]
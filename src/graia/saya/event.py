@@ -1,9 +1,12 @@
+from typing import List, Optional
+
 from graia.broadcast.entities.dispatcher import BaseDispatcher
 from graia.broadcast.entities.event import Dispatchable
 from graia.broadcast.interfaces.dispatcher import DispatcherInterface
 
 from graia.saya.channel import Channel
 from graia.saya.context import saya_instance
+from graia.saya.profiling import ModuleLoadReport
 
 
 class SayaModuleInstalled(Dispatchable):
@@ -11,10 +14,13 @@ class SayaModuleInstalled(Dispatchable):
 
     module: str
     channel: Channel
+    report: Optional[ModuleLoadReport]
+    """`Saya.profiling` 开启时, 为该模块加载各阶段的耗时"""
 
-    def __init__(self, module: str, channel: Channel) -> None:
+    def __init__(self, module: str, channel: Channel, report: Optional[ModuleLoadReport] = None) -> None:
         self.module = module
         self.channel = channel
+        self.report = report
 
     class Dispatcher(BaseDispatcher):
         @staticmethod
@@ -63,3 +69,41 @@ class SayaModuleUninstalled(Dispatchable):
 
             if interface.annotation is Saya:
                 return saya_instance.get()
+
+
+class SayaModulesInstalled(Dispatchable):
+    """一批模块加载完成, 由 `Saya.batch` 在批次结束时广播一次, `Saya.require_many` 等批量操作会自动开启批次."""
+
+    channels: List[Channel]
+
+    def __init__(self, channels: List[Channel]) -> None:
+        self.channels = channels
+
+    @property
+    def modules(self) -> List[str]:
+        return [channel.module for channel in self.channels]
+
+    class Dispatcher(BaseDispatcher):
+        @staticmethod
+        async def catch(interface: "DispatcherInterface[SayaModulesInstalled]"):
+            from graia.saya import Saya
+
+            if interface.annotation is Saya:
+                return saya_instance.get()
+
+
+class SayaModulesUninstalled(Dispatchable):
+    """一批模块卸载完成, 由 `Saya.batch` 在批次结束时广播一次."""
+
+    modules: List[str]
+
+    def __init__(self, modules: List[str]) -> None:
+        self.modules = modules
+
+    class Dispatcher(BaseDispatcher):
+        @staticmethod
+        async def catch(interface: "DispatcherInterface[SayaModulesUninstalled]"):
+            from graia.saya import Saya
+
+            if interface.annotation is Saya:
+                return saya_instance.get()
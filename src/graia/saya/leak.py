@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import gc
+import reprlib
+import weakref
+from dataclasses import dataclass, field
+from types import FrameType, FunctionType, ModuleType
+from typing import TYPE_CHECKING, Any, Iterable, List, Tuple
+
+if TYPE_CHECKING:
+    from . import Saya
+    from .channel import Channel
+
+
+@dataclass
+class LeakRecord:
+    module: str
+    """被卸载的模块"""
+    kind: str
+    """`channel`, `module` 或 `cube`"""
+    description: str
+    referrers: List[str] = field(default_factory=list)
+    """仍然引用该对象的对象的简述"""
+
+
+def describe_referrer(referrer: Any) -> str:
+    if isinstance(referrer, dict):
+        for owner in gc.get_referrers(referrer):
+            if isinstance(owner, ModuleType) and owner.__dict__ is referrer:
+                return f"globals of module {owner.__name__}"
+            if isinstance(owner, FunctionType) and owner.__globals__ is referrer:
+                return f"globals of module {owner.__module__}, kept alive by function {owner.__qualname__}"
+            if getattr(owner, "__dict__", None) is referrer:
+                return f"attributes of {type(owner).__qualname__} {reprlib.repr(owner)}"
+    return f"{type(referrer).__qualname__} {reprlib.repr(referrer)}"
+
+
+def clear_signature_cache() -> None:
+    try:
+        from graia.broadcast.utilles import argument_signature
+    except ImportError:
+        return
+    cache_clear = getattr(argument_signature, "cache_clear", None)
+    if cache_clear is not None:
+        cache_clear()
+
+
+class LeakTracker:
+    """记录被卸载的 Channel, 模块与 Cube 的弱引用, 在之后检查它们是否仍然存活.
+
+    Examples:
+        ```python
+        >>> saya.leak_tracker = LeakTracker(saya)
+        >>> saya.uninstall_channel(channel)
+        >>> del channel
+        >>> for record in saya.leak_tracker.report():
+        >>>     print(record)
+        ```
+    """
+
+    saya: "Saya"
+
+    def __init__(self, saya: "Saya") -> None:
+        self.saya = saya
+        self._refs: List[Tuple[str, str, str, weakref.ref]] = []
+
+    def _track(self, module: str, kind: str, obj: Any, description: str) -> None:
+        try:
+            self._refs.append((module, kind, description, weakref.ref(obj)))
+        except TypeError:  # 不支持弱引用的对象
+            pass
+
+    def track(self, channel: "Channel", modules: Iterable[ModuleType] = ()) -> None:
+        """记录即将被卸载的 Channel, 其 Python 模块(含子模块)以及 Cube"""
+        self._track(channel.module, "channel", channel, f"Channel({channel.module!r})")
+        for py_module in modules:
+            self._track(channel.module, "module", py_module, f"module {py_module.__name__}")
+        for cube in channel.content:
+            self._track(channel.module, "cube", cube, f"Cube({reprlib.repr(cube.content)})")
+
+    def report(self) -> List[LeakRecord]:
+        """回收垃圾后, 返回仍然存活的对象及其引用者.
+
+        重载后仍在使用中的 Channel 不会被视为泄漏. 检查前会清空 graia-broadcast 的参数签名缓存,
+        它会在被逐出前一直引用已释放的监听器.
+        """
+        clear_signature_cache()
+        gc.collect()
+        records: List[LeakRecord] = []
+        alive = []
+        for module, kind, description, ref in self._refs:
+            obj = ref()
+            if obj is None:
+                continue
+            alive.append((module, kind, description, ref))
+            if kind == "channel" and self.saya.channels.get(module) is obj:
+                continue
+            referrers = [describe_referrer(i) for i in gc.get_referrers(obj) if not isinstance(i, FrameType)]
+            records.append(LeakRecord(module, kind, description, referrers))
+            del obj
+        self._refs = alive
+        return records
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import contextvars
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set
+
+from loguru import logger
+
+from .context import bulk_loader, channel_instance, environment_metadata
+
+if TYPE_CHECKING:
+    from . import Saya
+    from .channel import Channel
+
+
+class BulkLoader:
+    """批量导入模块: 导入阶段在线程池中并行执行, 分配阶段在调用线程中按依赖顺序执行.
+
+    依赖关系来自两处: 模块导入时嵌套调用的 `Saya.require`, 以及 `ChannelMeta.dependencies` 中属于本批次的模块.
+    """
+
+    saya: "Saya"
+    modules: List[str]
+    require_env: Any
+    max_workers: Optional[int]
+
+    futures: Dict[str, "Future[Channel]"]
+    edges: Dict[str, Set[str]]
+
+    def __init__(
+        self,
+        saya: "Saya",
+        modules: Iterable[str],
+        require_env: Any = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.saya = saya
+        self.modules = list(dict.fromkeys(modules))
+        self.require_env = require_env
+        self.max_workers = max_workers
+
+        self.futures = {}
+        self.edges = {}
+        self._order: List[str] = []
+        self._lock = threading.Lock()
+
+    def ensure(self, module: str, require_env: Any = None) -> "Channel":
+        """导入模块(若尚未导入)并返回其 Channel, 此时 Channel 中的 Cube 尚未被分配.
+
+        若模块已由其他线程导入中, 则等待其完成.
+
+        Args:
+            module (str): 模块的引入路径
+            require_env (Any, optional): 传给该模块的 `require_env`
+
+        Raises:
+            ImportError: 模块之间存在循环 require
+        """
+        requester: Optional[Channel] = channel_instance.get(None)
+
+        with self._lock:
+            if requester is not None and requester.module in self.futures:
+                self.edges.setdefault(requester.module, set()).add(module)
+                if self._reachable(module, requester.module):
+                    raise ImportError(f"circular require detected: {requester.module} -> {module}")
+            future = self.futures.get(module)
+            owner = future is None
+            if owner:
+                future = self.futures[module] = Future()
+
+        if not owner:
+            return future.result()
+
+        env_token = environment_metadata.set(require_env)
+        try:
+            channel = self.saya._import_channel(module)
+        except BaseException as e:
+            future.set_exception(e)
+            with self._lock:
+                # 已在等待的线程仍会得到该异常, 之后的调用则重新导入
+                del self.futures[module]
+            raise
+        finally:
+            environment_metadata.reset(env_token)
+
+        with self._lock:
+            self._order.append(module)
+        future.set_result(channel)
+        return channel
+
+    def _reachable(self, start: str, target: str) -> bool:
+        stack = [start]
+        seen: Set[str] = set()
+        while stack:
+            current = stack.pop()
+            if current == target:
+                return True
+            if current in seen:
+                continue
+            seen.add(current)
+            future = self.futures.get(current)
+            if future is not None and future.done():
+                continue
+            stack.extend(self.edges.get(current, ()))
+        return False
+
+    def _submit(self, executor: ThreadPoolExecutor, module: str) -> "Future[Channel]":
+        context = contextvars.copy_context()
+        return executor.submit(context.run, self.ensure, module, self.require_env)
+
+    def import_all(self) -> None:
+        """在线程池中并行导入所有模块, 任一模块导入失败时抛出按传入顺序的第一个异常."""
+        pending = [module for module in self.modules if module not in self.saya.channels]
+        token = bulk_loader.set(self)
+        try:
+            with ThreadPoolExecutor(self.max_workers, thread_name_prefix="saya-require") as executor:
+                submitted = [self._submit(executor, module) for module in pending]
+        finally:
+            bulk_loader.reset(token)
+
+        for future in submitted:
+            exc = future.exception()
+            if exc is not None:
+                self.discard()
+                raise exc
+
+    def import_module(self, module: str, require_env: Any = None) -> "Channel":
+        """导入单个模块及其嵌套 require 的模块; 可以在多个线程中对同一个 BulkLoader 调用,
+        同一模块只会被导入一次, 跨调用的循环 require 同样会被检测到.
+
+        Raises:
+            ImportError: 模块之间存在循环 require
+        """
+        token = bulk_loader.set(self)
+        try:
+            return self.ensure(module, require_env)
+        finally:
+            bulk_loader.reset(token)
+
+    def subtree(self, module: str) -> Set[str]:
+        """已导入的 `module` 及其直接或间接嵌套 require 的模块"""
+        with self._lock:
+            result: Set[str] = set()
+            stack = [module]
+            while stack:
+                current = stack.pop()
+                if current in result or current not in self._order:
+                    continue
+                result.add(current)
+                stack.extend(self.edges.get(current, ()))
+            return result
+
+    def imported(self) -> Dict[str, "Channel"]:
+        """本次导入的 Channel, 按导入完成的顺序排列"""
+        return {module: self.futures[module].result() for module in self._order}
+
+    def sorted_channels(self, modules: Optional[Iterable[str]] = None) -> List["Channel"]:
+        """按依赖关系对已导入的 Channel (或其中的 `modules`) 进行拓扑排序, 同层之间保持导入完成的顺序."""
+        channels = self.imported()
+        if modules is not None:
+            wanted = set(modules)
+            channels = {module: channel for module, channel in channels.items() if module in wanted}
+        deps: Dict[str, Set[str]] = {}
+        for module, channel in channels.items():
+            meta_deps = {i for i in channel.meta.get("dependencies", ()) if i in channels and i != module}
+            deps[module] = (self.edges.get(module, set()) & channels.keys()) | meta_deps
+
+        result: List[Channel] = []
+        done: Set[str] = set()
+        remaining = list(channels)
+        while remaining:
+            ready = [module for module in remaining if deps[module] <= done]
+            if not ready:
+                logger.warning(f"dependency cycle detected among modules: {remaining}, loading in import order")
+                ready = remaining
+            for module in ready:
+                result.append(channels[module])
+                done.add(module)
+            remaining = [module for module in remaining if module not in done]
+        return result
+
+    def discard(self, modules: Optional[Iterable[str]] = None) -> None:
+        """丢弃已导入但未分配的模块(默认为所有导入的模块), 以便之后能重新导入."""
+        with self._lock:
+            for module in list(self._order if modules is None else modules):
+                if module not in self.saya.channels:
+                    sys.modules.pop(module, None)
+                    self.futures.pop(module, None)
+                    if module in self._order:
+                        self._order.remove(module)
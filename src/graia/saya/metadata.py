@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import importlib_metadata
+from importlib_metadata import Distribution, PackageNotFoundError
+
+try:
+    from packaging.utils import canonicalize_name
+except ImportError:  # packaging 不是必需的依赖
+
+    def canonicalize_name(name: str) -> str:
+        return re.sub(r"[-_.]+", "-", name).lower()
+
+
+from .channel import ChannelMeta, channel_meta_from_distribution
+from .discovery import _mtime_ns, write_json
+
+INDEX_VERSION = 2
+PLUGIN_ENTRY_POINT_GROUP = "graia.saya.plugins"
+
+PathKey = Tuple[Tuple[str, int], ...]
+
+
+def normalize_name(name: str) -> str:
+    """发行包名称规范化(PEP 503 的 `canonicalize_name`, 并以下划线代替连字符)"""
+    return canonicalize_name(name).replace("-", "_")
+
+
+def path_key() -> PathKey:
+    """`sys.path` 及其中各目录的修改时间; 安装或卸载发行包会改变所在目录的修改时间"""
+    return tuple((entry, _mtime_ns(entry or ".")) for entry in sys.path)
+
+
+class MetadataIndex:
+    """进程级的发行包元信息索引.
+
+    首次使用时遍历一次 `sys.path` 建立 "发行包名 -> 发行包" 的索引, 元信息在首次查询时解析并缓存.
+    `sys.path` 变化或其中目录的修改时间变化时索引自动失效.
+    设置 `cache_path` 后, 索引与已解析的元信息会持久化到该文件, 供之后的进程在 `sys.path` 未变化时直接使用.
+
+    Examples:
+        ```python
+        >>> metadata_index.cache_path = "data/metadata-index.json"
+        >>> metadata_index.get("graia-saya")["version"]
+        ```
+    """
+
+    cache_path: Optional[Path]
+
+    def __init__(self, cache_path: Optional[Union[str, Path]] = None) -> None:
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self._lock = threading.RLock()
+        self._key: Optional[PathKey] = None
+        self._dists: Dict[str, Distribution] = {}
+        self._paths: Dict[str, Optional[str]] = {}
+        """发行包名 -> 发行包所在的目录, 按 `sys.path` 的顺序; 无法定位的发行包为 `None`"""
+        self._metas: Dict[str, ChannelMeta] = {}
+        self._entry_points: Dict[str, Dict[str, str]] = {}
+        self._dirty = False
+        self._atexit = False
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._key = None
+            self._dists.clear()
+            self._paths.clear()
+            self._metas.clear()
+            self._entry_points.clear()
+
+    def _ensure(self) -> None:
+        key = path_key()
+        if key == self._key:
+            return
+        with self._lock:
+            if key == self._key:
+                return
+            self.invalidate()
+            self._key = key
+            if not self._load(key):
+                self._build()
+                self._mark_dirty()
+
+    def _build(self) -> None:
+        # 与 `importlib_metadata.distribution` 相同, 同名的发行包以 `sys.path` 中靠前的为准
+        for dist in importlib_metadata.distributions():
+            name = dist.metadata["Name"]
+            if not name:
+                continue
+            name = normalize_name(name)
+            if name in self._paths:
+                continue
+            self._dists[name] = dist
+            try:
+                self._paths[name] = str(dist.locate_file(""))
+            except NotImplementedError:  # 非文件系统上的发行包
+                self._paths[name] = None
+
+    def _load(self, key: PathKey) -> bool:
+        if self.cache_path is None:
+            return False
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data: Dict[str, Any] = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != INDEX_VERSION or tuple(map(tuple, data.get("path_key", ()))) != key:
+            return False
+        # 发行包在首次使用时才从其所在目录中查找
+        self._paths = data["paths"]
+        self._metas = data["metas"]
+        self._entry_points = data["entry_points"]
+        return True
+
+    def save(self) -> None:
+        """将索引写入 `cache_path`; 仅当索引在上次写入后有变化时写入"""
+        with self._lock:
+            if self.cache_path is None or self._key is None or not self._dirty:
+                return
+            # 仅当所有发行包都能定位时, 索引才能在之后的进程中还原
+            if None in self._paths.values():
+                return
+            data = {
+                "version": INDEX_VERSION,
+                "path_key": self._key,
+                "paths": self._paths,
+                "metas": self._metas,
+                "entry_points": self._entry_points,
+            }
+            if write_json(self.cache_path, data):
+                self._dirty = False
+
+    def _mark_dirty(self) -> None:
+        self._dirty = True
+        if self.cache_path is not None and not self._atexit:
+            atexit.register(self.save)
+            self._atexit = True
+
+    def distribution(self, name: str) -> Distribution:
+        """按名称获取发行包, 与 `importlib_metadata.distribution` 相同, 但不会重复扫描 `sys.path`
+
+        Raises:
+            PackageNotFoundError: 找不到该发行包
+        """
+        self._ensure()
+        key = normalize_name(name)
+        dist = self._dists.get(key)
+        if dist is None:
+            path = self._paths.get(key)
+            if path is not None:
+                dist = next(iter(Distribution.discover(name=key, path=[path])), None)
+            if dist is None:
+                raise PackageNotFoundError(name)
+            with self._lock:
+                self._dists[key] = dist
+        return dist
+
+    def get(self, name: str) -> ChannelMeta:
+        """获取发行包的元信息, 见 `graia.saya.channel.get_channel_meta`
+
+        Raises:
+            PackageNotFoundError: 找不到该发行包
+        """
+        self._ensure()
+        key = normalize_name(name)
+        meta = self._metas.get(key)
+        if meta is None:
+            meta = channel_meta_from_distribution(self.distribution(name))
+            with self._lock:
+                self._metas[key] = meta
+                self._mark_dirty()
+        # 返回副本, 调用者对结果的修改不会污染缓存
+        return copy.deepcopy(meta)
+
+    def entry_points(self, group: str = PLUGIN_ENTRY_POINT_GROUP) -> Dict[str, str]:
+        """列出所有发行包在 `group` 中声明的入口点, 不导入它们.
+
+        Returns:
+            Dict[str, str]: 入口点名称 -> 入口点的值(如 `my_plugin.main` 或 `my_plugin.main:attr`)
+        """
+        self._ensure()
+        result = self._entry_points.get(group)
+        if result is None:
+            result = {}
+            for name in list(self._paths):
+                try:
+                    dist = self.distribution(name)
+                except PackageNotFoundError:
+                    continue
+                for entry_point in dist.entry_points.select(group=group):
+                    result.setdefault(entry_point.name, entry_point.value)
+            with self._lock:
+                self._entry_points[group] = result
+                self._mark_dirty()
+        return dict(result)
+
+
+metadata_index = MetadataIndex()
+
+
+def discover_plugins(group: str = PLUGIN_ENTRY_POINT_GROUP) -> List[str]:
+    """通过入口点找出以发行包形式安装的插件模块, 不导入它们.
+
+    插件在其 `pyproject.toml` 中声明:
+
+        [project.entry-points."graia.saya.plugins"]
+        my_plugin = "my_plugin.main"
+
+    Args:
+        group (str, optional): 入口点组, 默认为 `graia.saya.plugins`
+
+    Returns:
+        List[str]: 插件模块的引入路径, 可直接交给 `Saya.require_many`
+    """
+    modules: List[str] = []
+    for value in metadata_index.entry_points(group).values():
+        module = value.partition(":")[0].strip()
+        if module not in modules:
+            modules.append(module)
+    return modules
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Union
+
+from loguru import logger
+
+Factory = Callable[[], Union[Awaitable[Any], Any]]
+Teardown = Callable[[Any], Union[Awaitable[Any], Any]]
+
+
+class MountFactory:
+    """延迟创建的挂载: 首次访问时调用 `factory` 创建实例, 并发的首次访问只会创建一次.
+
+    `factory` 为异步函数时只能通过 `Saya.access_async` 访问.
+    """
+
+    factory: Factory
+    teardown: Optional[Teardown]
+    users: Set[Optional[str]]
+    """声明或访问过该挂载的模块; 监听器等不在模块上下文中的访问记为调用代码所属的模块, 不属于任何模块的访问记为 `None`"""
+
+    def __init__(self, factory: Factory, teardown: Optional[Teardown] = None) -> None:
+        self.factory = factory
+        self.teardown = teardown
+        self.users = set()
+        self._created = False
+        self._value: Any = None
+        self._lock = threading.Lock()
+        self._async_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def created(self) -> bool:
+        return self._created
+
+    @property
+    def is_async(self) -> bool:
+        return inspect.iscoroutinefunction(self.factory)
+
+    def get(self) -> Any:
+        if self._created:
+            return self._value
+        if self.is_async:
+            raise TypeError("the factory of this mount point is asynchronous, use Saya.access_async instead")
+        with self._lock:
+            if not self._created:
+                self._value = self.factory()
+                self._created = True
+        return self._value
+
+    async def get_async(self) -> Any:
+        if self._created:
+            return self._value
+        if not self.is_async:
+            return self.get()
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            if not self._created:
+                self._value = await self.factory()  # type: ignore
+                self._created = True
+        return self._value
+
+    def reset(self) -> Optional[Awaitable[Any]]:
+        """丢弃已创建的实例并调用 `teardown`, 之后的访问会重新创建; `teardown` 为异步时返回其 awaitable"""
+        with self._lock:
+            if not self._created:
+                return None
+            value, self._value, self._created = self._value, None, False
+        if self.teardown is None:
+            return None
+        result = self.teardown(value)
+        return result if inspect.isawaitable(result) else None
+
+
+_teardown_tasks: Set["asyncio.Task[Any]"] = set()
+"""执行中的异步 teardown; 事件循环只弱引用 Task, 需要在此保留引用直到其完成"""
+
+
+def run_teardown(result: Optional[Awaitable[Any]]) -> None:
+    """在事件循环中执行异步的 teardown, 出错时记录日志; 没有运行中的事件循环时同步运行至完成"""
+    if result is None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(_await(result))
+    else:
+        task = loop.create_task(_await(result))
+        _teardown_tasks.add(task)
+        task.add_done_callback(_teardown_done)
+
+
+def _teardown_done(task: "asyncio.Task[Any]") -> None:
+    _teardown_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.opt(exception=task.exception()).error("an error occurred while tearing down a mount")
+
+
+async def _await(result: Awaitable[Any]) -> Any:
+    return await result
+
+
+class MountTable(Dict[str, Any]):
+    """`Saya.mounts` 使用的字典, 按字典序缓存挂载点以便按点分前缀查找; 任何修改都会使缓存失效"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._keys: Optional[List[str]] = None
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._keys = None
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._keys = None
+
+    def __ior__(self, other: Any) -> "MountTable":
+        self.update(other)
+        return self
+
+    def pop(self, *args: Any) -> Any:
+        self._keys = None
+        return super().pop(*args)
+
+    def popitem(self) -> Any:
+        self._keys = None
+        return super().popitem()
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        self._keys = None
+        return super().setdefault(key, default)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self._keys = None
+
+    def clear(self) -> None:
+        super().clear()
+        self._keys = None
+
+    def sorted_keys(self) -> List[str]:
+        if self._keys is None:
+            self._keys = sorted(self)
+        return self._keys
+
+
+def prefixed(mounts: Dict[str, Any], prefix: str) -> List[str]:
+    """按字典序返回以 `prefix` 开头的挂载点; `mounts` 不是 `MountTable` 时每次都重新排序"""
+    keys = mounts.sorted_keys() if isinstance(mounts, MountTable) else sorted(mounts)
+    result = []
+    for key in keys[bisect_left(keys, prefix) :]:
+        if not key.startswith(prefix):
+            break
+        result.append(key)
+    return result
+
+
+def unused(mounts: Dict[str, Any], loaded: Iterable[str]) -> List[str]:
+    """返回已创建, 但访问过它的模块均已不再加载的延迟挂载; 在模块之外被访问过的挂载不会被视为未使用"""
+    modules = set(loaded)
+    return [
+        point
+        for point, target in mounts.items()
+        if isinstance(target, MountFactory)
+        and target.created
+        and None not in target.users
+        and not (target.users & modules)
+    ]
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, TypedDict, Union
+
+from loguru import logger
+
+from .discovery import _mtime_ns, file_digest, package_locations, write_json
+
+if TYPE_CHECKING:
+    from . import Saya
+    from .channel import Channel
+
+PLAN_VERSION = 1
+
+
+class FileRecord(TypedDict):
+    mtime_ns: int
+    sha256: str
+
+
+class ModulePlan(TypedDict):
+    module: str
+    dependencies: List[str]
+    """本计划中该模块依赖的模块"""
+    files: Dict[str, FileRecord]
+    """模块及其子模块的源文件"""
+    cubes: Dict[str, int]
+    """模块注册的 Cube 数量, 按 Schema 类型统计"""
+
+
+class StartupPlan(TypedDict):
+    version: int
+    python: str
+    requested: List[str]
+    """生成计划时请求导入的模块"""
+    package: Optional[str]
+    locations: Dict[str, int]
+    """`package` 所在目录的修改时间, 增删子模块会使计划失效"""
+    modules: List[ModulePlan]
+    """按加载顺序排列, 被依赖的模块在前"""
+
+
+def cube_summary(channel: "Channel") -> Dict[str, int]:
+    counter = Counter(type(cube.metaclass).__qualname__ for cube in channel.content)
+    return dict(sorted(counter.items()))
+
+
+def module_files(module: str) -> List[str]:
+    prefix = f"{module}."
+    files = set()
+    for name, py_module in list(sys.modules.items()):
+        if name != module and not name.startswith(prefix):
+            continue
+        path = getattr(py_module, "__file__", None)
+        if path:
+            files.add(path)
+    return sorted(files)
+
+
+def build_plan(saya: "Saya", modules: Iterable[str], package: Optional[str] = None) -> StartupPlan:
+    """根据已加载的模块生成启动计划.
+
+    Args:
+        saya (Saya): 已完成加载的 Saya 实例
+        modules (Iterable[str]): 请求导入的模块, 它们在加载时嵌套 require 的模块也会被包含
+        package (Optional[str], optional): 模块来自 `Saya.require_package` 时的包名
+
+    Returns:
+        StartupPlan: 启动计划
+    """
+    requested = list(modules)
+    wanted = set(requested)
+    stack = list(wanted)
+    while stack:
+        for dep in saya.dependency_graph.get(stack.pop(), ()):
+            if dep not in wanted:
+                wanted.add(dep)
+                stack.append(dep)
+
+    # Saya.channels 的插入顺序即分配顺序, 被依赖的模块总在前面
+    plans: List[ModulePlan] = []
+    for module, channel in saya.channels.items():
+        if module == "__main__" or module not in wanted:
+            continue
+        files: Dict[str, FileRecord] = {}
+        for path in module_files(module):
+            try:
+                files[path] = FileRecord(mtime_ns=_mtime_ns(path), sha256=file_digest(path))
+            except OSError:
+                continue
+        plans.append(
+            ModulePlan(
+                module=module,
+                dependencies=sorted(i for i in saya.dependency_graph.get(module, ()) if i in wanted),
+                files=files,
+                cubes=cube_summary(channel),
+            )
+        )
+
+    return StartupPlan(
+        version=PLAN_VERSION,
+        python=sys.version,
+        requested=requested,
+        package=package,
+        locations={i: _mtime_ns(i) for i in package_locations(package)} if package else {},
+        modules=plans,
+    )
+
+
+def save_plan(path: Union[str, Path], plan: StartupPlan) -> None:
+    write_json(path, plan)
+
+
+def load_plan(path: Union[str, Path]) -> Optional[StartupPlan]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            plan: Dict[str, Any] = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if plan.get("version") != PLAN_VERSION:
+        return None
+    return plan  # type: ignore
+
+
+def validate_plan(plan: StartupPlan, package: Optional[str] = None) -> bool:
+    """检查计划是否仍然有效: Python 版本与包未变化, 且所有源文件的内容未变化.
+
+    修改时间未变的文件不会重新计算哈希; `Saya.require_plan` 随后会通过 `refresh_mtimes` 更新计划中的修改时间.
+    """
+    if plan["python"] != sys.version or plan["package"] != package:
+        return False
+    if package is not None:
+        try:
+            locations = package_locations(package)
+        except (ImportError, ValueError):
+            return False
+        if set(locations) != plan["locations"].keys() or any(_mtime_ns(i) != plan["locations"][i] for i in locations):
+            return False
+    for module in plan["modules"]:
+        for path, record in module["files"].items():
+            mtime_ns = _mtime_ns(path)
+            if mtime_ns == -1:
+                return False
+            if mtime_ns != record["mtime_ns"] and file_digest(path) != record["sha256"]:
+                return False
+    return True
+
+
+def refresh_mtimes(plan: StartupPlan) -> bool:
+    """将已通过 `validate_plan` 的计划中记录的修改时间更新为文件当前的修改时间.
+
+    文件被 touch 或重新检出后内容未变, 但修改时间变化, 若不更新, 之后每次启动都要重新计算这些文件的哈希.
+
+    Returns:
+        bool: 是否有记录被更新
+    """
+    changed = False
+    for module in plan["modules"]:
+        for path, record in module["files"].items():
+            mtime_ns = _mtime_ns(path)
+            if mtime_ns != record["mtime_ns"]:
+                record["mtime_ns"] = mtime_ns
+                changed = True
+    return changed
+
+
+def require_from_plan(
+    saya: "Saya",
+    path: Union[str, Path],
+    modules: Optional[Iterable[str]] = None,
+    package: Optional[str] = None,
+    require_env: Any = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """见 `Saya.require_plan`"""
+    from .loader import BulkLoader
+
+    requested = list(modules) if modules is not None else None
+    plan = load_plan(path)
+    if plan is not None and requested is not None and requested != plan["requested"]:
+        plan = None
+
+    if plan is None or not validate_plan(plan, package):
+        logger.info(f"startup plan is missing or outdated, resolving modules: {path}")
+        if requested is None:
+            if package is None:
+                raise ValueError("either modules or package is required when there is no valid startup plan")
+            from .discovery import discover_modules
+
+            requested = discover_modules(package)
+        result = saya.require_many(requested, require_env, max_workers)
+        save_plan(path, build_plan(saya, requested, package))
+        return result
+
+    if refresh_mtimes(plan):
+        save_plan(path, plan)
+
+    # 计划有效: 直接并行导入计划中的模块, 按计划中的顺序分配, 不再发现与排序
+    order = [i["module"] for i in plan["modules"]]
+    loader = BulkLoader(saya, order, require_env, max_workers)
+    saya._load_bulk(loader, order)
+
+    stale = [
+        i["module"]
+        for i in plan["modules"]
+        if i["module"] in saya.channels and cube_summary(saya.channels[i["module"]]) != i["cubes"]
+    ]
+    if stale:
+        logger.warning(f"modules registered different cubes than the startup plan recorded, rewriting: {stale}")
+        save_plan(path, build_plan(saya, plan["requested"], package))
+
+    return {module: saya.channels[module]._export or saya.channels[module] for module in plan["requested"]}
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+current_report: ContextVar[Optional["ModuleLoadReport"]] = ContextVar("saya_load_report", default=None)
+
+
+@dataclass
+class Timing:
+    wall: float = 0.0
+    """墙上时间, 单位为秒"""
+    cpu: float = 0.0
+    """当前线程的 CPU 时间, 单位为秒"""
+
+
+@contextmanager
+def measure(timing: Timing) -> Iterator[Timing]:
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield timing
+    finally:
+        timing.wall += time.perf_counter() - wall
+        timing.cpu += time.thread_time() - cpu
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    timing: Timing = field(default_factory=Timing)
+    """执行模块代码的耗时, 包含其导入的子模块"""
+    children: List["ImportRecord"] = field(default_factory=list)
+
+
+@dataclass
+class AllocationRecord:
+    behaviour: str
+    cubes: List[str]
+    """本批次中由该 Behaviour 处理的 Cube"""
+    timing: Timing = field(default_factory=Timing)
+
+
+@dataclass
+class ModuleLoadReport:
+    """一个模块在 `Saya.require` 中各阶段的耗时"""
+
+    module: str
+    import_timing: Timing = field(default_factory=Timing)
+    """执行模块代码的耗时, 包含模块代码中嵌套 `Saya.require` 的其他模块的耗时(见 `nested_timing`)"""
+    nested_timing: Timing = field(default_factory=Timing)
+    """导入期间嵌套 `Saya.require` 其他模块的耗时, 这些模块有各自的报告"""
+    allocate_timing: Timing = field(default_factory=Timing)
+    event_timing: Timing = field(default_factory=Timing)
+    allocations: List[AllocationRecord] = field(default_factory=list)
+    """按 Behaviour 分批的 Cube 分配耗时, 见 `Behaviour.allocate_many`"""
+    imports: List[ImportRecord] = field(default_factory=list)
+    """导入过程中新导入的模块树, 与 `-X importtime` 类似"""
+
+    @property
+    def exclusive_import_timing(self) -> Timing:
+        """不含嵌套 `Saya.require` 的导入耗时"""
+        return Timing(
+            self.import_timing.wall - self.nested_timing.wall,
+            self.import_timing.cpu - self.nested_timing.cpu,
+        )
+
+    @property
+    def cube_count(self) -> int:
+        return sum(len(i.cubes) for i in self.allocations)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _TimedLoader:
+    def __init__(self, loader: Any) -> None:
+        self._loader = loader
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        report = current_report.get()
+        stack = ImportTimer.stack()
+        record = ImportRecord(module.__name__)
+        if stack:
+            stack[-1].children.append(record)
+        elif report is not None:
+            report.imports.append(record)
+
+        stack.append(record)
+        try:
+            with measure(record.timing):
+                self._loader.exec_module(module)
+        finally:
+            stack.pop()
+            # 导入完成后还原 loader, 不在模块上留下代理对象
+            if getattr(module, "__loader__", None) is self:
+                module.__loader__ = self._loader
+            spec = getattr(module, "__spec__", None)
+            if spec is not None and spec.loader is self:
+                spec.loader = self._loader
+
+
+class ImportTimer:
+    """`sys.meta_path` 上的 finder, 仅在正在记录 `ModuleLoadReport` 时生效, 为新导入的模块计时."""
+
+    _local = threading.local()
+
+    @classmethod
+    def stack(cls) -> List[ImportRecord]:
+        if not hasattr(cls._local, "stack"):
+            cls._local.stack = []
+        return cls._local.stack
+
+    @classmethod
+    @contextmanager
+    def frame(cls) -> Iterator[None]:
+        """为一次 `Saya.require` 使用新的导入栈, 使嵌套 require 的模块的导入记录归入其自身的报告"""
+        previous = cls.stack()
+        cls._local.stack = []
+        try:
+            yield
+        finally:
+            cls._local.stack = previous
+
+    @classmethod
+    def install(cls) -> None:
+        if not any(isinstance(i, cls) for i in sys.meta_path):
+            sys.meta_path.insert(0, cls())
+
+    def find_spec(self, fullname: str, path=None, target=None):
+        if current_report.get() is None:
+            return None
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader)
+        return spec
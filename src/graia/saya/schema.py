@@ -7,6 +7,8 @@ if TYPE_CHECKING:
 
 
 class BaseSchema:
+    __slots__ = ("channel",)
+
     channel: "Channel"
 
     def __post_init__(self):
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import Any, Tuple, Type, TypeVar
+
+T = TypeVar("T", bound=type)
+
+
+def slotted(*extra: str):
+    """为 dataclass 生成带 `__slots__` 的同名类, 与 Python 3.10 的 `dataclass(slots=True)` 相同.
+
+    必须放在 `@dataclass` 之上. 基类已声明的 slot 不会重复声明;
+    基类未声明 `__slots__` 时实例仍然拥有 `__dict__`, 保证子类与旧代码的兼容.
+    与 `dataclass(slots=True)` 一样, 类中的方法不能使用无参数的 `super()`.
+
+    Args:
+        *extra (str): 额外的 slot, 如 `__weakref__`
+    """
+
+    def wrapper(cls: T) -> T:
+        inherited = {slot for base in cls.__mro__[1:] for slot in getattr(base, "__slots__", ())}
+        names: Tuple[str, ...] = tuple(i.name for i in dataclasses.fields(cls)) + extra
+        namespace = dict(cls.__dict__)
+        namespace["__slots__"] = tuple(i for i in names if i not in inherited)
+        # 字段的默认值保存在 dataclass 生成的 `__init__` 中, 类属性会与同名 slot 冲突
+        for name in names:
+            namespace.pop(name, None)
+        namespace.pop("__dict__", None)
+        namespace.pop("__weakref__", None)
+        new: Type[Any] = type(cls)(cls.__name__, cls.__bases__, namespace)
+        new.__qualname__ = cls.__qualname__
+        return new  # type: ignore
+
+    return wrapper
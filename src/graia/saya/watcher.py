@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from types import ModuleType
+from typing import TYPE_CHECKING, Container, Dict, Iterable, List, Optional, Set
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from . import Saya
+
+Snapshot = Dict[str, Dict[str, int]]
+
+
+def _owner(module_name: str, channels: Container[str]) -> Optional[str]:
+    """返回 `module_name` 所属的模块(最长前缀匹配)"""
+    # 从完整名称向上查找, 第一个已加载的模块即最长前缀匹配
+    while module_name not in channels:
+        module_name, sep, _ = module_name.rpartition(".")
+        if not sep:
+            return None
+    return module_name
+
+
+class ChannelWatcher:
+    """监视已加载模块的源文件, 在文件变化后重载变化的模块及依赖它们的模块.
+
+    依赖关系来自 `Saya.dependency_graph` (模块导入时嵌套调用的 `Saya.require`),
+    以及模块全局变量中对其他模块(或其中定义的对象)的引用. 重载按依赖顺序进行, 被依赖者优先.
+    `zero_gap` 为 `True` 时使用 `Saya.reload_channel` 的 zero-gap 模式, 新版本有错误时旧版本保持可用;
+    否则重载失败的模块会处于卸载状态, 但其源文件仍会被监视, 再次变化时会重新尝试导入.
+
+    Examples:
+        ```python
+        >>> watcher = ChannelWatcher(saya)
+        >>> watcher.start()  # 需在事件循环中调用
+        ```
+    """
+
+    saya: "Saya"
+    interval: float
+    debounce: float
+    zero_gap: bool
+
+    snapshot: Snapshot
+    task: Optional[asyncio.Task]
+
+    failed: Dict[str, Set[str]]
+    """重载失败而未能重新加载的模块及其源文件"""
+
+    def __init__(self, saya: "Saya", interval: float = 1.0, debounce: float = 0.5, zero_gap: bool = False) -> None:
+        self.saya = saya
+        self.interval = interval
+        self.debounce = debounce
+        self.zero_gap = zero_gap
+        self.failed = {}
+        self.snapshot = self.scan()
+        self.task = None
+
+    def module_files(self) -> Dict[str, Set[str]]:
+        """遍历一次 `sys.modules`, 返回每个已加载模块(及其已导入的子模块)的源文件路径"""
+        files: Dict[str, Set[str]] = {module: set() for module in self.saya.channels if module != "__main__"}
+        for name, module in list(sys.modules.items()):
+            owner = _owner(name, files)
+            path = getattr(module, "__file__", None)
+            if owner is not None and path:
+                files[owner].add(path)
+        return files
+
+    def scan(self) -> Snapshot:
+        snapshot: Snapshot = {}
+        files = self.module_files()
+        for module, paths in self.failed.items():
+            if module not in files:
+                files[module] = paths
+        for module, paths in files.items():
+            mtimes: Dict[str, int] = {}
+            for path in paths:
+                try:
+                    mtimes[path] = os.stat(path).st_mtime_ns
+                except OSError:
+                    mtimes[path] = -1
+            snapshot[module] = mtimes
+        return snapshot
+
+    def changed_modules(self, snapshot: Snapshot) -> Set[str]:
+        """对比 `self.snapshot`, 返回源文件发生变化的模块"""
+        return {module for module, mtimes in snapshot.items() if self.snapshot.get(module, mtimes) != mtimes}
+
+    def dependency_edges(self) -> Dict[str, Set[str]]:
+        """模块 -> 其依赖的模块"""
+        channels = {i for i in self.saya.channels if i != "__main__"}
+        edges: Dict[str, Set[str]] = {
+            module: {i for i in deps if i in self.saya.channels} for module, deps in self.saya.dependency_graph.items()
+        }
+        for module in channels:
+            py_module = self.saya.channels[module]._py_module
+            if py_module is None:
+                continue
+            for value in list(vars(py_module).values()):
+                try:
+                    name = value.__name__ if isinstance(value, ModuleType) else getattr(value, "__module__", None)
+                except Exception:
+                    continue
+                if not isinstance(name, str):
+                    continue
+                owner = _owner(name, channels)
+                if owner is not None and owner != module:
+                    edges.setdefault(module, set()).add(owner)
+        return edges
+
+    def affected_modules(self, changed: Iterable[str]) -> List[str]:
+        """返回需要重载的模块(变化的模块及所有直接或间接依赖它们的模块), 被依赖者在前"""
+        edges = self.dependency_edges()
+        dependents: Dict[str, Set[str]] = {}
+        for module, deps in edges.items():
+            for dep in deps:
+                dependents.setdefault(dep, set()).add(module)
+
+        affected: Set[str] = set()
+        stack = [i for i in changed if i in self.saya.channels or i in self.failed]
+        while stack:
+            module = stack.pop()
+            if module in affected or module == "__main__":
+                continue
+            affected.add(module)
+            stack.extend(dependents.get(module, ()))
+
+        order: List[str] = []
+        done: Set[str] = set()
+        # 重载失败的模块已经卸载, 不依赖其他模块, 排在最前
+        remaining = [i for i in self.failed if i in affected and i not in self.saya.channels]
+        remaining += [i for i in self.saya.channels if i in affected]
+        while remaining:
+            ready = [i for i in remaining if not (edges.get(i, set()) & affected) - done] or remaining
+            order.extend(ready)
+            done.update(ready)
+            remaining = [i for i in remaining if i not in done]
+        return order
+
+    def reload(self, modules: Iterable[str]) -> None:
+        for module in modules:
+            channel = self.saya.channels.get(module)
+            if channel is None and module not in self.failed:
+                continue
+            logger.info(f"reloading module: {module}")
+            try:
+                with self.saya.module_context():
+                    if channel is None:
+                        self.saya.require(module)
+                    else:
+                        self.saya.reload_channel(channel, zero_gap=self.zero_gap)
+            except Exception:
+                logger.exception(f"failed to reload module: {module}")
+            if module in self.saya.channels:
+                self.failed.pop(module, None)
+            elif module not in self.failed:
+                # 卸载后未能重新导入: 继续监视原来的源文件, 变化后再次尝试
+                self.failed[module] = set(self.snapshot.get(module, ()))
+
+    def check(self) -> List[str]:
+        """立即检查一次, 重载受影响的模块并返回它们"""
+        snapshot = self.scan()
+        modules = self.affected_modules(self.changed_modules(snapshot))
+        if modules:
+            self.reload(modules)
+            snapshot = self.scan()
+        self.snapshot = snapshot
+        return modules
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            snapshot = self.scan()
+            if not self.changed_modules(snapshot):
+                continue
+            # 等待连续的保存操作结束后再重载
+            while True:
+                await asyncio.sleep(self.debounce)
+                latest = self.scan()
+                if latest == snapshot:
+                    break
+                snapshot = latest
+            self.check()
+
+    def start(self) -> asyncio.Task:
+        """在当前事件循环中开始监视"""
+        if self.task is None or self.task.done():
+            self.snapshot = self.scan()
+            self.task = asyncio.get_event_loop().create_task(self.run())
+        return self.task
+
+    def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
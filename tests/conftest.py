@@ -0,0 +1,122 @@
+import asyncio
+import importlib
+import sys
+import textwrap
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from creart import it
+from graia.broadcast import Broadcast
+from graia.broadcast.entities.event import Dispatchable
+
+from graia.saya import Saya
+from graia.saya.behaviour import Behaviour
+from graia.saya.builtins.broadcast.behaviour import BroadcastBehaviour
+from graia.saya.cube import Cube
+
+
+class Recorder(Behaviour):
+    """接受所有 Cube, 并按分配顺序记录 Cube 所属的模块"""
+
+    def __init__(self, saya: Saya) -> None:
+        self.saya = saya
+        self.allocated: List[str] = []
+        self.released: List[str] = []
+
+    def allocate(self, cube: Cube) -> Any:
+        self.allocated.append(self.saya.behaviour_interface.currentModule)
+        return True
+
+    def release(self, cube: Cube) -> Any:
+        self.released.append(self.saya.behaviour_interface.currentModule)
+        return True
+
+
+@pytest.fixture
+def make_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """在临时目录中写入模块源码(父包会被自动创建), 测试结束后将这些模块从 `sys.modules` 中移除"""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # 同一秒内改写的源文件可能与旧的字节码缓存有相同的 mtime
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+
+    def make(name: str, source: str = "") -> Path:
+        *packages, leaf = name.split(".")
+        directory = tmp_path
+        for package in packages:
+            directory = directory / package
+            directory.mkdir(exist_ok=True)
+            (directory / "__init__.py").touch()
+        path = directory / f"{leaf}.py"
+        path.write_text(textwrap.dedent(source))
+        importlib.invalidate_caches()
+        return path
+
+    yield make
+    for name, module in list(sys.modules.items()):
+        if str(getattr(module, "__file__", None) or "").startswith(str(tmp_path)):
+            del sys.modules[name]
+
+
+@pytest.fixture
+def loop() -> asyncio.AbstractEventLoop:
+    """Broadcast 投递事件使用的事件循环"""
+    return it(asyncio.AbstractEventLoop)
+
+
+@pytest.fixture
+def saya() -> Saya:
+    broadcast = Broadcast()
+    saya = Saya(broadcast)
+    saya.install_behaviours(BroadcastBehaviour(broadcast))
+    with saya.module_context():
+        yield saya
+
+
+@pytest.fixture
+def recorder(saya: Saya) -> Recorder:
+    recorder = Recorder(saya)
+    saya.install_behaviours(recorder)
+    return recorder
+
+
+@pytest.fixture
+def lifecycle(saya: Saya) -> List[Dispatchable]:
+    """按分发顺序记录模块生命周期事件"""
+    from graia.saya.event import (
+        SayaModuleInstalled,
+        SayaModulesInstalled,
+        SayaModulesUninstalled,
+        SayaModuleUninstall,
+        SayaModuleUninstalled,
+    )
+
+    received: List[Dispatchable] = []
+
+    async def record() -> None:
+        received.append(saya.broadcast.event_ctx.get())
+
+    for event in (
+        SayaModuleInstalled,
+        SayaModulesInstalled,
+        SayaModuleUninstall,
+        SayaModuleUninstalled,
+        SayaModulesUninstalled,
+    ):
+        saya.broadcast.receiver(event)(record)
+    return received
+
+
+@pytest.fixture
+def settle(loop: asyncio.AbstractEventLoop):
+    """运行事件循环, 直到已投递的事件(以及它们创建的 Task)都处理完毕"""
+
+    async def wait() -> None:
+        current = asyncio.current_task()
+        while True:
+            tasks = [i for i in asyncio.all_tasks() if i is not current]
+            if not tasks:
+                return
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    return lambda: loop.run_until_complete(wait())
@@ -0,0 +1,93 @@
+import asyncio
+
+from graia.saya import Saya
+from graia.saya.event import (
+    SayaModuleInstalled,
+    SayaModulesInstalled,
+    SayaModulesUninstalled,
+    SayaModuleUninstalled,
+)
+
+MODULE = """
+from graia.saya import Channel
+from graia.saya.schema import BaseSchema
+
+Channel.current().use(BaseSchema())(lambda: None)
+"""
+
+
+def names(events) -> list:
+    return [type(i).__name__ for i in events]
+
+
+def test_batch_posts_one_aggregate_event(saya: Saya, recorder, lifecycle, make_module, settle):
+    for name in ("batch_a", "batch_b"):
+        make_module(name, MODULE)
+
+    with saya.batch() as batch:
+        saya.require("batch_a")
+        with saya.batch() as inner:
+            assert inner is batch
+            saya.require("batch_b")
+        settle()
+        assert lifecycle == []
+        saya.uninstall_channel(saya.channels["batch_a"])
+
+    settle()
+    assert names(lifecycle) == ["SayaModuleUninstall", "SayaModulesUninstalled", "SayaModulesInstalled"]
+    uninstalled, installed = lifecycle[1:]
+    assert isinstance(uninstalled, SayaModulesUninstalled) and uninstalled.modules == ["batch_a"]
+    assert isinstance(installed, SayaModulesInstalled)
+    assert [i.module for i in installed.channels] == ["batch_a", "batch_b"]
+
+
+def test_batch_without_suppress_keeps_per_module_events(saya: Saya, recorder, lifecycle, make_module, settle):
+    for name in ("batch_a", "batch_b"):
+        make_module(name, MODULE)
+
+    saya.require_many(["batch_a", "batch_b"])
+
+    settle()
+    assert names(lifecycle) == ["SayaModuleInstalled", "SayaModuleInstalled", "SayaModulesInstalled"]
+    assert [i.module for i in lifecycle if isinstance(i, SayaModuleInstalled)] == ["batch_a", "batch_b"]
+
+
+def test_batch_without_emit_posts_nothing(saya: Saya, recorder, lifecycle, make_module, settle):
+    make_module("batch_a", MODULE)
+
+    with saya.batch(emit=False):
+        saya.require("batch_a")
+        saya.uninstall_channel(saya.channels["batch_a"])
+
+    settle()
+    assert names(lifecycle) == ["SayaModuleUninstall"]
+
+
+def test_batch_is_local_to_its_task(saya: Saya, recorder, lifecycle, make_module, loop, settle):
+    for name in ("batch_a", "batch_b"):
+        make_module(name, MODULE)
+
+    async def batched(entered: asyncio.Event, release: asyncio.Event):
+        with saya.batch():
+            entered.set()
+            await release.wait()
+            saya.require("batch_a")
+
+    async def plain(entered: asyncio.Event, release: asyncio.Event):
+        await entered.wait()
+        assert saya.lifecycle_batch is None
+        saya.require("batch_b")
+        release.set()
+
+    async def main():
+        entered, release = asyncio.Event(), asyncio.Event()
+        await asyncio.gather(batched(entered, release), plain(entered, release))
+
+    loop.run_until_complete(main())
+    settle()
+    assert [(type(i).__name__, getattr(i, "module", None)) for i in lifecycle] == [
+        ("SayaModuleInstalled", "batch_b"),
+        ("SayaModulesInstalled", None),
+    ]
+    assert not any(isinstance(i, SayaModuleUninstalled) for i in lifecycle)
+    assert [i.module for i in lifecycle[1].channels] == ["batch_a"]
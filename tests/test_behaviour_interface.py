@@ -0,0 +1,129 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, List
+
+import pytest
+
+from graia.saya import Saya
+from graia.saya.behaviour import Behaviour
+from graia.saya.channel import Channel
+from graia.saya.context import channel_instance
+from graia.saya.cube import Cube
+from graia.saya.schema import BaseSchema
+
+
+@dataclass
+class SchemaA(BaseSchema):
+    name: str
+
+
+@dataclass
+class SchemaB(BaseSchema):
+    name: str
+
+
+class Recorder(Behaviour):
+    def __init__(self, schema: type, log: List[str], accept: Any = True) -> None:
+        self.schemas = (schema,)
+        self.log = log
+        self.accept = accept
+
+    def allocate(self, cube: Cube) -> Any:
+        if not self.accept:
+            return None
+        self.log.append(cube.metaclass.name)
+        return True
+
+    def release(self, cube: Cube) -> Any:
+        return True if self.accept else None
+
+
+@pytest.fixture
+def channel():
+    channel = Channel("tests.module")
+    token = channel_instance.set(channel)
+    yield channel
+    channel_instance.reset(token)
+
+
+def test_allocate_cubes_keeps_declaration_order(channel: Channel):
+    log: List[str] = []
+    saya = Saya()
+    saya.install_behaviours(Recorder(SchemaA, log), Recorder(SchemaB, log))
+    cubes = [
+        Cube(object(), SchemaA("a1")),
+        Cube(object(), SchemaB("b1")),
+        Cube(object(), SchemaA("a2")),
+        Cube(object(), SchemaB("b2")),
+    ]
+    with saya.behaviour_interface.require_context(channel.module) as interface:
+        interface.allocate_cubes(cubes)
+    assert log == ["a1", "b1", "a2", "b2"]
+
+
+def test_nested_delegation_does_not_restart_the_chain(channel: Channel):
+    log: List[str] = []
+    saya = Saya()
+
+    class Delegating(Behaviour):
+        calls = 0
+
+        def allocate(self, cube: Cube) -> Any:
+            Delegating.calls += 1
+            assert Delegating.calls <= 3, "the delegating behaviour was entered again"
+            return saya.behaviour_interface.allocate_cube(cube)
+
+        def release(self, cube: Cube) -> Any:
+            return None
+
+    saya.install_behaviours(Recorder(SchemaA, log, accept=False), Delegating(), Recorder(SchemaA, log))
+    cubes = [Cube(object(), SchemaA(f"a{i}")) for i in range(3)]
+    with saya.behaviour_interface.require_context(channel.module) as interface:
+        interface.allocate_cubes(cubes)
+        assert interface._index == 0
+    assert log == ["a0", "a1", "a2"]
+
+
+def test_async_allocation_runs_in_a_task_context(channel: Channel):
+    saya = Saya()
+    seen: List[str] = []
+
+    class Async(Behaviour):
+        async def allocate_async(self, cube: Cube) -> Any:
+            await asyncio.sleep(0)
+            seen.append(saya.behaviour_interface.currentModule)
+            return True
+
+        def allocate(self, cube: Cube) -> Any:
+            return True
+
+        def release(self, cube: Cube) -> Any:
+            return True
+
+    saya.install_behaviours(Async())
+
+    async def allocate(module: str) -> None:
+        with saya.behaviour_interface.task_context(module) as interface:
+            await interface.allocate_cubes_async([Cube(object(), SchemaA(module))])
+
+    async def main() -> None:
+        await asyncio.gather(allocate("tests.first"), allocate("tests.second"))
+
+    asyncio.run(main())
+    assert sorted(seen) == ["tests.first", "tests.second"]
+    assert saya.behaviour_interface.currentModule == "graia.saya.__special__.global_behaviours"
+
+
+def test_release_cubes_async_batches_through_release_many(channel: Channel):
+    batches: List[int] = []
+
+    class Batched(Recorder):
+        def release_many(self, cubes: List[Cube]) -> List[Any]:
+            batches.append(len(cubes))
+            return super().release_many(cubes)
+
+    saya = Saya()
+    saya.install_behaviours(Batched(SchemaA, []))
+    cubes = [Cube(object(), SchemaA(f"a{i}")) for i in range(5)]
+    asyncio.run(saya.behaviour_interface.release_cubes_async(cubes))
+    assert batches == [5]
@@ -0,0 +1,23 @@
+import pytest
+
+from graia.saya.channel import Channel, SlottedScopedContext
+
+
+class Base:
+    token: str
+
+
+def test_slotted_context_includes_inherited_annotations():
+    channel = Channel("tests.module")
+
+    @channel.scoped_context(slotted=True)
+    class Isolate(Base):
+        count: int
+
+    context = channel.scopes[Isolate]
+    assert isinstance(context, SlottedScopedContext)
+    context.token = "t"
+    context.count = 1
+    assert context.content == {"channel": channel, "token": "t", "count": 1}
+    with pytest.raises(AttributeError):
+        context.undeclared = 1
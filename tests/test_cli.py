@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from graia.saya import Saya
+from graia.saya.__main__ import main
+
+MODULE = """
+from graia.saya import Channel, Saya
+from graia.saya.builtins.broadcast.schema import ListenerSchema
+from graia.saya.event import SayaModuleInstalled
+
+{requires}
+
+
+@Channel.current().use(ListenerSchema(listening_events=[SayaModuleInstalled]))
+async def handler():
+    pass
+"""
+
+
+@pytest.fixture
+def posted(monkeypatch: pytest.MonkeyPatch) -> List[object]:
+    events: List[object] = []
+    monkeypatch.setattr(Saya, "_post_event", lambda self, event: events.append(event))
+    return events
+
+
+def run(capsys: pytest.CaptureFixture, *argv: str) -> tuple:
+    # --verbose: 不移除 loguru 的全局 handler, 以免影响其他测试
+    status = main([*argv, "--json", "--verbose"])
+    return status, json.loads(capsys.readouterr().out)
+
+
+def test_reports_each_module(make_module, capsys, posted: List[object]):
+    make_module("cli_pkg.base", MODULE.format(requires=""))
+    make_module("cli_pkg.app", MODULE.format(requires="Saya.current().require('cli_pkg.base')"))
+
+    status, result = run(capsys, "--package", "cli_pkg")
+
+    assert status == 0
+    assert sorted(i["module"] for i in result["modules"]) == ["cli_pkg.app", "cli_pkg.base"]
+    assert all(i["cubes"] == 1 for i in result["modules"])
+    assert result["failed"] == {} and result["slow"] == []
+    assert posted == []
+
+
+def test_failures_and_slow_modules_set_the_exit_status(make_module, capsys, posted: List[object]):
+    make_module("cli_good", MODULE.format(requires=""))
+    make_module("cli_bad", "raise RuntimeError('broken')")
+
+    status, result = run(capsys, "cli_good", "cli_bad")
+    assert status == 2
+    assert result["failed"] == {"cli_bad": "RuntimeError: broken"}
+
+    status, result = run(capsys, "cli_good", "--threshold", "-1")
+    assert status == 1
+    assert result["slow"] == ["cli_good"]
+
+
+def test_compile_only(make_module, capsys, posted: List[object]):
+    path: Path = make_module("cli_compiled.mod", MODULE.format(requires=""))
+
+    assert main(["--package", "cli_compiled", "--compile", "--no-load", "--verbose"]) == 0
+    assert capsys.readouterr().out == ""
+    assert list((path.parent / "__pycache__").glob("mod.*.pyc"))
+    assert posted == []
@@ -0,0 +1,73 @@
+import copy
+
+import pytest
+
+from graia.saya.cube import Cube, CubeList
+
+
+def make_cubes(count: int):
+    return [Cube(object(), None) for _ in range(count)]
+
+
+def test_duplicate_append_raises():
+    a, b = make_cubes(2)
+    cubes = CubeList([a, b])
+    with pytest.raises(ValueError):
+        cubes.append(a)
+    assert list(cubes) == [a, b]
+    assert len(cubes) == 2
+
+
+def test_failed_mutation_keeps_the_list_unchanged():
+    a, b, c = make_cubes(3)
+    cubes = CubeList([a, b, c])
+    with pytest.raises(ValueError):
+        cubes[0] = c
+    with pytest.raises(ValueError):
+        cubes.insert(0, b)
+    assert list(cubes) == [a, b, c]
+    assert cubes.by_content(a.content) == [a]
+
+
+def test_list_semantics():
+    a, b, c = make_cubes(3)
+    cubes = CubeList([a, c])
+    cubes.insert(1, b)
+    assert list(cubes) == [a, b, c]
+    assert cubes.index(c) == 2
+    assert cubes[-1] is c
+    cubes[1] = Cube(b.content, None)
+    assert cubes.by_content(b.content) == [cubes[1]]
+    del cubes[0]
+    assert len(cubes) == 2
+    assert cubes.by_content(a.content) == []
+    cubes.discard_content(c.content)
+    assert len(cubes) == 1
+
+
+def test_is_a_list():
+    a, b, c = make_cubes(3)
+    cubes = CubeList([b, a])
+    assert isinstance(cubes, list)
+    assert cubes + [c] == [b, a, c]
+    assert cubes.copy() == [b, a]
+    assert type(cubes.copy()) is list
+
+    cubes.sort(key=lambda cube: [a, b].index(cube))
+    assert cubes == [a, b]
+    assert cubes.by_schema(type(None)) == [a, b]
+    copied = copy.deepcopy(cubes)
+    assert isinstance(copied, CubeList)
+    assert copied.by_content(copied[0].content) == [copied[0]]
+
+
+def test_by_schema_follows_list_order():
+    a, b, c = make_cubes(3)
+    cubes = CubeList([a, c])
+    cubes.insert(1, b)
+    assert cubes.by_schema(type(None)) == [a, b, c]
+    cubes.reverse()
+    assert cubes.by_schema(type(None)) == [c, b, a]
+    cubes.discard_content(b.content)
+    assert cubes == [c, a]
+    assert cubes.by_content(b.content) == []
@@ -0,0 +1,53 @@
+import json
+import os
+
+import pytest
+
+from graia.saya import discovery
+from graia.saya.discovery import discover_modules
+
+
+def test_manifest_is_reused_until_the_package_changes(tmp_path, make_module, monkeypatch):
+    make_module("discovered.first")
+    make_module("discovered.second")
+    make_module("discovered._private")
+    manifest = tmp_path / "manifest.json"
+
+    assert discover_modules("discovered", manifest) == ["discovered.first", "discovered.second"]
+    assert [i["name"] for i in json.loads(manifest.read_text())["modules"]] == ["discovered.first", "discovered.second"]
+
+    def fail(package):
+        raise AssertionError("the package was scanned again")
+
+    with monkeypatch.context() as m:
+        m.setattr(discovery, "scan_package", fail)
+        assert discover_modules("discovered", manifest) == ["discovered.first", "discovered.second"]
+
+    make_module("discovered.third")
+    directory = tmp_path / "discovered"
+    stat = directory.stat()
+    os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert discover_modules("discovered", manifest) == ["discovered.first", "discovered.second", "discovered.third"]
+
+
+def test_require_package_loads_every_submodule(saya, recorder, make_module):
+    for name in ("first", "second"):
+        make_module(
+            f"required_package.{name}",
+            """
+            from graia.saya import Channel
+            from graia.saya.schema import BaseSchema
+
+            Channel.current().use(BaseSchema())(lambda: None)
+            """,
+        )
+
+    result = saya.require_package("required_package")
+    assert sorted(result) == ["required_package.first", "required_package.second"]
+    assert sorted(recorder.allocated) == ["required_package.first", "required_package.second"]
+
+
+def test_not_a_package(make_module):
+    make_module("plain_module")
+    with pytest.raises(ValueError):
+        discover_modules("plain_module")
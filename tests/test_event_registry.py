@@ -0,0 +1,63 @@
+import importlib
+import sys
+
+from graia.saya.builtins.broadcast.registry import EventRegistry
+
+SOURCE = """
+from graia.broadcast.entities.event import Dispatchable
+
+
+class ReloadedEvent(Dispatchable):
+    version = {version}
+"""
+
+
+def test_resolve_returns_the_reloaded_class(tmp_path, monkeypatch):
+    (tmp_path / "registry_reload_events.py").write_text(SOURCE.format(version=1))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    registry = EventRegistry()
+    try:
+        module = importlib.import_module("registry_reload_events")
+        old = registry.resolve("ReloadedEvent")
+        assert old is module.ReloadedEvent
+
+        (tmp_path / "registry_reload_events.py").write_text(SOURCE.format(version=22))
+        importlib.invalidate_caches()
+        module = importlib.reload(module)
+
+        new = registry.resolve("ReloadedEvent")
+        assert new is module.ReloadedEvent
+        assert new is not old
+        assert new.version == 22
+        assert registry.resolve("registry_reload_events.ReloadedEvent") is new
+    finally:
+        sys.modules.pop("registry_reload_events", None)
+
+
+def test_stale_classes_do_not_walk_the_subclass_tree(tmp_path, monkeypatch):
+    (tmp_path / "registry_stale_events.py").write_text(SOURCE.format(version=1))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    registry = EventRegistry()
+    name = "registry_stale_events.ReloadedEvent"
+    try:
+        module = importlib.import_module("registry_stale_events")
+        assert registry.resolve(name) is module.ReloadedEvent
+
+        walks = []
+        refresh = registry.refresh
+        monkeypatch.setattr(registry, "refresh", lambda: walks.append(1) or refresh())
+
+        (tmp_path / "registry_stale_events.py").write_text(SOURCE.format(version=333))
+        importlib.invalidate_caches()
+        module = importlib.reload(module)
+        for _ in range(3):
+            assert registry.resolve(name) is module.ReloadedEvent
+
+        # 模块被移除后, 旧的类仍被返回, 但不会每次都遍历子类树
+        del sys.modules["registry_stale_events"]
+        for _ in range(3):
+            assert registry.resolve(name) is module.ReloadedEvent
+        assert walks == []
+    finally:
+        sys.modules.pop("registry_stale_events", None)
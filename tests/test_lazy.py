@@ -0,0 +1,103 @@
+import asyncio
+import importlib
+import sys
+
+from graia.saya import Saya
+
+EVENTS = """
+from graia.broadcast.entities.dispatcher import BaseDispatcher
+from graia.broadcast.entities.event import Dispatchable
+
+
+class LazyEvent(Dispatchable):
+    class Dispatcher(BaseDispatcher):
+        @staticmethod
+        async def catch(interface):
+            pass
+
+
+received = []
+"""
+
+PLUGIN = """
+from graia.saya import Channel
+from graia.saya.builtins.broadcast.schema import ListenerSchema
+
+from lazy_events import LazyEvent, received
+
+
+@Channel.current().use(ListenerSchema(listening_events=[LazyEvent]))
+async def handler():
+    received.append("handled")
+"""
+
+
+def test_module_is_imported_on_the_first_event(saya: Saya, make_module, settle):
+    make_module("lazy_events", EVENTS)
+    make_module("lazy_plugin", PLUGIN)
+    events = importlib.import_module("lazy_events")
+
+    lazy = saya.require_lazy("lazy_plugin", ["LazyEvent"])
+    placeholder = lazy.listener
+    assert "lazy_plugin" not in sys.modules
+
+    saya.broadcast.postEvent(events.LazyEvent())
+    settle()
+    assert events.received == ["handled"]
+    assert "lazy_plugin" in saya.channels
+    assert saya.lazy_channels == {}
+    assert placeholder not in saya.broadcast.listeners
+
+    saya.broadcast.postEvent(events.LazyEvent())
+    settle()
+    assert events.received == ["handled", "handled"]
+
+
+def test_failed_import_keeps_the_placeholder(saya: Saya, make_module, settle):
+    make_module("lazy_events", EVENTS)
+    make_module("lazy_plugin", "raise RuntimeError('not ready')")
+    events = importlib.import_module("lazy_events")
+
+    lazy = saya.require_lazy("lazy_plugin", [events.LazyEvent])
+    saya.broadcast.postEvent(events.LazyEvent())
+    settle()
+    assert "lazy_plugin" not in saya.channels
+    assert saya.lazy_channels == {"lazy_plugin": lazy}
+    assert lazy.listener in saya.broadcast.listeners
+
+    make_module("lazy_plugin", PLUGIN)
+    saya.broadcast.postEvent(events.LazyEvent())
+    settle()
+    assert events.received == ["handled"]
+    assert saya.lazy_channels == {}
+
+
+def test_require_replaces_the_placeholder(saya: Saya, make_module):
+    make_module("lazy_events", EVENTS)
+    make_module("lazy_plugin", PLUGIN)
+
+    lazy = saya.require_lazy("lazy_plugin", ["LazyEvent"])
+    placeholder = lazy.listener
+    saya.require("lazy_plugin")
+    assert saya.lazy_channels == {}
+    assert placeholder not in saya.broadcast.listeners
+
+
+def test_event_during_require_async_waits_for_the_import(saya: Saya, make_module, loop, settle):
+    make_module("lazy_events", EVENTS)
+    make_module(
+        "lazy_plugin",
+        "import time\nfrom lazy_events import received\nreceived.append('imported')\ntime.sleep(0.2)\n" + PLUGIN,
+    )
+    events = importlib.import_module("lazy_events")
+    saya.require_lazy("lazy_plugin", ["LazyEvent"])
+
+    async def main():
+        task = asyncio.ensure_future(saya.require_async("lazy_plugin"))
+        await asyncio.sleep(0.05)
+        saya.broadcast.postEvent(events.LazyEvent())
+        await task
+
+    loop.run_until_complete(main())
+    settle()
+    assert events.received == ["imported", "handled"]
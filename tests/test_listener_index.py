@@ -0,0 +1,65 @@
+from graia.broadcast import Broadcast
+from graia.broadcast.entities.dispatcher import BaseDispatcher
+from graia.broadcast.entities.event import Dispatchable
+from graia.broadcast.entities.listener import Listener
+
+from graia.saya.builtins.broadcast.behaviour import BroadcastBehaviour
+from graia.saya.builtins.broadcast.index import IndexedBroadcast
+
+
+class Dispatcher(BaseDispatcher):
+    @staticmethod
+    async def catch(interface):
+        pass
+
+
+class EventA(Dispatchable):
+    Dispatcher = Dispatcher
+
+
+class EventB(Dispatchable):
+    Dispatcher = Dispatcher
+
+
+def make_listener(broadcast: Broadcast, *events: type) -> Listener:
+    async def handler():
+        pass
+
+    return Listener(handler, broadcast.getDefaultNamespace(), list(events))
+
+
+def test_plain_broadcast_is_left_untouched():
+    broadcast = Broadcast()
+    BroadcastBehaviour(broadcast)
+    assert type(broadcast.listeners) is list
+    assert "default_listener_generator" not in vars(broadcast)
+
+
+def test_index_follows_list_changes():
+    broadcast = IndexedBroadcast()
+    first, second = make_listener(broadcast, EventA), make_listener(broadcast, EventA, EventB)
+    broadcast.listeners.extend([first, second, first])
+    assert broadcast.default_listener_generator(EventA) == [first, second]
+
+    broadcast.listeners.remove(first)
+    assert broadcast.default_listener_generator(EventA) == [first, second]
+    broadcast.listeners.remove_many([first])
+    assert broadcast.default_listener_generator(EventA) == [second]
+
+    broadcast.listeners = [first]
+    assert broadcast.default_listener_generator(EventB) == []
+    first.listening_events.append(EventB)
+    broadcast.listener_index.refresh(first)
+    assert broadcast.default_listener_generator(EventB) == [first]
+
+
+def test_receiver_updates_the_index():
+    broadcast = IndexedBroadcast()
+
+    @broadcast.receiver(EventA)
+    async def handler():
+        pass
+
+    assert broadcast.default_listener_generator(EventB) == []
+    broadcast.receiver(EventB)(handler)
+    assert [i.callable for i in broadcast.default_listener_generator(EventB)] == [handler]
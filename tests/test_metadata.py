@@ -0,0 +1,81 @@
+import importlib_metadata
+import pytest
+from importlib_metadata import PackageNotFoundError
+
+from graia.saya.metadata import MetadataIndex
+
+METADATA = """\
+Metadata-Version: 2.1
+Name: Fake.Plugin
+Version: 1.2.3
+Author: alice,bob
+Summary: a plugin for tests
+"""
+
+ENTRY_POINTS = """\
+[graia.saya.plugins]
+fake = fake_plugin.main
+fake_attr = fake_plugin.other:plugin
+"""
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    dist_info = tmp_path / "site" / "fake_plugin-1.2.3.dist-info"
+    dist_info.mkdir(parents=True)
+    (dist_info / "METADATA").write_text(METADATA)
+    (dist_info / "entry_points.txt").write_text(ENTRY_POINTS)
+    monkeypatch.syspath_prepend(str(tmp_path / "site"))
+    return tmp_path / "site"
+
+
+def test_lookup_normalizes_names_and_returns_copies(site):
+    index = MetadataIndex()
+    meta = index.get("fake-plugin")
+    assert meta["version"] == "1.2.3"
+    assert meta["author"] == ["alice", "bob"]
+    assert index.get("FAKE_PLUGIN") == meta
+
+    meta["author"].append("mallory")
+    assert index.get("fake.plugin")["author"] == ["alice", "bob"]
+
+    with pytest.raises(PackageNotFoundError):
+        index.get("no-such-plugin-for-saya-tests")
+
+
+def test_entry_points(site):
+    index = MetadataIndex()
+    assert index.entry_points()["fake"] == "fake_plugin.main"
+    assert index.entry_points()["fake_attr"] == "fake_plugin.other:plugin"
+
+
+def test_cached_index_is_used_by_a_new_process(site, tmp_path, monkeypatch):
+    cache = tmp_path / "index.json"
+    index = MetadataIndex(cache)
+    index.get("fake-plugin")
+    index.entry_points()
+    index.save()
+    assert cache.exists()
+
+    def scan():
+        raise AssertionError("sys.path was scanned again")
+
+    monkeypatch.setattr(importlib_metadata, "distributions", scan)
+    restored = MetadataIndex(cache)
+    assert restored.get("fake-plugin")["version"] == "1.2.3"
+    assert restored.entry_points()["fake"] == "fake_plugin.main"
+    # 元信息未被缓存的发行包在首次使用时从其所在目录中查找
+    assert restored.distribution("fake-plugin").version == "1.2.3"
+
+
+def test_changes_to_sys_path_invalidate_the_index(site, tmp_path, monkeypatch):
+    index = MetadataIndex()
+    with pytest.raises(PackageNotFoundError):
+        index.get("another-fake-plugin")
+
+    other = tmp_path / "other"
+    dist_info = other / "another_fake_plugin-0.1.dist-info"
+    dist_info.mkdir(parents=True)
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: another-fake-plugin\nVersion: 0.1\n")
+    monkeypatch.syspath_prepend(str(other))
+    assert index.get("another-fake-plugin")["version"] == "0.1"
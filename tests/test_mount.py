@@ -0,0 +1,63 @@
+from typing import List
+
+from graia.saya import Saya
+
+PLUGIN = """
+from graia.saya import Channel, Saya
+from graia.saya.builtins.broadcast.schema import ListenerSchema
+from graia.saya.event import SayaModuleInstalled
+
+saya = Saya.current()
+channel = Channel.current()
+
+
+@channel.use(ListenerSchema(listening_events=[SayaModuleInstalled]))
+async def handler():
+    saya.access("mount.resource")
+    await saya.access_async("mount.resource")
+"""
+
+DECLARING = """
+import mount_log
+from graia.saya import Saya
+
+Saya.current().mount("mount.declared", factory=object, teardown=mount_log.released.append)
+"""
+
+
+def test_access_from_a_listener_is_released_after_uninstall(saya: Saya, make_module, settle):
+    released: List[object] = []
+    saya.mount("mount.resource", factory=object, teardown=released.append)
+    make_module("mount_plugin", PLUGIN)
+    saya.require("mount_plugin")
+    settle()
+
+    target = saya.mounts["mount.resource"]
+    assert target.created and target.users == {"mount_plugin"}
+
+    saya.uninstall_channel(saya.channels["mount_plugin"])
+    settle()
+    assert len(released) == 1
+    assert not target.created
+
+
+def test_declaring_module_owns_the_mount(saya: Saya, make_module, settle):
+    make_module("mount_log", "released = []")
+    make_module("mount_declaring", DECLARING)
+    saya.require("mount_declaring")
+    saya.mounts["mount.declared"].get()
+    assert saya.mounts["mount.declared"].users == {"mount_declaring"}
+
+    saya.uninstall_channel(saya.channels["mount_declaring"])
+    settle()
+
+    import mount_log
+
+    assert len(mount_log.released) == 1
+
+
+def test_access_outside_modules_is_never_released(saya: Saya, make_module):
+    saya.mount("mount.global", factory=object)
+    saya.access("mount.global")
+    assert saya.mounts["mount.global"].users == {None}
+    assert saya.release_unused_mounts() == []
@@ -0,0 +1,103 @@
+import os
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+from conftest import Recorder
+from graia.broadcast import Broadcast
+
+import graia.saya.plan
+from graia.saya import Saya
+from graia.saya.plan import load_plan
+
+MODULE = """
+from graia.saya import Channel, Saya
+from graia.saya.schema import BaseSchema
+
+{requires}
+Channel.current().use(BaseSchema())(lambda: None)
+"""
+
+
+@pytest.fixture
+def boot(make_module, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """模拟一次启动: 在新的 Saya 实例中按计划导入 `plan_pkg`, 返回是否重新解析了模块"""
+    make_module("plan_pkg.base", MODULE.format(requires=""))
+    make_module("plan_pkg.app", MODULE.format(requires="Saya.current().require('plan_pkg.base')"))
+    resolved: List[bool] = []
+    require_many = Saya.require_many
+
+    def spy(self, *args, **kwargs):
+        resolved.append(True)
+        return require_many(self, *args, **kwargs)
+
+    monkeypatch.setattr(Saya, "require_many", spy)
+
+    def run() -> bool:
+        for name in [i for i in sys.modules if i.startswith("plan_pkg.")]:
+            del sys.modules[name]
+        resolved.clear()
+        saya = Saya(Broadcast())
+        saya.install_behaviours(Recorder(saya))
+        with saya.module_context():
+            saya.require_plan(tmp_path / "plan.json", package="plan_pkg")
+        assert list(saya.channels) == ["plan_pkg.base", "plan_pkg.app"]
+        return bool(resolved)
+
+    return run
+
+
+@pytest.fixture
+def digests(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """记录 `validate_plan` 重新计算哈希的文件"""
+    hashed: List[str] = []
+    file_digest = graia.saya.plan.file_digest
+
+    def spy(path):
+        hashed.append(os.path.basename(path))
+        return file_digest(path)
+
+    monkeypatch.setattr(graia.saya.plan, "file_digest", spy)
+    return hashed
+
+
+def touch(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_plan_is_created_then_used(boot, tmp_path: Path, digests: List[str]):
+    assert boot() is True
+    plan = load_plan(tmp_path / "plan.json")
+    assert plan is not None
+    assert [i["module"] for i in plan["modules"]] == ["plan_pkg.base", "plan_pkg.app"]
+    assert plan["modules"][1]["dependencies"] == ["plan_pkg.base"]
+    assert plan["modules"][0]["cubes"] == {"BaseSchema": 1}
+
+    digests.clear()
+    assert boot() is False
+    assert digests == []
+
+
+def test_touched_files_are_hashed_once(boot, tmp_path: Path, digests: List[str]):
+    boot()
+    touch(tmp_path / "plan_pkg" / "base.py")
+
+    digests.clear()
+    assert boot() is False
+    assert digests == ["base.py"]
+
+    digests.clear()
+    assert boot() is False
+    assert digests == []
+
+
+def test_changed_source_invalidates_the_plan(boot, tmp_path: Path):
+    boot()
+    path = tmp_path / "plan_pkg" / "base.py"
+    path.write_text(path.read_text() + "\nCHANGED = True\n")
+    touch(path)
+
+    assert boot() is True
+    assert boot() is False
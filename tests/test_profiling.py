@@ -0,0 +1,43 @@
+from graia.saya import Saya
+
+MODULE = """
+from graia.saya import Channel, Saya
+from graia.saya.schema import BaseSchema
+
+{body}
+Channel.current().use(BaseSchema())(lambda: None)
+Channel.current().use(BaseSchema())(lambda: None)
+"""
+
+
+def test_reports_record_timings_and_the_import_tree(saya: Saya, recorder, make_module):
+    make_module("profiled_app.helper", "import time\ntime.sleep(0.02)")
+    make_module(
+        "profiled_app.__init__", MODULE.format(body="from . import helper\nSaya.current().require('profiled_dep')")
+    )
+    make_module("profiled_dep", MODULE.format(body="import time\ntime.sleep(0.02)"))
+    saya.profiling = True
+
+    saya.require("profiled_app")
+
+    app, dep = saya.load_reports["profiled_app"], saya.load_reports["profiled_dep"]
+    assert app.import_timing.wall >= 0.04
+    assert app.nested_timing.wall >= 0.02
+    assert 0.02 <= app.exclusive_import_timing.wall < app.import_timing.wall
+    assert dep.import_timing.wall >= 0.02
+    assert app.cube_count == dep.cube_count == 2
+    assert [i.behaviour for i in app.allocations] == ["Recorder"]
+
+    # 嵌套 require 的模块的导入记录在其自身的报告中
+    assert [i.module for i in app.imports] == ["profiled_app"]
+    children = [i.module for i in app.imports[0].children]
+    assert "profiled_app.helper" in children
+    assert "profiled_dep" not in children
+    assert [i.module for i in dep.imports] == ["profiled_dep"]
+    assert app.as_dict()["module"] == "profiled_app"
+
+
+def test_no_reports_without_profiling(saya: Saya, recorder, make_module):
+    make_module("profiled_dep", MODULE.format(body=""))
+    saya.require("profiled_dep")
+    assert saya.load_reports == {}
@@ -0,0 +1,79 @@
+from typing import Any, List
+
+import pytest
+from graia.broadcast.entities.event import Dispatchable
+
+from graia.saya import Saya
+from graia.saya.behaviour import Behaviour
+from graia.saya.cube import Cube
+
+MODULE = """
+from graia.saya import Channel
+from graia.saya.schema import BaseSchema
+
+{body}
+Channel.current().use(BaseSchema())(lambda: None)
+"""
+
+
+def names(events: List[Dispatchable]) -> List[str]:
+    return [type(event).__name__ for event in events]
+
+
+def test_zero_gap_reload_swaps_the_cubes(saya: Saya, recorder, make_module, lifecycle, settle):
+    make_module("reload_target", MODULE.format(body="VERSION = 1"))
+    channel = saya.require("reload_target")
+    old_cube = channel.content[0]
+    settle()
+    lifecycle.clear()
+
+    make_module("reload_target", MODULE.format(body="VERSION = 2"))
+    saya.reload_channel(channel, zero_gap=True)
+    settle()
+
+    assert saya.channels["reload_target"] is channel
+    assert channel._py_module.VERSION == 2
+    assert channel.content[0] is not old_cube
+    assert recorder.released == ["reload_target"]
+    assert names(lifecycle) == ["SayaModuleUninstall", "SayaModuleUninstalled"]
+
+
+class RejectBroken(Behaviour):
+    """分配名为 `broken` 的 Cube 时出错"""
+
+    def allocate(self, cube: Cube) -> Any:
+        if getattr(cube.content, "__name__", None) == "broken":
+            raise RuntimeError("cannot allocate")
+
+    def release(self, cube: Cube) -> Any:
+        return None
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        "raise RuntimeError('import failed')",
+        "def broken(): pass\nChannel.current().use(BaseSchema())(broken)",
+    ],
+    ids=["import", "allocate"],
+)
+def test_failed_zero_gap_reload_keeps_the_module_and_posts_nothing(
+    saya: Saya, recorder, make_module, lifecycle, settle, body: str
+):
+    saya.behaviours.insert(0, RejectBroken())
+    saya.behaviour_interface.invalidate()
+    make_module("reload_target", MODULE.format(body="VERSION = 1"))
+    channel = saya.require("reload_target")
+    old_cube = channel.content[0]
+    settle()
+    lifecycle.clear()
+
+    make_module("reload_target", MODULE.format(body=body))
+    with pytest.raises(RuntimeError):
+        saya.reload_channel(channel, zero_gap=True)
+    settle()
+
+    assert saya.channels["reload_target"] is channel
+    assert channel._py_module.VERSION == 1
+    assert list(channel.content) == [old_cube]
+    assert lifecycle == []
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from graia.saya import Saya
+
+MODULE = """
+from graia.saya import Channel, Saya
+from graia.saya.schema import BaseSchema
+
+{requires}
+Channel.current().use(BaseSchema())(lambda: None)
+"""
+
+SHARED = """
+import time
+
+import import_log
+from graia.saya import Channel
+from graia.saya.schema import BaseSchema
+
+import_log.imported.append(__name__)
+time.sleep(0.05)
+Channel.current().use(BaseSchema())(lambda: None)
+"""
+
+
+@pytest.mark.parametrize("threaded", [True, False])
+def test_concurrent_requires_share_nested_modules(saya: Saya, recorder, make_module, loop, threaded: bool):
+    make_module("import_log", "imported = []")
+    make_module("async_db", SHARED)
+    for name in ("async_a", "async_b"):
+        make_module(name, MODULE.format(requires="Saya.current().require('async_db')"))
+
+    async def main():
+        return await asyncio.gather(
+            saya.require_async("async_a", threaded=threaded),
+            saya.require_async("async_b", threaded=threaded),
+        )
+
+    a, b = loop.run_until_complete(main())
+
+    import import_log
+
+    assert import_log.imported == ["async_db"]
+    assert a is saya.channels["async_a"] and b is saya.channels["async_b"]
+    assert len(saya.channels["async_db"].content) == 1
+    assert sorted(recorder.allocated) == ["async_a", "async_b", "async_db"]
+    assert recorder.allocated.index("async_db") < min(
+        recorder.allocated.index("async_a"), recorder.allocated.index("async_b")
+    )
+    assert saya.dependency_graph["async_a"] == saya.dependency_graph["async_b"] == {"async_db"}
+    assert saya._async_loader is None and not saya._allocating
+
+
+def test_a_failed_import_can_be_retried(saya: Saya, recorder, make_module, loop):
+    make_module("async_broken", "raise RuntimeError('broken')")
+    make_module("async_user", MODULE.format(requires="Saya.current().require('async_broken')"))
+
+    with pytest.raises(RuntimeError, match="broken"):
+        loop.run_until_complete(saya.require_async("async_user"))
+    assert "async_user" not in saya.channels and recorder.allocated == []
+
+    make_module("async_broken", MODULE.format(requires=""))
+    loop.run_until_complete(saya.require_async("async_user"))
+    assert sorted(recorder.allocated) == ["async_broken", "async_user"]
@@ -0,0 +1,46 @@
+import sys
+
+import pytest
+
+from graia.saya import Saya
+
+MODULE = """
+from graia.saya import Channel, Saya
+from graia.saya.schema import BaseSchema
+
+{requires}
+Channel.current().use(BaseSchema())(lambda: None)
+"""
+
+
+def write(make_module, name: str, *requires: str) -> None:
+    make_module(name, MODULE.format(requires="\n".join(f"Saya.current().require({i!r})" for i in requires)))
+
+
+def test_modules_are_allocated_in_dependency_order(saya: Saya, recorder, make_module):
+    write(make_module, "bulk_app", "bulk_db", "bulk_cache")
+    write(make_module, "bulk_cache", "bulk_db")
+    write(make_module, "bulk_db")
+
+    result = saya.require_many(["bulk_app", "bulk_cache"])
+
+    assert list(result) == ["bulk_app", "bulk_cache"]
+    assert result["bulk_app"] is saya.channels["bulk_app"]
+    assert recorder.allocated == ["bulk_db", "bulk_cache", "bulk_app"]
+    assert saya.dependency_graph["bulk_app"] == {"bulk_db", "bulk_cache"}
+
+
+def test_a_failed_import_allocates_nothing(saya: Saya, recorder, make_module):
+    write(make_module, "bulk_good")
+    make_module("bulk_bad", "raise RuntimeError('broken')")
+
+    with pytest.raises(RuntimeError, match="broken"):
+        saya.require_many(["bulk_good", "bulk_bad"])
+
+    assert recorder.allocated == []
+    assert "bulk_good" not in saya.channels
+    assert "bulk_good" not in sys.modules
+
+    make_module("bulk_bad", MODULE.format(requires=""))
+    saya.require_many(["bulk_good", "bulk_bad"])
+    assert sorted(recorder.allocated) == ["bulk_bad", "bulk_good"]
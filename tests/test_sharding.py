@@ -0,0 +1,54 @@
+import asyncio
+import sys
+
+from graia.broadcast import Broadcast
+
+from graia.saya.builtins.broadcast.sharding import Shard, ShardCoordinator
+from graia.saya.event import SayaModuleInstalled
+
+PLUGIN = """
+from graia.broadcast.entities.event import Dispatchable
+from graia.saya import Channel
+
+channel = Channel.current()
+
+
+class ShardOnly(Dispatchable):
+    pass
+"""
+
+
+def test_ready_resolves_only_loaded_events(make_module, loop):
+    make_module("shard_plugin", PLUGIN)
+    broadcast = Broadcast()
+    coordinator = ShardCoordinator(broadcast)
+    loop.run_until_complete(coordinator.start())
+    shard = coordinator.add_shard("shard-0", ["shard_plugin"])
+
+    async def boot():
+        coordinator._handle(
+            shard,
+            (
+                "ready",
+                {},
+                [("shard_plugin", "ShardOnly"), ("graia.saya.event", "SayaModuleInstalled"), ("missing", "Event")],
+            ),
+        )
+        await asyncio.wait_for(shard.ready.wait(), 1)
+
+    loop.run_until_complete(boot())
+
+    assert "shard_plugin" not in sys.modules
+    assert shard.events == {SayaModuleInstalled}
+    assert coordinator.listener is not None
+    assert coordinator.listener.listening_events == [SayaModuleInstalled]
+
+
+def test_shard_can_be_created_without_a_running_loop(loop):
+    shard = Shard("shard-0", [])
+
+    async def wait():
+        loop.call_soon(shard.ready.set)
+        await asyncio.wait_for(shard.ready.wait(), 1)
+
+    loop.run_until_complete(wait())
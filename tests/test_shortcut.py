@@ -0,0 +1,48 @@
+import inspect
+
+from graia.broadcast.builtin.decorators import Depend
+
+from graia.saya import Saya
+from graia.saya.builtins.broadcast.shortcut import bind_decorators
+
+PLUGIN = """
+from graia.broadcast.builtin.decorators import Depend
+from graia.saya import Saya
+from graia.saya.builtins.broadcast.shortcut import decorate, listen
+from graia.saya.event import SayaModuleInstalled
+
+received = []
+
+
+def answer():
+    return 42
+
+
+@listen(SayaModuleInstalled)
+@decorate("value", Depend(answer))
+async def handler(saya: Saya, value, event: SayaModuleInstalled):
+    received.append((saya, value, event.module))
+"""
+
+
+def test_a_decorated_middle_parameter_keeps_its_position():
+    decorator = Depend(lambda: None)
+
+    def handler(a: int, b, c: str) -> None: ...
+
+    sig = bind_decorators(handler, {"b": decorator, "missing": decorator})
+
+    assert list(sig.parameters) == ["a", "b", "c"]
+    assert sig.parameters["b"].default is decorator
+    assert sig.parameters["a"].default is sig.parameters["c"].default is inspect.Parameter.empty
+    assert sig.return_annotation is None
+
+
+def test_decorated_listener_receives_the_decorator_result(saya: Saya, make_module, settle):
+    make_module("shortcut_plugin", PLUGIN)
+    saya.require("shortcut_plugin")
+    settle()
+
+    import shortcut_plugin
+
+    assert shortcut_plugin.received == [(saya, 42, "shortcut_plugin")]
@@ -0,0 +1,57 @@
+import sys
+from typing import List
+
+from graia.saya import Saya
+from graia.saya.event import SayaModuleUninstall
+from graia.saya.leak import LeakTracker
+
+PLUGIN = """
+from graia.saya import Channel
+from graia.saya.builtins.broadcast.schema import ListenerSchema
+from graia.saya.event import SayaModuleInstalled
+
+from uninstall_plugin import helper
+
+channel = Channel.current()
+channel.export(helper.VALUE)
+
+
+@channel.use(ListenerSchema(listening_events=[SayaModuleInstalled]))
+async def handler():
+    pass
+"""
+
+
+def test_uninstall_handlers_see_the_channel_before_it_is_cleared(saya: Saya, make_module, settle):
+    make_module("uninstall_plugin.helper", "VALUE = 'exported'")
+    make_module("uninstall_plugin.__init__", PLUGIN)
+    saya.require("uninstall_plugin")
+    channel = saya.channels["uninstall_plugin"]
+    seen: List[tuple] = []
+
+    @saya.broadcast.receiver(SayaModuleUninstall)
+    async def on_uninstall(event: SayaModuleUninstall):
+        seen.append((len(event.channel.content), event.channel._export))
+
+    saya.uninstall_channel(channel)
+    assert "uninstall_plugin" not in sys.modules
+    assert "uninstall_plugin.helper" not in sys.modules
+    assert len(channel.content) == 1
+
+    settle()
+    assert seen == [(1, "exported")]
+    assert len(channel.content) == 0
+    assert channel._py_module is None
+
+
+def test_uninstalled_modules_are_reclaimed(saya: Saya, make_module, settle):
+    make_module("uninstall_plugin.helper", "VALUE = 'exported'")
+    make_module("uninstall_plugin.__init__", PLUGIN)
+    saya.leak_tracker = LeakTracker(saya)
+    saya.require("uninstall_plugin")
+    listeners = len(saya.broadcast.listeners)
+
+    saya.uninstall_channel(saya.channels["uninstall_plugin"])
+    settle()
+    assert len(saya.broadcast.listeners) == listeners - 1
+    assert saya.leak_tracker.report() == []
@@ -0,0 +1,67 @@
+import os
+from pathlib import Path
+
+from graia.saya import Saya
+from graia.saya.watcher import ChannelWatcher
+
+MODULE = """
+from graia.saya import Channel, Saya
+from graia.saya.schema import BaseSchema
+
+{body}
+Channel.current().use(BaseSchema())(lambda: None)
+"""
+
+
+def write(path: Path, body: str = "") -> None:
+    stat = path.stat()
+    path.write_text(MODULE.format(body=body))
+    # 保证修改时间变化, 即使两次写入发生在同一时钟刻度内
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_changed_modules_and_dependents_are_reloaded_in_order(saya: Saya, recorder, make_module):
+    base = make_module("watch_base", MODULE.format(body=""))
+    make_module("watch_user", MODULE.format(body="Saya.current().require('watch_base')"))
+    make_module("watch_other", MODULE.format(body=""))
+    for module in ("watch_base", "watch_user", "watch_other"):
+        saya.require(module)
+    watcher = ChannelWatcher(saya)
+    old_base = saya.channels["watch_base"]._py_module
+
+    assert watcher.check() == []
+
+    write(base, "VERSION = 2")
+    recorder.allocated.clear()
+    assert watcher.check() == ["watch_base", "watch_user"]
+    assert recorder.allocated == ["watch_base", "watch_user"]
+    assert saya.channels["watch_base"]._py_module is not old_base
+    assert saya.channels["watch_base"]._py_module.VERSION == 2
+    assert watcher.check() == []
+
+
+def test_failed_reload_is_retried_after_the_next_change(saya: Saya, recorder, make_module):
+    path = make_module("watch_broken", MODULE.format(body=""))
+    saya.require("watch_broken")
+    watcher = ChannelWatcher(saya)
+
+    write(path, "raise RuntimeError('typo')")
+    assert watcher.check() == ["watch_broken"]
+    assert "watch_broken" not in saya.channels
+    assert "watch_broken" in watcher.failed
+
+    write(path, "FIXED = True")
+    assert watcher.check() == ["watch_broken"]
+    assert saya.channels["watch_broken"]._py_module.FIXED
+    assert watcher.failed == {}
+
+
+def test_zero_gap_watcher_keeps_the_old_version_on_errors(saya: Saya, recorder, make_module):
+    path = make_module("watch_zero_gap", MODULE.format(body=""))
+    channel = saya.require("watch_zero_gap")
+    watcher = ChannelWatcher(saya, zero_gap=True)
+
+    write(path, "raise RuntimeError('typo')")
+    watcher.check()
+    assert saya.channels["watch_zero_gap"] is channel
+    assert len(channel.content) == 1